@@ -5,6 +5,9 @@ https://www.mathworks.com/help/matlab/ref/matlabwindows.html
 
 from main.script_execute import script_execute
 from main.repl_execute import repl_execute
+from main.script_cache import clear_cache
+from main.III_semantic.engines import ENGINES, DEFAULT_ENGINE
+from main.III_semantic.data_types.storage import BACKENDS, DEFAULT_BACKEND, use_backend
 import argparse
 
 
@@ -13,10 +16,22 @@ parser.add_argument('file', type=str, nargs='?', help='program read from script
 parser.add_argument('-t', '--t', type=bool, default=False, help='print tokens')
 parser.add_argument('-a', '--a', type=bool, default=False, help='print abstract syntax tree')
 parser.add_argument('-v', '--v', type=bool, default=False, help='print variables')
+parser.add_argument('-d', '--d', type=bool, default=False, help='print disassembled bytecode')
+parser.add_argument('-s', '--s', type=bool, default=False, help='print specialization hit rates')
+parser.add_argument('-e', '--engine', choices=ENGINES, default=DEFAULT_ENGINE, help='execution engine')
+parser.add_argument('-b', '--backend', choices=BACKENDS, default=DEFAULT_BACKEND, help='storage of array elements')
+parser.add_argument('--no-cache', action='store_true', help='neither read nor write the syntax tree and bytecode cache')
+parser.add_argument('--clear-cache', action='store_true', help='remove the cache directory of the script')
 
 args = parser.parse_args()
+use_backend(args.backend)
+
+if args.clear_cache:
+    clear_cache(args.file)
 
 if args.file:
-    script_execute(args.file, print_tokens=args.t, print_ast=args.a, print_var=args.v)
+    script_execute(args.file, print_tokens=args.t, print_ast=args.a, print_var=args.v, use_cache=not args.no_cache,
+                   engine=args.engine, print_bytecode=args.d, print_specializations=args.s)
 else:
-    repl_execute(print_tokens=args.t, print_ast=args.a, print_var=args.v)
+    repl_execute(print_tokens=args.t, print_ast=args.a, print_var=args.v, engine=args.engine, print_bytecode=args.d,
+                 print_specializations=args.s)
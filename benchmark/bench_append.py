@@ -0,0 +1,31 @@
+"""
+the accumulation idiom x = [x, v] and x = [x; v] appending up to 1e6 elements,
+the time per element stays flat when the variable grows in place
+run from the project root: python3 -m benchmark.bench_append
+"""
+
+
+from benchmark.utils import measure, report, run_program
+
+
+APPEND = """
+x = [];
+for k = 1:{count}
+    x = [x{separator} k];
+end
+"""
+
+COUNTS = (10000, 100000, 1000000)
+
+
+def bench_append(engine="closure", counts=COUNTS):
+    rows = []
+    for name, separator in (("[x, v]", ","), ("[x; v]", ";")):
+        for count in counts:
+            time = measure(run_program, APPEND.format(count=count, separator=separator), engine, repeat=1)
+            rows.append((name, count, time, time / count * 1e9))
+    report(f"appending elements one by one ({engine} engine)", rows, ("idiom", "elements", "time (s)", "ns per element"))
+
+
+if __name__ == "__main__":
+    bench_append()
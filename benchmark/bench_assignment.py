@@ -0,0 +1,48 @@
+"""
+fill loops writing one element x(k) = v or one row A(k, :) = v per iteration, into a preallocated array and into
+an array growing from empty, the time per element stays flat since every write goes into the storage in place
+run from the project root: python3 -m benchmark.bench_assignment
+"""
+
+
+from benchmark.utils import measure, report, run_program
+
+
+PREALLOCATED = """
+x = zeros(1, {count});
+for k = 1:{count}
+    x(k) = k;
+end
+"""
+
+GROWN = """
+x = [];
+for k = 1:{count}
+    x(k) = k;
+end
+"""
+
+ROWS = """
+A = zeros({count}, 4);
+for k = 1:{count}
+    A(k, :) = [k, k, k, k];
+end
+"""
+
+FILL_LOOPS = (("x = zeros", PREALLOCATED), ("x(k) grown", GROWN), ("A(k, :)", ROWS))
+
+COUNTS = (10000, 100000, 1000000)
+
+
+def bench_assignment(engine="closure", counts=COUNTS):
+    rows = []
+    for name, program in FILL_LOOPS:
+        for count in counts:
+            time = measure(run_program, program.format(count=count), engine, repeat=1)
+            rows.append((name, count, time, time / count * 1e9))
+    report(f"indexed assignment in fill loops ({engine} engine)", rows,
+           ("loop", "elements", "time (s)", "ns per element"))
+
+
+if __name__ == "__main__":
+    bench_assignment()
@@ -0,0 +1,37 @@
+"""
+element-wise operations on long vectors with the list and the numpy storage backends
+run from the project root: python3 -m benchmark.bench_backend
+"""
+
+
+from benchmark.utils import measure, report
+from main.III_semantic.data_types import storage
+from main.III_semantic.operations import ARITHMETIC_OPERATORS, evaluate_relational_operations, \
+    evaluate_transpose_operation
+from main.III_semantic.data_types.array_data.numeric_data.decimal_data.double import Double
+
+
+OPERATIONS = {
+    **{operator: ARITHMETIC_OPERATORS[operator] for operator in ('+', '-', '.*', './', '.^')},
+    '<': lambda a, b: evaluate_relational_operations(a, b, '<'),
+    "'": lambda a, b: evaluate_transpose_operation(a),
+}
+
+
+def bench_backends(length=1000000):
+    rows = []
+    for operator, fun in OPERATIONS.items():
+        times = []
+        for backend in storage.BACKENDS:
+            storage.use_backend(backend)
+            operand_0 = Double([float(i % 97) + 0.5 for i in range(length)])
+            operand_1 = Double([float(i % 13) + 1.0 for i in range(length)])
+            times.append(measure(fun, operand_0, operand_1))
+        rows.append((operator, *times))
+    storage.use_backend(storage.DEFAULT_BACKEND)
+    report(f"element-wise operations on 1x{length} vectors", rows,
+           ("operator", *(f"{backend} (s)" for backend in storage.BACKENDS)))
+
+
+if __name__ == "__main__":
+    bench_backends()
@@ -0,0 +1,36 @@
+"""
+element-wise operations between an m x 1 column and a 1 x 100 row, compat broadcasts both operands to m x 100 without
+replicating or modifying them, so the time is the time of writing the result
+run from the project root: python3 -m benchmark.bench_broadcast
+"""
+
+
+from benchmark.utils import measure, report
+from main.III_semantic.data_types.array_data.numeric_data.decimal_data.double import Double
+from main.III_semantic.operations import evaluate_addition_operation, evaluate_relational_operations
+
+
+OPERATIONS = {
+    '+': evaluate_addition_operation,
+    '<': lambda a, b: evaluate_relational_operations(a, b, '<'),
+}
+
+SIZES = (10 ** 4, 10 ** 5, 10 ** 6)
+WIDTH = 100
+
+
+def bench_broadcast(sizes=SIZES, width=WIDTH):
+    rows = []
+    row = Double([float(k) for k in range(width)], size=(1, width))
+    for m in sizes:
+        column = Double([float(k) for k in range(m)], size=(m, 1))
+        for name, fun in OPERATIONS.items():
+            time = measure(fun, column, row, repeat=3)
+            # the operands keep their sizes
+            assert column.size == (m, 1) and row.size == (1, width)
+            rows.append((name, m, time, time / (m * width) * 1e9))
+    report(f"m x 1 column against 1 x {width} row", rows, ("operator", "m", "time (s)", "ns per element"))
+
+
+if __name__ == "__main__":
+    bench_broadcast()
@@ -0,0 +1,42 @@
+"""
+startup time of a script with a cold (cleared) and a warm abstract syntax tree cache
+run from the project root: python3 -m benchmark.bench_cache
+"""
+
+
+import os
+import tempfile
+from benchmark.utils import synthetic_script, measure, report
+from main.script_cache import load_ast, store_ast, clear_cache
+from main.script_execute import parse_program
+
+
+def startup(path):
+    with open(path, "r") as file:
+        program = file.read()
+    ast_root = load_ast(path, program)
+    if ast_root is None:
+        ast_root = parse_program(program)
+        store_ast(path, program, ast_root)
+    return ast_root
+
+
+def bench_startup(sizes=(10, 100, 1000, 2000)):
+    rows = []
+    with tempfile.TemporaryDirectory() as directory:
+        for kilobytes in sizes:
+            path = os.path.join(directory, f"script_{kilobytes}.m")
+            with open(path, "w") as file:
+                file.write(synthetic_script(kilobytes * 1024))
+
+            def cold():
+                clear_cache(path)
+                startup(path)
+            cold_seconds = measure(cold)
+            warm_seconds = measure(startup, path)
+            rows.append((kilobytes, cold_seconds, warm_seconds, cold_seconds / warm_seconds))
+    report("script startup", rows, ("size (KB)", "cold (s)", "warm (s)", "speedup"))
+
+
+if __name__ == "__main__":
+    bench_startup()
@@ -0,0 +1,40 @@
+"""
+wide, tall and mixed class concatenations building large arrays, with every storage backend
+run from the project root: python3 -m benchmark.bench_concatenation
+"""
+
+
+from benchmark.utils import measure, report
+from main.III_semantic.data_types import storage
+from main.III_semantic.utils import concatenate
+from main.III_semantic.data_types.array_data.logical import Logical
+from main.III_semantic.data_types.array_data.numeric_data.decimal_data.double import Double
+
+
+# operand classes, cycled through the rows, and direction of each case
+CASES = {
+    'wide': ((Double,), "horz"),
+    'tall': ((Double,), "vert"),
+    'mixed class': ((Double, Logical), "vert"),
+}
+
+
+def operands(count, length, classes):
+    return [classes[i % len(classes)]([float(j % 2) for j in range(length)]) for i in range(count)]
+
+
+def bench_concatenation(n=1000):
+    rows = []
+    for name, (classes, direction) in CASES.items():
+        times = []
+        for backend in storage.BACKENDS:
+            storage.use_backend(backend)
+            times.append(measure(concatenate, operands(n, n, classes), direction))
+        rows.append((name, *times))
+    storage.use_backend(storage.DEFAULT_BACKEND)
+    report(f"concatenation of {n} row vectors of 1x{n}", rows,
+           ("case", *(f"{backend} (s)" for backend in storage.BACKENDS)))
+
+
+if __name__ == "__main__":
+    bench_concatenation()
@@ -0,0 +1,23 @@
+"""
+execution time of loop heavy programs on every execution engine, relative to the tree walking interpreter
+run from the project root: python3 -m benchmark.bench_engines
+"""
+
+
+from benchmark.utils import measure, report, run_program
+from benchmark.programs import PROGRAMS
+from main.III_semantic.engines import ENGINES
+
+
+def bench_engines(engines=tuple(ENGINES)):
+    rows = []
+    for name, program in PROGRAMS.items():
+        reference = measure(run_program, program, 'tree', repeat=1)
+        for engine in engines:
+            seconds = reference if engine == 'tree' else measure(run_program, program, engine, repeat=1)
+            rows.append((name, engine, seconds, reference / seconds))
+    report("loop heavy programs", rows, ("program", "engine", "time (s)", "speedup"))
+
+
+if __name__ == "__main__":
+    bench_engines()
@@ -0,0 +1,39 @@
+"""
+execution time of a loop over constant expressions on every execution engine, with the tree as parsed and with its
+constants folded, see constant_folding.py
+run from the project root: python3 -m benchmark.bench_folding
+"""
+
+
+from benchmark.utils import measure, report
+from main.I_lexical.lexer import lexer
+from main.II_syntactic.parser import Parser
+from main.III_semantic.constant_folding import fold
+from main.III_semantic.engines import ENGINES
+
+
+CONSTANTS = """
+s = 0;
+for k = 1:20000
+    s = s + k * (2 * pi / 360) - 0.5;
+    t = "label";
+    v = [1 2 3];
+end
+"""
+
+
+def execute(ast_root, engine):
+    ENGINES[engine]().interpret_statement_list(ast_root)
+
+
+def bench_folding(engines=tuple(ENGINES)):
+    rows = []
+    for engine in engines:
+        times = [measure(execute, tree, engine) for tree in (Parser(lexer(CONSTANTS)).parse_statement_list(),
+                                                            fold(Parser(lexer(CONSTANTS)).parse_statement_list()))]
+        rows.append((engine, *times, times[0] / times[1]))
+    report("loop over constant expressions", rows, ("engine", "parsed (s)", "folded (s)", "speedup"))
+
+
+if __name__ == "__main__":
+    bench_folding()
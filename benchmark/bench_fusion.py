@@ -0,0 +1,48 @@
+"""
+the element-wise expression a .* b + c ./ d - 2 of n x 1 columns evaluated operator by operator and fused, with the
+list and the numpy storage backends
+unfused, every operator builds its whole intermediate array, fused, the tree is evaluated in one pass, by blocks of
+fusion.CHUNK elements with numpy and element by element with lists
+run from the project root: python3 -m benchmark.bench_fusion
+"""
+
+
+from benchmark.utils import measure, report
+from main.III_semantic.data_types import storage
+from main.III_semantic.data_types.array_data.numeric_data.decimal_data.double import Double
+from main.III_semantic.fusion import defer, force
+from main.III_semantic.operations import ARITHMETIC_OPERATORS
+
+
+def column(n, k):
+    return Double([float((i * k) % 13) + 1.0 for i in range(n)], size=(n, 1))
+
+
+def unfused(a, b, c, d, two):
+    add, subtract = ARITHMETIC_OPERATORS['+'], ARITHMETIC_OPERATORS['-']
+    multiply, divide = ARITHMETIC_OPERATORS['.*'], ARITHMETIC_OPERATORS['./']
+    return subtract(add(multiply(a, b), divide(c, d)), two)
+
+
+def fused(a, b, c, d, two):
+    return force(defer('-', defer('+', defer('.*', a, b), defer('./', c, d)), two))
+
+
+SIZES = (10 ** 4, 10 ** 5, 10 ** 6)
+
+
+def bench_fusion(sizes=SIZES):
+    rows = []
+    two = Double([2.0])
+    for n in sizes:
+        for backend in storage.BACKENDS:
+            storage.use_backend(backend)
+            operands = [column(n, k) for k in (3, 5, 7, 11)]
+            times = [measure(fun, *operands, two) for fun in (unfused, fused)]
+            rows.append((n, backend, *times, times[0] / times[1]))
+    storage.use_backend(storage.DEFAULT_BACKEND)
+    report("a .* b + c ./ d - 2", rows, ("n", "backend", "unfused (s)", "fused (s)", "speedup"))
+
+
+if __name__ == "__main__":
+    bench_fusion()
@@ -0,0 +1,52 @@
+"""
+execution time of loop heavy programs on the closure and bytecode engines, compiled with the generic operations only
+and with the kernels selected by the type inference, see inference.py
+run from the project root: python3 -m benchmark.bench_inference
+"""
+
+
+from benchmark.utils import measure, report
+from benchmark.programs import PROGRAMS
+from main.script_execute import parse_program
+from main.III_semantic.closure_compiler import ClosureInterpreter
+from main.V_bytecode.compiler import BytecodeCompiler
+from main.V_bytecode.vm import BytecodeInterpreter
+
+
+ARRAYS = """
+v = [1 2 3 4 5 6 7 8];
+for k = 1:5000
+    w = v + v;
+    w = v .* w;
+end
+"""
+
+
+def closure(ast_root, specialized):
+    compiler = ClosureInterpreter().compiler
+    (compiler.compile(ast_root) if specialized else compiler.compile_statement_list(ast_root))()
+
+
+def bytecode(ast_root, specialized):
+    interpreter = BytecodeInterpreter()
+    compiler = BytecodeCompiler(interpreter.builtins)
+    if specialized:
+        compiler.compile(ast_root)
+    else:
+        compiler.compile_statement_list(ast_root)
+    interpreter.execute(compiler.code)
+
+
+def bench_inference(programs=('accumulator', 'fibonacci', 'gcd', 'arrays')):
+    rows = []
+    for name in programs:
+        ast_root = parse_program(ARRAYS if name == 'arrays' else PROGRAMS[name])
+        for engine in (closure, bytecode):
+            times = [measure(engine, ast_root, specialized) for specialized in (False, True)]
+            rows.append((name, engine.__name__, *times, times[0] / times[1]))
+    report("generic and specialized operations", rows, ("program", "engine", "generic (s)", "specialized (s)",
+                                                        "speedup"))
+
+
+if __name__ == "__main__":
+    bench_inference()
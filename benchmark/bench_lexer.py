@@ -0,0 +1,48 @@
+"""
+lexing throughput on multi-megabyte scripts and on many short REPL lines
+run from the project root: python3 -m benchmark.bench_lexer
+"""
+
+
+from benchmark.utils import synthetic_script, measure, report
+from main.I_lexical.lexer import lexer
+
+
+def bench_large_scripts(sizes=(1, 2, 4, 8)):
+    rows = []
+    for megabytes in sizes:
+        script = synthetic_script(megabytes * 1024 * 1024)
+        seconds = measure(lexer, script)
+        rows.append((megabytes, seconds, len(script) / seconds / 1024 / 1024))
+    report("lexing large scripts", rows, ("size (MB)", "time (s)", "MB/s"))
+
+
+def bench_unterminated_annotation(sizes=(1, 2, 4, 8)):
+    rows = []
+    for megabytes in sizes:
+        script = "%{\n" + "annotation line without terminator\n" * (megabytes * 1024 * 1024 // 35)
+
+        def run():
+            try:
+                lexer(script)
+            except Exception:
+                pass
+        seconds = measure(run)
+        rows.append((megabytes, seconds, len(script) / seconds / 1024 / 1024))
+    report("lexing an unterminated block annotation", rows, ("size (MB)", "time (s)", "MB/s"))
+
+
+def bench_repl_lines(number=100000):
+    lines = [line for line in synthetic_script(0).split('\n') if line[:1].isalpha()]
+
+    def run():
+        for i in range(number):
+            lexer(lines[i % len(lines)])
+    seconds = measure(run)
+    report("lexing short REPL lines", [(number, seconds, number / seconds)], ("lines", "time (s)", "lines/s"))
+
+
+if __name__ == "__main__":
+    bench_large_scripts()
+    bench_unterminated_annotation()
+    bench_repl_lines()
@@ -0,0 +1,43 @@
+"""
+execution time of a loop with invariant expressions and a dead store on every execution engine, with the folded tree
+and with its loops optimized, see loop_optimization.py
+run from the project root: python3 -m benchmark.bench_loops
+"""
+
+
+from benchmark.utils import measure, report
+from main.I_lexical.lexer import lexer
+from main.II_syntactic.parser import Parser
+from main.III_semantic.constant_folding import fold
+from main.III_semantic.loop_optimization import optimize
+from main.III_semantic.engines import ENGINES
+
+
+INVARIANTS = """
+n = 50;
+s = 0;
+for k = 1:5000
+    t = 0;
+    z = zeros(1, n);
+    z(1) = n * 2 + 1;
+    t = k * (n / 3 + 1);
+    s = s + t;
+end
+"""
+
+
+def execute(ast_root, engine):
+    ENGINES[engine]().interpret_statement_list(ast_root)
+
+
+def bench_loops(engines=tuple(ENGINES)):
+    rows = []
+    for engine in engines:
+        times = [measure(execute, tree, engine) for tree in (fold(Parser(lexer(INVARIANTS)).parse_statement_list()),
+                                                            optimize(fold(Parser(lexer(INVARIANTS)).parse_statement_list())))]
+        rows.append((engine, *times, times[0] / times[1]))
+    report("loop with invariant expressions", rows, ("engine", "folded (s)", "optimized (s)", "speedup"))
+
+
+if __name__ == "__main__":
+    bench_loops()
@@ -0,0 +1,48 @@
+"""
+the matrix product A * B of n x n matrices, of a matrix and a vector, and the dot and outer products of vectors, with
+the list and the numpy storage backends, in floating point operations per second
+the list backend runs the pure python kernel, which is only measured up to LIST_LIMIT to keep the run short
+run from the project root: python3 -m benchmark.bench_matmul
+"""
+
+
+from benchmark.utils import measure, report
+from main.III_semantic.data_types import storage
+from main.III_semantic.data_types.array_data.numeric_data.decimal_data.double import Double
+from main.III_semantic.operations import evaluate_matrix_multiplication_operation
+
+
+def matrix(m, n):
+    return Double([float((i * 7 + 3) % 11) - 5.0 for i in range(m * n)], size=(m, n))
+
+
+# name: (size of the left operand, size of the right operand, floating point operations) for the dimension n
+PRODUCTS = {
+    'matrix': lambda n: ((n, n), (n, n), 2 * n ** 3),
+    'matrix-vector': lambda n: ((n, n), (n, 1), 2 * n ** 2),
+    'dot': lambda n: ((1, n), (n, 1), 2 * n),
+    'outer': lambda n: ((n, 1), (1, n), n ** 2),
+}
+
+SIZES = (10, 30, 100, 300, 1000, 2000)
+LIST_LIMIT = 300
+
+
+def bench_matmul(sizes=SIZES):
+    rows = []
+    for name, shape in PRODUCTS.items():
+        for n in sizes:
+            size_0, size_1, flops = shape(n)
+            for backend in storage.BACKENDS:
+                if backend == 'list' and name == 'matrix' and n > LIST_LIMIT:
+                    continue
+                storage.use_backend(backend)
+                operand_0, operand_1 = matrix(*size_0), matrix(*size_1)
+                time = measure(evaluate_matrix_multiplication_operation, operand_0, operand_1)
+                rows.append((name, n, backend, time, flops / time / 1e6))
+    storage.use_backend(storage.DEFAULT_BACKEND)
+    report("matrix products", rows, ("product", "n", "backend", "time (s)", "MFLOP/s"))
+
+
+if __name__ == "__main__":
+    bench_matmul()
@@ -0,0 +1,30 @@
+"""
+parsing time against the number of statements, the time per statement should stay flat
+run from the project root: python3 -m benchmark.bench_parser
+"""
+
+
+from benchmark.utils import synthetic_script, measure, report, SCRIPT_BLOCK
+from main.I_lexical.lexer import lexer
+from main.II_syntactic.parser import Parser
+
+
+STATEMENTS_PER_BLOCK = 9
+
+
+def bench_scaling(sizes=(1000, 10000, 50000, 100000)):
+    rows = []
+    for statements in sizes:
+        script = synthetic_script(len(SCRIPT_BLOCK) * statements // STATEMENTS_PER_BLOCK - 1)
+        token_list = lexer(script)
+
+        def run():
+            # the parser appends a closing EO_STMT to the list it receives, so it gets a copy each time
+            Parser(list(token_list)).parse_statement_list()
+        seconds = measure(run, repeat=1)
+        rows.append((statements, len(token_list), seconds, seconds / statements * 1e6))
+    report("parsing scripts", rows, ("statements", "tokens", "time (s)", "us/statement"))
+
+
+if __name__ == "__main__":
+    bench_scaling()
@@ -0,0 +1,49 @@
+"""
+P ^ k for n x n transition matrices of Markov chains: integer powers take O(log k) matrix products, compared with k - 1
+products of a loop for the small k, a fractional power goes through the eigendecomposition
+run from the project root: python3 -m benchmark.bench_power
+"""
+
+
+from benchmark.utils import measure, report
+from main.III_semantic.data_types.array_data.numeric_data.decimal_data.double import Double
+from main.III_semantic.operations import evaluate_matrix_power_operation, evaluate_matrix_multiplication_operation
+
+
+def transition(n):
+    """
+    the n x n matrix of a chain moving from every state to itself and to the next two, each column sums to one
+    """
+    data = [0.0] * (n * n)
+    for j in range(n):
+        for i in (j, (j + 1) % n, (j + 2) % n):
+            data[j * n + i] += 1 / 3
+    return Double(data, size=(n, n))
+
+
+def repeated(p, k):
+    result = p
+    for _ in range(k - 1):
+        result = evaluate_matrix_multiplication_operation(result, p)
+    return result
+
+
+SIZES = (10, 100, 300)
+EXPONENTS = (10, 1000, 10 ** 6)
+LOOP_LIMIT = 1000
+
+
+def bench_power(sizes=SIZES, exponents=EXPONENTS):
+    rows = []
+    for n in sizes:
+        p = transition(n)
+        for k in exponents:
+            squaring = measure(evaluate_matrix_power_operation, p, Double([float(k)]))
+            loop = measure(repeated, p, k, repeat=1) if k <= LOOP_LIMIT else float('nan')
+            rows.append((n, str(k), squaring * 1e3, loop * 1e3))
+        rows.append((n, '0.5', measure(evaluate_matrix_power_operation, p, Double([0.5])) * 1e3, float('nan')))
+    report("P ^ k", rows, ("n", "k", "P ^ k (ms)", "loop (ms)"))
+
+
+if __name__ == "__main__":
+    bench_power()
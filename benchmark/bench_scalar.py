@@ -0,0 +1,46 @@
+"""
+1x1 operations and scalar loop programs, the workload of the scalar fast path of operations.py
+run from the project root: python3 -m benchmark.bench_scalar
+"""
+
+
+from benchmark.utils import measure, report, run_program
+from benchmark.programs import PROGRAMS
+from main.III_semantic.engines import ENGINES
+from main.III_semantic.operations import MATRIX_OPERATORS, ARITHMETIC_OPERATORS, RELATIONAL_OPERATORS, \
+    evaluate_relational_operations
+from main.III_semantic.data_types.array_data.numeric_data.decimal_data.double import Double
+
+
+SCALAR_PROGRAMS = ('accumulator', 'fibonacci', 'collatz')
+
+
+def apply(fun, operand_0, operand_1, count):
+    for _ in range(count):
+        fun(operand_0, operand_1)
+
+
+def bench_scalar_operations(count=100000):
+    operand_0 = Double([3.0])
+    operand_1 = Double([7.0])
+    rows = []
+    for operator, fun in {**ARITHMETIC_OPERATORS, **MATRIX_OPERATORS}.items():
+        rows.append((operator, measure(apply, fun, operand_0, operand_1, count) / count * 1e9))
+    for operator in RELATIONAL_OPERATORS:
+        def fun(a, b):
+            return evaluate_relational_operations(a, b, operator)
+        rows.append((operator, measure(apply, fun, operand_0, operand_1, count) / count * 1e9))
+    report("1x1 operations", rows, ("operator", "ns per op"))
+
+
+def bench_scalar_programs(engines=tuple(ENGINES)):
+    rows = []
+    for name in SCALAR_PROGRAMS:
+        for engine in engines:
+            rows.append((name, engine, measure(run_program, PROGRAMS[name], engine)))
+    report("scalar loop programs", rows, ("program", "engine", "time (s)"))
+
+
+if __name__ == "__main__":
+    bench_scalar_operations()
+    bench_scalar_programs()
@@ -0,0 +1,58 @@
+"""
+the linear systems A \ b of n x n matrices: the first solve factorizes A, the following ones reuse the factorization
+kept on A, as in a loop solving for many right hand sides, with the list and the numpy storage backends
+run from the project root: python3 -m benchmark.bench_solve
+"""
+
+
+from benchmark.utils import measure, report
+from main.III_semantic.data_types import storage
+from main.III_semantic.data_types.array_data.numeric_data.decimal_data.double import Double
+from main.III_semantic.operations import evaluate_matrix_left_division_operation
+
+
+def matrix(m, n, diagonal=0.0):
+    return Double([float((i * 7 + 3) % 11) - 5.0 + (diagonal if i % (m + 1) == 0 else 0.0) for i in range(m * n)],
+                  size=(m, n))
+
+
+def symmetric(n):
+    return Double([1.0 / (1 + abs(k % n - k // n)) + (n if k % n == k // n else 0.0) for k in range(n * n)],
+                  size=(n, n))
+
+
+# name: the n x n matrix, general matrices are solved by LU, symmetric positive definite ones by Cholesky and
+# triangular ones by substitution
+MATRICES = {
+    'general': lambda n: matrix(n, n, diagonal=n),
+    'symmetric': symmetric,
+    'triangular': lambda n: Double([float(i % 5 + 1) if i % n <= i // n else 0.0 for i in range(n * n)], size=(n, n)),
+}
+
+SIZES = (10, 100, 300, 1000)
+LIST_LIMIT = 100
+
+
+def first_solve(a, b):
+    a.factorization = None
+    evaluate_matrix_left_division_operation(a, b)
+
+
+def bench_solve(sizes=SIZES):
+    rows = []
+    for name, create in MATRICES.items():
+        for n in sizes:
+            for backend in storage.BACKENDS:
+                if backend == 'list' and n > LIST_LIMIT:
+                    continue
+                storage.use_backend(backend)
+                a, b = create(n), matrix(n, 1)
+                first = measure(first_solve, a, b)
+                again = measure(evaluate_matrix_left_division_operation, a, b)
+                rows.append((name, n, backend, first * 1e3, again * 1e3))
+    storage.use_backend(storage.DEFAULT_BACKEND)
+    report("A \\ b", rows, ("matrix", "n", "backend", "first (ms)", "cached (ms)"))
+
+
+if __name__ == "__main__":
+    bench_solve()
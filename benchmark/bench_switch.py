@@ -0,0 +1,52 @@
+"""
+execution time of a switch with many constant cases in a loop on every execution engine, with its cases compared in
+order and looked up in a table, see dispatch.py
+run from the project root: python3 -m benchmark.bench_switch
+"""
+
+
+from benchmark.utils import measure, report
+from main.I_lexical.lexer import lexer
+from main.II_syntactic.parser import Parser
+from main.II_syntactic.node_types import ASTNodeType
+from main.III_semantic.constant_folding import fold
+from main.III_semantic.engines import ENGINES
+
+
+STATES = ['idle', 'load', 'parse', 'check', 'fold', 'infer', 'emit', 'link', 'run', 'wait', 'sync', 'flush', 'close',
+          'log', 'retry', 'done']
+
+STATE_MACHINE = "state = 1;\ncount = 0;\nfor k = 1:5000\n    switch mod(k * 7, 16)\n" + "".join(
+    f"        case {i}\n            name = '{name}';\n" for i, name in enumerate(STATES)) + "    end\n" \
+    "    switch name\n" + "".join(
+    f"        case '{name}'\n            count = count + {i};\n" for i, name in enumerate(STATES)) + "    end\nend\n"
+
+
+def parsed_cases(folded, parsed):
+    """
+    the folded tree with the values of its cases as parsed, which are not constants and are compared in order
+    """
+    if folded.get_type() == ASTNodeType.SEL_ClS and folded.get_text() == 'case':
+        folded.get_children()[0] = parsed.get_child(0)
+    for folded_child, parsed_child in zip(folded.get_children(), parsed.get_children()):
+        parsed_cases(folded_child, parsed_child)
+    return folded
+
+
+def execute(ast_root, engine):
+    ENGINES[engine]().interpret_statement_list(ast_root)
+
+
+def bench_switch(engines=tuple(ENGINES)):
+    ordered = parsed_cases(fold(Parser(lexer(STATE_MACHINE)).parse_statement_list()),
+                           Parser(lexer(STATE_MACHINE)).parse_statement_list())
+    tables = fold(Parser(lexer(STATE_MACHINE)).parse_statement_list())
+    rows = []
+    for engine in engines:
+        times = [measure(execute, tree, engine) for tree in (ordered, tables)]
+        rows.append((engine, *times, times[0] / times[1]))
+    report("switch with constant cases", rows, ("engine", "ordered (s)", "table (s)", "speedup"))
+
+
+if __name__ == "__main__":
+    bench_switch()
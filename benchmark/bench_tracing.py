@@ -0,0 +1,51 @@
+"""
+execution time of a hot loop of scalars on every execution engine, interpreted and compiled after it is hot, see
+tracing.py
+run from the project root: python3 -m benchmark.bench_tracing
+"""
+
+
+from benchmark.utils import measure, report
+from main.I_lexical.lexer import lexer
+from main.II_syntactic.parser import Parser
+from main.III_semantic.constant_folding import fold
+from main.III_semantic.loop_optimization import optimize
+from main.III_semantic.engines import ENGINES
+
+
+SCALARS = """
+seed = 7;
+inside = 0;
+for k = 1:5000
+    seed = mod(seed * 75 + 74, 65537);
+    x = seed / 65537;
+    seed = mod(seed * 75 + 74, 65537);
+    y = seed / 65537;
+    if x * x + y * y <= 1
+        inside = inside + 1;
+    end
+end
+"""
+
+
+def execute(ast_root, engine, traced):
+    interpreter = ENGINES[engine]()
+    if not traced:
+        interpreter.tracer = None
+        # the closure compiler holds the tracer of its interpreter
+        if hasattr(interpreter, 'compiler'):
+            interpreter.compiler.tracer = None
+    interpreter.interpret_statement_list(ast_root)
+
+
+def bench_tracing(engines=tuple(ENGINES)):
+    ast_root = optimize(fold(Parser(lexer(SCALARS)).parse_statement_list()))
+    rows = []
+    for engine in engines:
+        times = [measure(execute, ast_root, engine, traced) for traced in (False, True)]
+        rows.append((engine, *times, times[0] / times[1]))
+    report("hot loop of scalars", rows, ("engine", "interpreted (s)", "traced (s)", "speedup"))
+
+
+if __name__ == "__main__":
+    bench_tracing()
@@ -0,0 +1,42 @@
+"""
+execution time of element-wise for loops on every execution engine, with the folded tree and with its loops
+vectorized, see vectorization.py
+run from the project root: python3 -m benchmark.bench_vectorization
+"""
+
+
+from benchmark.utils import measure, report
+from main.I_lexical.lexer import lexer
+from main.II_syntactic.parser import Parser
+from main.III_semantic.constant_folding import fold
+from main.III_semantic.loop_optimization import optimize
+from main.III_semantic.engines import ENGINES
+
+
+ELEMENT_WISE = """
+n = 5000;
+a = (1:n) / 3;
+b = ones(1, n);
+s = 0;
+for k = 1:n
+    y(k) = a(k) * 2 + b(k);
+    s = s + a(k);
+end
+"""
+
+
+def execute(ast_root, engine):
+    ENGINES[engine]().interpret_statement_list(ast_root)
+
+
+def bench_vectorization(engines=tuple(ENGINES)):
+    rows = []
+    for engine in engines:
+        times = [measure(execute, tree, engine) for tree in (fold(Parser(lexer(ELEMENT_WISE)).parse_statement_list()),
+                                                            optimize(fold(Parser(lexer(ELEMENT_WISE)).parse_statement_list())))]
+        rows.append((engine, *times, times[0] / times[1]))
+    report("element-wise loop", rows, ("engine", "folded (s)", "vectorized (s)", "speedup"))
+
+
+if __name__ == "__main__":
+    bench_vectorization()
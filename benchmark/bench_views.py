@@ -0,0 +1,67 @@
+"""
+row and column slices, blocks, transposes and reshapes of n x n matrices, every result is a view of the matrix,
+so the time per operation stays flat as n grows, and a loop reading one element of every row
+run from the project root: python3 -m benchmark.bench_views
+"""
+
+
+from benchmark.utils import measure, report, run_program
+from main.III_semantic.data_types.array_data.numeric_data.decimal_data.double import Double
+from main.III_semantic.data_types.array_data.numeric_data.decimal_data.range import Range
+from main.III_semantic.operations import evaluate_transpose_operation
+from main.III_semantic.builtin_functions.elmat.matrix_manipulation import reshape
+
+
+def square(n):
+    return Double([float(k) for k in range(n * n)], size=(n, n))
+
+
+def half(n):
+    return Range(1, 1, n // 2)
+
+
+OPERATIONS = {
+    'A(:, j)': lambda a, n: a([':', Double([2.0])]),
+    'A(i, :)': lambda a, n: a([Double([2.0]), ':']),
+    'A(1:n/2, :)': lambda a, n: a([half(n), ':']),
+    "A'": lambda a, n: evaluate_transpose_operation(a),
+    'reshape': lambda a, n: reshape([a, Double([float(n // 2)]), Double([float(2 * n)])]),
+}
+
+ROW_LOOP = """
+A = reshape(1:{count}, {n}, {n});
+s = 0;
+for i = 1:{n}
+    row = A(i, :);
+    s = s + row(1);
+end
+"""
+
+SIZES = (100, 300, 1000)
+
+
+def apply(fun, a, n, count):
+    for _ in range(count):
+        fun(a, n)
+
+
+def bench_views(sizes=SIZES, count=1000):
+    rows = []
+    for name, fun in OPERATIONS.items():
+        for n in sizes:
+            a = square(n)
+            rows.append((name, n, measure(apply, fun, a, n, count) / count * 1e6))
+    report("slicing n x n matrices", rows, ("operation", "n", "us per op"))
+
+
+def bench_row_loop(engine="closure", sizes=SIZES):
+    rows = []
+    for n in sizes:
+        time = measure(run_program, ROW_LOOP.format(count=n * n, n=n), engine, repeat=1)
+        rows.append((n, time, time / n * 1e6))
+    report(f"reading the rows of an n x n matrix ({engine} engine)", rows, ("n", "time (s)", "us per row"))
+
+
+if __name__ == "__main__":
+    bench_views()
+    bench_row_loop()
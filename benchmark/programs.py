@@ -0,0 +1,81 @@
+"""
+loop heavy MiniMATLAB programs shared by the execution engine benchmarks
+every program suppresses its output
+"""
+
+
+ACCUMULATOR = """
+s = 0;
+for k = 1:20000
+    s = s + k * 2 - 1;
+end
+"""
+
+FIBONACCI = """
+a = 0; b = 1;
+for k = 1:20000
+    c = a + b; a = b; b = c;
+    if b > 1e6
+        a = 0; b = 1;
+    end
+end
+"""
+
+GCD = """
+total = 0;
+for a0 = 1:40
+    for b0 = 1:40
+        a = a0; b = b0;
+        while a ~= b
+            if a > b
+                a = a - b;
+            else
+                b = b - a;
+            end
+        end
+        total = total + a;
+    end
+end
+"""
+
+NESTED = """
+s = 0;
+for i = 1:100
+    for j = 1:100
+        s = s + i * j;
+    end
+end
+"""
+
+COLLATZ = """
+steps = 0;
+for n0 = 1:300
+    n = n0;
+    while n ~= 1
+        if mod(n, 2) == 0
+            n = n / 2;
+        else
+            n = 3 * n + 1;
+        end
+        steps = steps + 1;
+    end
+end
+"""
+
+LINEAR_INDEXING = """
+r = 1:100;
+A = r' * r;
+s = 0;
+for k = 1:10000
+    s = s + A(k);
+end
+"""
+
+PROGRAMS = {
+    'accumulator': ACCUMULATOR,
+    'fibonacci': FIBONACCI,
+    'gcd': GCD,
+    'collatz': COLLATZ,
+    'nested': NESTED,
+    'linear_indexing': LINEAR_INDEXING,
+}
@@ -0,0 +1,59 @@
+import time
+
+
+SCRIPT_BLOCK = """%{
+generated block annotation
+    with indented text and symbols % ' " [ ( {
+%}
+a = 1.5e3 + 2 * 3 - .25 ./ 4.;  % trailing annotation
+b = [1, 2, 3; 4 5 6]';
+c = "a string" + 'char vector';
+if a >= 10 && b(1, 2) ~= 3 || ~false
+    d = a .^ 2 \\ 7;
+elseif a < 0
+    d = -a;
+else
+    d = 0;
+end
+for k = 1:2:9
+    d = d + k;
+end
+"""
+
+
+def synthetic_script(size):
+    """
+    return a script of at least size characters by repeating a block covering every token type
+    """
+    return SCRIPT_BLOCK * (size // len(SCRIPT_BLOCK) + 1)
+
+
+def measure(function, *args, repeat=3):
+    """
+    return the best wall time in seconds of repeat calls of function(*args)
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def report(title, rows, header):
+    print(title)
+    print(''.join(f"{h:>16}" for h in header))
+    for row in rows:
+        print(''.join(f"{v:>16.4f}" if isinstance(v, float) else f"{v:>16}" for v in row))
+    print()
+
+
+def run_program(program, engine):
+    """
+    lex, parse and execute the program with the named engine, return the interpreter for inspection
+    """
+    from main.III_semantic.engines import ENGINES
+    from main.script_execute import parse_program
+    interpreter = ENGINES[engine]()
+    interpreter.interpret_statement_list(parse_program(program))
+    return interpreter
@@ -1,9 +1,12 @@
+from main.III_semantic.builtin_functions.elmat.elementary_matrices import *
+from main.III_semantic.builtin_functions.elmat.matrix_manipulation import *
 from main.III_semantic.builtin_functions.elmat.special_variables_and_constants import *
+from main.III_semantic.builtin_functions.elfun.rounding_and_remainder import *
 
 
 ELEMENTARY_MATRICES = {
-    'zeros': None,
-    'ones': None,
+    'zeros': zeros,
+    'ones': ones,
     'eye': None,
     'repmat': None,
     'repelem': None,
@@ -31,7 +34,7 @@ BASIC_ARRAY_INFORMATION = {
 
 MATRIX_MANIPULATION = {
     'cat': None,
-    'reshape': None,
+    'reshape': reshape,
     'diag': None,
     'blkdiag': None,
     'tril': None,
@@ -115,6 +118,23 @@ ELEMENTARY = {
 }
 
 
+ROUNDING_AND_REMAINDER = {
+    'ceil': ceil,
+    'fix': fix,
+    'floor': floor,
+    'idivide': None,
+    'mod': mod,
+    'rem': rem,
+    'round': round
+}
+
+
+ELEMENTARY_MATH = {
+    **ROUNDING_AND_REMAINDER
+}
+
+
 MATLAB = {
     **ELEMENTARY,
+    **ELEMENTARY_MATH,
 }
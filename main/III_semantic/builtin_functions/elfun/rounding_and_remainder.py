@@ -0,0 +1,116 @@
+from main.III_semantic.builtin_functions.utils import *
+import math
+
+
+def integral(fun):
+    # infinite and NaN elements are already integral
+    def rounding(value):
+        return float(fun(value)) if math.isfinite(value) else value
+    return rounding
+
+
+def modulus(x, y):
+    return float(x) if y == 0 else float(x % y)
+
+
+def remainder(x, y):
+    try:
+        return math.fmod(x, y)
+    except ValueError:
+        return float('nan')
+
+
+# functions of the elements, also called on unboxed scalars by the compiled hot loops, see tracing.py
+SCALAR_FUNCTIONS = {
+    'floor': integral(math.floor),
+    'ceil': integral(math.ceil),
+    'fix': integral(math.trunc),
+    'round': integral(lambda x: math.copysign(math.floor(abs(x) + 0.5), x)),
+    'mod': modulus,
+    'rem': remainder,
+}
+
+
+def floor(argv):
+    """
+    %FLOOR  Round towards minus infinity.
+    %   FLOOR(X) rounds the elements of X to the nearest integers
+    %   towards minus infinity.
+    %
+    %   See also ROUND, CEIL, FIX.
+    """
+    fun = element_wise_function_generator(SCALAR_FUNCTIONS['floor'])
+    return fun(argv)
+
+
+def ceil(argv):
+    """
+    %CEIL   Round towards plus infinity.
+    %   CEIL(X) rounds the elements of X to the nearest integers
+    %   towards infinity.
+    %
+    %   See also FLOOR, ROUND, FIX.
+    """
+    fun = element_wise_function_generator(SCALAR_FUNCTIONS['ceil'])
+    return fun(argv)
+
+
+def fix(argv):
+    """
+    %FIX    Round towards zero.
+    %   FIX(X) rounds the elements of X to the nearest integers
+    %   towards zero.
+    %
+    %   See also FLOOR, ROUND, CEIL.
+    """
+    fun = element_wise_function_generator(SCALAR_FUNCTIONS['fix'])
+    return fun(argv)
+
+
+def round(argv):
+    """
+    %ROUND  rounds towards nearest decimal or integer
+    %
+    %   ROUND(X) rounds each element of X to the nearest integer.
+    %   Elements exactly halfway between two integers are rounded away from zero.
+    %
+    %   See also FLOOR, CEIL, FIX.
+    """
+    fun = element_wise_function_generator(SCALAR_FUNCTIONS['round'])
+    return fun(argv)
+
+
+def mod(argv):
+    """
+    %MOD    Modulus after division.
+    %   MOD(x,y) returns x - floor(x./y).*y if y ~= 0, carefully computed to
+    %   avoid rounding error. The inputs x and y must be real arrays of the
+    %   same size, or real scalars.
+    %
+    %   By convention:
+    %      MOD(x,0) is x.
+    %      MOD(x,x) is 0.
+    %      MOD(x,y), for x~=y and y~=0, has the same sign as y.
+    %
+    %   See also REM.
+    """
+    fun = binary_element_wise_function_generator(SCALAR_FUNCTIONS['mod'])
+    return fun(argv)
+
+
+def rem(argv):
+    """
+    %REM    Remainder after division.
+    %   REM(x,y) returns x - fix(x./y).*y if y ~= 0, carefully computed to
+    %   avoid rounding error. The inputs x and y must be real arrays of the
+    %   same size, or real scalars.
+    %
+    %   By convention:
+    %      REM(x,0) is NaN.
+    %      REM(x,x), for x~=0, is 0.
+    %      REM(x,y), for x~=y and y~=0, has the same sign as x.
+    %
+    %   See also MOD.
+    """
+    fun = binary_element_wise_function_generator(SCALAR_FUNCTIONS['rem'])
+    return fun(argv)
@@ -0,0 +1,41 @@
+from main.III_semantic.builtin_functions.utils import *
+
+
+def zeros(argv):
+    """
+    %ZEROS Zeros array.
+    %   ZEROS(N) is an N-by-N matrix of zeros.
+    %
+    %   ZEROS(M,N) or ZEROS([M,N]) is an M-by-N matrix of zeros.
+    %
+    %   ZEROS(SIZE(A)) is the same size as A and all zeros.
+    %
+    %   ZEROS with no arguments is the scalar 0.
+    %
+    %   Example:
+    %      x = zeros(2,3)
+    %
+    %   See also EYE, ONES.
+    """
+    fun = creator_function_generator(0.0)
+    return fun(argv)
+
+
+def ones(argv):
+    """
+    %ONES   Ones array.
+    %   ONES(N) is an N-by-N matrix of ones.
+    %
+    %   ONES(M,N) or ONES([M,N]) is an M-by-N matrix of ones.
+    %
+    %   ONES(SIZE(A)) is the same size as A and all ones.
+    %
+    %   ONES with no arguments is the scalar 1.
+    %
+    %   Example:
+    %      x = ones(2,3)
+    %
+    %   See also EYE, ZEROS.
+    """
+    fun = creator_function_generator(1.0)
+    return fun(argv)
@@ -0,0 +1,30 @@
+from main.III_semantic.builtin_functions.utils import *
+
+
+def reshape(argv):
+    """
+    %RESHAPE Reshape array.
+    %   RESHAPE(X,M,N) or RESHAPE(X,[M,N]) returns the M-by-N matrix
+    %   whose elements are taken columnwise from X. An error results
+    %   if X does not have M*N elements.
+    %
+    %   RESHAPE(X,...,[],...) calculates the length of the dimension
+    %   represented by [], such that the product of the dimensions
+    %   equals NUMEL(X). NUMEL(X) must be evenly divisible by the
+    %   product of the specified dimensions. You can use only one
+    %   occurrence of [].
+    %
+    %   See also SQUEEZE, SHIFTDIM, COLON.
+    """
+    x = argv[0]
+    if len(argv) == 2:
+        dimensions = [int(d) for d in argv[1]]
+    else:
+        dimensions = [int(d[0]) if len(d) else None for d in argv[1:]]
+    if None in dimensions:
+        known = dimensions[1 - dimensions.index(None)]
+        if known and len(x) % known == 0:
+            dimensions[dimensions.index(None)] = len(x) // known
+    if None in dimensions or dimensions[0] * dimensions[1] != len(x):
+        raise ReshapeError()
+    return x.reshaped(tuple(dimensions))
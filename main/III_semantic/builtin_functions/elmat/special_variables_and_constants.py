@@ -268,7 +268,7 @@ def true(argv):
     %
     %   See also FALSE, LOGICAL.
     """
-    fun = creator_function_generator(Logical([true]))
+    fun = creator_function_generator(True, Logical)
     return fun(argv)
 
 
@@ -291,5 +291,5 @@ def false(argv):
     %
     %   See also TRUE, LOGICAL.
     """
-    fun = creator_function_generator(Logical([false]))
+    fun = creator_function_generator(False, Logical)
     return fun(argv)
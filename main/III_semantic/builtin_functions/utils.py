@@ -1,10 +1,13 @@
+from main.III_semantic.data_types.array_data.logical import Logical
 from main.III_semantic.data_types.array_data.numeric_data.decimal_data.double import Double
+from main.III_semantic.utils import compat, pairs
+from main.exceptions.iii_semantic_exceptions import *
 
 
-def creator_function_generator(value):
+def creator_function_generator(value, cls=Double):
     def matrix_generator(argv):
         if len(argv) == 0:
-            return Double([value])
+            return cls([value])
         if len(argv) == 1:
             arg = argv[0]
             if arg.size == (1, 1):
@@ -13,9 +16,32 @@ def creator_function_generator(value):
             if arg.size == (1, 2):
                 m = int(arg[0])
                 n = int(arg[1])
-            return Double([value] * m * n, size=(m, n))
         if len(argv) == 2:
             m = int(argv[0][0])
             n = int(argv[1][0])
-            return Double([value] * m * n, size=(m, n))
+        # negative sizes are treated as 0, the value is converted once for all the elements
+        m, n = max(m, 0), max(n, 0)
+        return cls.converted([cls.convert(value)] * (m * n), (m, n))
     return matrix_generator
+
+
+def element_wise_function_generator(fun):
+    """
+    function applying fun to every element of its only argument
+    """
+    def element_wise_function(argv):
+        x = argv[0]
+        return Double([fun(value) for value in x], size=x.size)
+    return element_wise_function
+
+
+def binary_element_wise_function_generator(fun):
+    """
+    function applying fun to the pairs of elements of its two arguments, which are broadcast like the operands of an
+    element-wise operator
+    """
+    def binary_element_wise_function(argv):
+        x, y = argv[0], argv[1]
+        size = compat(x, y)
+        return Double([fun(a, b) for a, b in pairs(x, y, size)], size=size)
+    return binary_element_wise_function
@@ -0,0 +1,534 @@
+from main.II_syntactic.node_types import ASTNodeType
+from main.III_semantic.interpreter import Interpreter, LoopBreak, LoopContinue, display, match_self_append
+from main.III_semantic.utils import concatenate, append, assign, share, empty_columns
+from main.III_semantic.operations import *
+from main.III_semantic.literals import copy_literal
+from main.III_semantic.fusion import fusible, is_element_wise, defer, defer_sign, force
+from main.III_semantic.inference import infer, specialization, counted, KERNELS
+from main.III_semantic.tracing import HOT_ITERATIONS
+from main.III_semantic.dispatch import case_key, case_segments
+from main.exceptions.iii_semantic_exceptions import *
+
+
+class ClosureCompiler:
+    """
+    translate an abstract syntax tree into nested python closures once,
+    operators, literal values and child evaluators are bound when compiling instead of looked up on every visit
+    every closure follows the semantics of the corresponding Interpreter method, which stays the reference
+    """
+
+    def __init__(self, interpreter):
+        self.variables = interpreter.variables
+        self.builtins = interpreter.builtins
+        self.tracer = interpreter.tracer
+        # types of the expressions of the tree being compiled, see inference.py
+        self.types = {}
+        # invariant expression: one element list holding its value in the current execution of its loop, or None
+        self.invariants = {}
+        self.statement_compilers = {
+            ASTNodeType.STMT_LIST: self.compile_statement_list,
+            ASTNodeType.EXP_STMT: self.compile_expression_statement,
+            ASTNodeType.SEL_STMT: self.compile_selection_statement,
+            ASTNodeType.ITR_STMT: self.compile_iteration_statement,
+            ASTNodeType.JMP_STMT: self.compile_jump_statement,
+            ASTNodeType.HOIST_STMT: self.compile_hoisting_statement,
+            ASTNodeType.VECTOR_STMT: self.compile_vectorized_statement,
+        }
+        self.expression_compilers = {
+            ASTNodeType.CLN_EXP: self.compile_colon_expression,
+            ASTNodeType.UOP_EXP: self.compile_unary_operation_expression,
+            ASTNodeType.BOP_EXP: self.compile_binary_operation_expression,
+            ASTNodeType.NUMBER_LIT_EXP: self.compile_number_literal_expression,
+            ASTNodeType.STRING_LIT_EXP: self.compile_string_literal_expression,
+            ASTNodeType.VECTOR_LIT_EXP: self.compile_vector_literal_expression,
+            ASTNodeType.ARRAY_LIST_EXP: self.compile_array_list_expression,
+            ASTNodeType.IDENTIFIER_EXP: self.compile_identifier_expression,
+            ASTNodeType.CONSTANT_EXP: self.compile_constant_expression,
+            ASTNodeType.INVARIANT_EXP: self.compile_invariant_expression,
+        }
+
+    # statements
+    def compile(self, lst):
+        self.types = infer(lst, self.builtins, self.variables)
+        self.invariants = {}
+        return self.compile_statement_list(lst)
+
+    def compile_statement(self, stmt):
+        return self.statement_compilers[stmt.get_type()](stmt)
+
+    def compile_statement_list(self, lst):
+        statements = tuple(self.compile_statement(child) for child in lst.get_children())
+
+        def run():
+            for statement in statements:
+                statement()
+        return run
+
+    def compile_expression_statement(self, stmt):
+        variables = self.variables
+        expression = stmt.get_child(0)
+        printed = stmt.get_child(1).get_text() != ';'
+        if expression.get_type() == ASTNodeType.ASS_EXP:
+            var = expression.get_child(0).get_text()
+            value = self.compile_expression(expression.get_child(1))
+            appended = match_self_append(expression)
+            if expression.get_child(0).get_children():
+                value = self.compile_indexed_assignment(expression.get_child(0), value)
+            elif appended:
+                value = self.compile_self_append(var, value, *appended, expression.get_child(1).get_line())
+        else:
+            if expression.get_type() == ASTNodeType.IDENTIFIER_EXP and expression.get_children() == [] \
+                    and expression.get_text() not in self.builtins:
+                # calling builtin function always result in 'ans', although sometime it looks like retrieval a variable
+                var = expression.get_text()
+            else:
+                var = "ans"
+            value = self.compile_expression(expression)
+
+        if printed:
+            def run():
+                val = variables[var] = value()
+                display(var, val)
+        else:
+            def run():
+                variables[var] = value()
+        return run
+
+    def compile_self_append(self, var, value, direction, nodes, line):
+        """
+        x = [x, v] and x = [x; v], the variable is read without being handed out, so that it can grow in place,
+        value evaluates the array list as usual when x is no variable
+        """
+        variables = self.variables
+        operands = tuple(self.compile_expression(node) for node in nodes)
+
+        def run():
+            if var not in variables:
+                return value()
+            try:
+                return append(variables[var], [operand() for operand in operands], direction)
+            except SemanticException as e:
+                if e.line == 0:
+                    e.line = line
+                raise e
+        return run
+
+    def compile_indexed_assignment(self, target, value):
+        """
+        x(i, j) = v, v is written into the array of the variable x itself whenever possible, see assign
+        """
+        variables = self.variables
+        var = target.get_text()
+        line = target.get_line()
+        arguments = tuple(self.compile_expression(argument) for argument in target.get_child(0).get_children())
+
+        def run():
+            val = value()
+            index_list = [argument() for argument in arguments]
+            try:
+                return assign(variables.get(var), index_list, val)
+            except SemanticException as e:
+                if e.line == 0:
+                    e.line = line
+                raise e
+        return run
+
+    def compile_selection_statement(self, stmt):
+        clauses = stmt.get_children()[:-1]
+        if stmt.get_text() == 'if':
+            branches = []
+            for clause in clauses:
+                if clause.get_text() == 'else':
+                    branches.append((None, self.compile_statement_list(clause.get_child(0))))
+                else:
+                    branches.append((self.compile_expression(clause.get_child(0)),
+                                     self.compile_statement_list(clause.get_child(1))))
+            branches = tuple(branches)
+
+            def run():
+                for condition, body in branches:
+                    if condition is None or condition():
+                        body()
+                        break
+            return run
+
+        switch = self.compile_expression(clauses[0].get_child(0))
+        cases = [clause for clause in clauses[1:] if clause.get_text() == 'case']
+        bodies = [self.compile_statement_list(clause.get_child(1)) for clause in cases]
+        # the bodies of consecutive constant cases by the keys of their values, a (case, body) pair for any other case
+        segments = tuple({key: bodies[position] for key, position in segment.items()} if isinstance(segment, dict) else
+                         (self.compile_expression(cases[segment].get_child(0)), bodies[segment])
+                         for segment in case_segments(cases))
+        otherwise = self.compile_statement_list(clauses[-1].get_child(0)) \
+            if clauses[-1].get_text() == 'otherwise' else None
+
+        def run():
+            switch_exp = switch()
+            key = None
+            for segment in segments:
+                if type(segment) is dict:
+                    if key is None:
+                        key = case_key(switch_exp)
+                    body = segment.get(key)
+                    if body is not None:
+                        body()
+                        return
+                elif segment[0]() == switch_exp:
+                    segment[1]()
+                    return
+            if otherwise is not None:
+                otherwise()
+        return run
+
+    def compile_iteration_statement(self, stmt):
+        clause = stmt.get_child()
+        expression = clause.get_child(0)
+        body = self.compile_statement_list(clause.get_child(1))
+        variables = self.variables
+        tracer = self.tracer
+        if clause.get_text() == 'while':
+            condition = self.compile_expression(expression)
+
+            def run():
+                iterations = 0
+                while condition():
+                    try:
+                        body()
+                    except LoopContinue:
+                        pass
+                    except LoopBreak:
+                        break
+                    iterations += 1
+                    if iterations == HOT_ITERATIONS and tracer is not None and tracer.run(clause, variables):
+                        break
+            return run
+
+        name = expression.get_child(0).get_text()
+        iterable = self.compile_expression(expression.get_child(1))
+
+        def run():
+            data = iterable()
+            if not data.n:
+                variables[name] = empty_columns(data)
+            cls = data.get_class()
+            columns = iter(data.cols())
+            iterations = 0
+            for col in columns:
+                variables[name] = cls(col, size=(len(col), 1))
+                try:
+                    body()
+                except LoopContinue:
+                    pass
+                except LoopBreak:
+                    break
+                iterations += 1
+                if iterations == HOT_ITERATIONS and tracer is not None and tracer.run(clause, variables, columns):
+                    break
+        return run
+
+    def compile_hoisting_statement(self, stmt):
+        loop = self.compile_statement(stmt.get_child())
+        values = [self.invariant_value(invariant) for invariant in stmt.get_invariants()]
+
+        def run():
+            for value in values:
+                value[0] = None
+            loop()
+        return run
+
+    def compile_vectorized_statement(self, stmt):
+        variables = self.variables
+        plan = stmt.get_plan()
+        loop = self.compile_statement(stmt.get_child())
+
+        def run():
+            if not plan.run(variables):
+                loop()
+        return run
+
+    def invariant_value(self, exp):
+        return self.invariants.setdefault(exp, [None])
+
+    @staticmethod
+    def compile_jump_statement(stmt):
+        exception = LoopBreak if stmt.get_text() == 'break' else LoopContinue
+
+        def run():
+            raise exception()
+        return run
+
+    # expressions
+    def compile_expression(self, exp):
+        return self.expression_compilers[exp.get_type()](exp)
+
+    def compile_unary_operation_expression(self, exp):
+        if fusible(exp):
+            return self.compile_fused(exp)
+        line = exp.get_line()
+        operator = exp.get_text()
+        operand = self.compile_expression(exp.get_child(0))
+        if operator in ('.\'', '\''):
+            fun = evaluate_transpose_operation
+        elif operator in ('+', '-'):
+            def fun(x):
+                return evaluate_array_sign_operation(x, operator)
+        else:
+            fun = evaluate_logic_not_operator
+
+        def run():
+            try:
+                return fun(operand())
+            except SemanticException as e:
+                if e.line == 0:
+                    e.line = line
+                raise e
+        return run
+
+    def compile_binary_operation_expression(self, exp):
+        kernel = specialization(exp, self.types, fusible(exp))
+        if kernel is not None:
+            return self.compile_specialized(exp, kernel)
+        if fusible(exp):
+            return self.compile_fused(exp)
+        line = exp.get_line()
+        operator = exp.get_text()
+        child_0 = self.compile_expression(exp.get_child(0))
+        child_1 = self.compile_expression(exp.get_child(1))
+        if operator in ('&&', '||'):
+            return self.compile_logical_operations(child_0, child_1, operator, line)
+
+        if operator in MATRIX_OPERATORS:
+            fun = MATRIX_OPERATORS[operator]
+        elif operator in ARITHMETIC_OPERATORS:
+            fun = ARITHMETIC_OPERATORS[operator]
+        else:
+            def fun(operand_0, operand_1):
+                return evaluate_relational_operations(operand_0, operand_1, operator)
+        fun = counted(fun, operator, False)
+
+        def run():
+            try:
+                return fun(child_0(), child_1())
+            except SemanticException as e:
+                if e.line == 0:
+                    e.line = line
+                raise e
+        return run
+
+    def compile_specialized(self, exp, kernel):
+        line = exp.get_line()
+        child_0 = self.compile_expression(exp.get_child(0))
+        child_1 = self.compile_expression(exp.get_child(1))
+        fun = counted(KERNELS[kernel], exp.get_text(), True)
+
+        def run():
+            try:
+                return fun(child_0(), child_1())
+            except SemanticException as e:
+                if e.line == 0:
+                    e.line = line
+                raise e
+        return run
+
+    def compile_fused(self, exp):
+        deferred = self.compile_deferred(exp)
+
+        def run():
+            return force(deferred())
+        return run
+
+    def compile_deferred(self, exp):
+        """
+        closure returning the element-wise operators of the tree of exp as Lazy nodes, see fusion.py
+        """
+        if not is_element_wise(exp) or exp.get_type() == ASTNodeType.BOP_EXP and specialization(exp, self.types, True):
+            return self.compile_expression(exp)
+        line = exp.get_line()
+        operator = exp.get_text()
+        if exp.get_type() == ASTNodeType.UOP_EXP:
+            operand = self.compile_deferred(exp.get_child(0))
+
+            def run():
+                try:
+                    return defer_sign(operator, operand())
+                except SemanticException as e:
+                    if e.line == 0:
+                        e.line = line
+                    raise e
+            return run
+        child_0 = self.compile_deferred(exp.get_child(0))
+        child_1 = self.compile_deferred(exp.get_child(1))
+        deferred = counted(defer, operator, False)
+
+        def run():
+            try:
+                return deferred(operator, child_0(), child_1())
+            except SemanticException as e:
+                if e.line == 0:
+                    e.line = line
+                raise e
+        return run
+
+    @staticmethod
+    def compile_logical_operations(child_0, child_1, operator, line):
+        """
+        https://ww2.mathworks.cn/help/matlab/ref/logicaloperatorsshortcircuit.html#bt_0nai-1
+        """
+        shortcut = operator == '||'
+
+        def run():
+            try:
+                operand_0 = child_0()
+                if len(operand_0) > 1:
+                    raise ConversionError1()
+                if Logical.convert(operand_0[0]) == shortcut:
+                    return Logical.scalar(shortcut)
+
+                operand_1 = child_1()
+                if len(operand_1) > 1:
+                    raise ConversionError1()
+                return Logical.scalar(Logical.convert(operand_1[0]))
+            except SemanticException as e:
+                if e.line == 0:
+                    e.line = line
+                raise e
+        return run
+
+    def compile_colon_expression(self, exp):
+        if exp.num_children() == 0:
+            return lambda: ":"
+
+        start_exp = self.compile_expression(exp.get_child(0))
+        if exp.num_children() == 2:
+            step_exp = None
+            end_exp = self.compile_expression(exp.get_child(1))
+        else:
+            step_exp = self.compile_expression(exp.get_child(1))
+            end_exp = self.compile_expression(exp.get_child(2))
+
+        line = exp.get_line()
+
+        def run():
+            start = start_exp()[0]
+            step = step_exp()[0] if step_exp else 1
+            end = end_exp()[0]
+            try:
+                return evaluate_colon_operation(start, step, end)
+            except SemanticException as e:
+                if e.line == 0:
+                    e.line = line
+                raise e
+        return run
+
+    @staticmethod
+    def compile_number_literal_expression(exp):
+        value = Double.convert(exp.get_text())
+        return lambda: Double([value])
+
+    @staticmethod
+    def compile_string_literal_expression(exp):
+        value = exp.get_text().replace('""', '"')
+        return lambda: String([value])
+
+    @staticmethod
+    def compile_vector_literal_expression(exp):
+        value = [ord(c) for c in exp.get_text().replace("''", "'")]
+        return lambda: Char(value)
+
+    @staticmethod
+    def compile_constant_expression(exp):
+        value = exp.get_value()
+        return lambda: copy_literal(value)
+
+    def compile_invariant_expression(self, exp):
+        expression = self.compile_expression(exp.get_child())
+        value = self.invariant_value(exp)
+
+        def run():
+            if value[0] is None:
+                value[0] = share(expression())
+            return value[0]
+        return run
+
+    def compile_array_list_expression(self, exp):
+        line = exp.get_line()
+        # rows of element evaluators, rows are separated by ';' or new line
+        rows = []
+        row = []
+        for child in exp.get_children():
+            if child.get_type() == ASTNodeType.EO_STMT:
+                if child.get_text() == ';' or child.get_text() == '\n':
+                    if row:
+                        rows.append(tuple(row))
+                        row = []
+            else:
+                row.append(self.compile_expression(child))
+        if row:
+            rows.append(tuple(row))
+        rows = tuple(rows)
+
+        def run():
+            try:
+                array_list = []
+                for row_evaluators in rows:
+                    array = []
+                    for evaluator in row_evaluators:
+                        data = evaluator()
+                        if len(data):
+                            array.append(data)
+                    if array:
+                        array_list.append(array)
+
+                if array_list:
+                    return concatenate([concatenate(array, "horz") for array in array_list], "vert")
+                else:
+                    return Double([], size=(0, 0))
+            except SemanticException as e:
+                if e.line == 0:
+                    e.line = line
+                raise e
+        return run
+
+    def compile_identifier_expression(self, exp):
+        line = exp.get_line()
+        variables = self.variables
+        builtins = self.builtins
+        ref = exp.get_text()
+        if exp.get_children():
+            child = exp.get_child(0)
+            if child.get_type() == ASTNodeType.INDEX_LIST_EXP:
+                arguments = tuple(self.compile_expression(argument) for argument in child.get_children())
+            else:
+                names = [child.get_text() for child in child.get_children()]
+                arguments = tuple((lambda name: lambda: String([name]))(name) for name in names)
+        else:
+            arguments = ()
+
+        def run():
+            try:
+                if ref in variables:
+                    obj = variables[ref]
+                elif ref in builtins:
+                    obj = builtins[ref]
+                else:
+                    raise RecognitionError(repr(ref))
+                return obj([argument() for argument in arguments])
+            except SemanticException as e:
+                if e.line == 0:
+                    e.line = line
+                raise e
+        return run
+
+
+class ClosureInterpreter(Interpreter):
+    """
+    execution engine running the closures built by ClosureCompiler,
+    the inherited tree walking methods are kept as the reference implementation
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.compiler = ClosureCompiler(self)
+
+    def interpret_statement_list(self, lst):
+        self.compiler.compile(lst)()
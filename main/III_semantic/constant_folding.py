@@ -0,0 +1,116 @@
+"""
+constant folding pass, run on the tree of Parser.parse_statement_list before execution
+
+every literal, every call of a constant builtin without arguments such as pi, inf or true() and every operation or
+array list of constant operands, e.g. 2*pi/360 or [1 2; 3 4]', is evaluated once and replaced by a ConstantNode holding its value,
+the engines then only copy the value instead of converting the literal text or building the array on every visit
+
+identical constants share one value of the literal pool
+a builtin is only folded when no variable of the script (or of the session, for the REPL) has its name, since a
+variable shadows the builtin of the same name
+an expression whose evaluation raises an error is left as it is, so that the error is raised when it is executed,
+and a call with arguments such as true(30000) is never folded: it may build an array of any size, in a branch which
+never runs
+"""
+
+
+from main.II_syntactic.node import ConstantNode
+from main.II_syntactic.node_types import ASTNodeType
+from main.III_semantic.interpreter import Interpreter
+from main.III_semantic.data_types.storage import to_list
+from main.III_semantic.data_types.array_data.char import Char
+from main.III_semantic.data_types.array_data.string import String
+from main.III_semantic.data_types.array_data.logical import Logical
+from main.III_semantic.data_types.array_data.numeric_data.decimal_data.double import Double
+
+
+# builtins whose result only depends on their arguments
+CONSTANT_FUNCTIONS = ('pi', 'inf', 'Inf', 'nan', 'Nan', 'eps', 'true', 'false')
+
+LITERALS = (ASTNodeType.NUMBER_LIT_EXP, ASTNodeType.STRING_LIT_EXP, ASTNodeType.VECTOR_LIT_EXP)
+OPERATIONS = (ASTNodeType.UOP_EXP, ASTNodeType.BOP_EXP, ASTNodeType.ARRAY_LIST_EXP)
+CONSTANT_CLASSES = (Double, Logical, Char, String)
+
+
+def fold(ast_root, variables=()):
+    """
+    fold the constants of the tree in place and return it, variables are the names already bound before execution
+    """
+    return ConstantFolder(assigned_names(ast_root) | set(variables)).fold(ast_root)
+
+
+def assigned_names(node):
+    """
+    names of the variables assigned anywhere in the tree, including the variables of for loops
+    """
+    names = set()
+    if node.get_type() == ASTNodeType.ASS_EXP:
+        names.add(node.get_child(0).get_text())
+    for child in node.get_children():
+        names |= assigned_names(child)
+    return names
+
+
+def describe(value):
+    """
+    text of a ConstantNode, printed with the tree by -a
+    """
+    name = value.get_class_name().lower()
+    if value.size != (1, 1):
+        return f"{value.m}x{value.n} {name}"
+    element = value.data[0]
+    return f"{name} {chr(element) if value.get_class() is Char else element!r}"
+
+
+class ConstantFolder:
+    def __init__(self, shadowed):
+        self.shadowed = shadowed
+        # literal pool: (class, size, elements) -> value
+        self.pool = {}
+        self.evaluator = Interpreter()
+
+    def fold(self, node):
+        """
+        fold the subtrees of node, return node or the ConstantNode replacing it
+        """
+        children = node.get_children()
+        if node.get_type() != ASTNodeType.IDENT_LIST_EXP:
+            for i, child in enumerate(children):
+                children[i] = self.fold(child)
+        if not self.foldable(node):
+            return node
+        try:
+            value = self.evaluator.evaluate_expression(node)
+        except Exception:
+            # any error, also of python itself, is raised again if the expression is executed
+            return node
+        if value.get_class() not in CONSTANT_CLASSES:
+            return node
+        return ConstantNode(self.pooled(value), n_text=describe(value), n_line=node.get_line())
+
+    def foldable(self, node):
+        node_type = node.get_type()
+        if node_type in LITERALS:
+            return True
+        if node_type in OPERATIONS:
+            return all(is_constant(child) for child in node.get_children()
+                       if child.get_type() != ASTNodeType.EO_STMT)
+        if node_type == ASTNodeType.IDENTIFIER_EXP:
+            name = node.get_text()
+            if name not in CONSTANT_FUNCTIONS or name in self.shadowed or self.evaluator.builtins.get(name) is None:
+                return False
+            # pi, pi() or true(), the arguments of a call would give the size of its result
+            return not node.get_children() or (node.get_child(0).get_type() == ASTNodeType.INDEX_LIST_EXP
+                                               and not node.get_child(0).get_children())
+        return False
+
+    def pooled(self, value):
+        cls = value.get_class()
+        # a view or a range gets a storage of its own
+        value = cls.converted(value.data, value.size)
+        key = (cls, value.size, tuple(to_list(value.data)))
+        return self.pool.setdefault(key, value)
+
+
+def is_constant(node):
+    return node.get_type() == ASTNodeType.CONSTANT_EXP
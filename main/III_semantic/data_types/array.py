@@ -1,44 +1,168 @@
 from main.III_semantic.data_types.data import Data
+from main.III_semantic.data_types.storage import numpy, store, is_buffer, to_list
 from main.exceptions.iii_semantic_exceptions import *
+import weakref
+
+
+# slices A(i, :), A(:, j), A(2:5, :) and A(:), transposes and reshapes of arrays with at least VIEW_THRESHOLD elements
+# are views reading the storage of the array they come from, smaller results are copied since that is cheaper
+VIEW_THRESHOLD = 16
 
 
 class Array(Data):
+    # data keeps the elements in column major order like MATLAB, so linear indexing, A(:) and for loops over columns
+    # read it directly, rows are gathered with a stride of m
+    # element type of the numpy buffer of the class, None for classes which are always stored in lists
+    buffer_type = None
+    # set once the array may be referred to by more than one variable, from then on it is never grown in place
+    shared = False
+    # element filling the gap when an indexed assignment grows the array beyond its end
+    padding = 0
+    # whether an index of the class selects the positions of its true elements instead of listing subscripts
+    mask = False
+    # views reading the storage of the array, they get their own copy of the elements before it is written in place
+    views = None
+    # factorization of the matrix kept by the first solve of a linear system for the next ones, see linear_algebra.py
+    factorization = None
+
     def __init__(self, data, size=None):
-        self.data = [self.convert(element) for element in data]
+        self.data = store(self, data)
         self.size = size if size else (1, len(data))
 
+    @classmethod
+    def to_buffer(cls, data):
+        """
+        typed buffer of the numpy array data, or None if the elements can not be stored in the buffer type of the class
+        """
+        return None
+
+    @classmethod
+    def converted(cls, data, size):
+        """
+        array of elements which are already converted to the class, a buffer is taken over without a copy
+        """
+        array = cls.__new__(cls)
+        array.data = data if is_buffer(data) else store(array, data, convert=False)
+        array.size = size
+        return array
+
+    @classmethod
+    def scalar(cls, value):
+        """
+        1x1 array of a value which is already converted to the class, without the conversion of the constructor
+        """
+        array = cls.__new__(cls)
+        array.data = [value]
+        array.size = (1, 1)
+        return array
+
     def __bool__(self):
+        if is_buffer(self.data):
+            return bool(self.data.all())
         return all(self.data)
 
     def __iter__(self):
-        return iter(self.data)
+        # elements of a buffer are handed out as python values, like the elements of a list
+        return iter(to_list(self.data)) if is_buffer(self.data) else iter(self.data)
 
     def __getitem__(self, i):
-        return self.data[i]
+        return self.data[i].item() if is_buffer(self.data) else self.data[i]
 
     def __len__(self):
         return len(self.data)
 
     def __eq__(self, other):
-        return self.data == other.data and self.size == other.size
+        if is_buffer(self.data) and is_buffer(other.data):
+            return self.size == other.size and bool(numpy.array_equal(self.data, other.data))
+        return to_list(self.data) == to_list(other.data) and self.size == other.size
 
     def rows(self):
-        return [[self[i * self.n + j] for j in range(self.n)] for i in range(self.m)]
+        m, n = self.size
+        if is_buffer(self.data):
+            return self.data.reshape((n, m)).T.tolist()
+        return [self.data[i::m] for i in range(m)]
 
     def cols(self):
-        return [[self[i * self.n + j] for i in range(self.m)] for j in range(self.n)]
-
-    def expand_row(self, num):
-        self.data = self.data * num
-        self.size = (self.size[0] * num, self.size[1])
-
-    def expand_col(self, num):
-        self.data = sum(([i for _ in range(num)] for i in self), [])
-        self.size = (self.size[0], self.size[1] * num)
+        m, n = self.size
+        if is_buffer(self.data):
+            return self.data.reshape((n, m)).tolist()
+        return [self.data[j * m:(j + 1) * m] for j in range(n)]
 
     @property
     def refactored(self):
-        return sum(self.cols(), [])
+        """
+        elements in column major order, which is the storage order, so nothing is copied
+        """
+        return self.data
+
+    @property
+    def transposed(self):
+        """
+        elements of the transpose in column major order, that is the elements of self in row major order
+        """
+        m, n = self.size
+        if is_buffer(self.data):
+            return self.data.reshape((n, m)).T.flatten()
+        return [i for k in range(m) for i in self.data[k::m]]
+
+    def reshaped(self, size):
+        """
+        array of the same class in another shape with the elements of self in the same column major order,
+        a view of self unless it is small
+        """
+        if len(self) < VIEW_THRESHOLD:
+            return self.get_class().converted(to_list(self.data), size)
+        stride = self.linear_stride()
+        if stride is None:
+            # the elements of a view which are not evenly spaced in its storage are copied
+            return self.get_class().converted(self.gather(), size)
+        return View.over(self, self.layout()[1], (stride, stride * size[0]), size)
+
+    def transpose(self):
+        """
+        the transpose, a view of self unless it is small
+        """
+        size = (self.n, self.m)
+        if len(self) < VIEW_THRESHOLD:
+            return self.get_class()(self.transposed, size=size)
+        source, offset, stride_m, stride_n = self.layout()
+        return View.over(self, offset, (stride_n, stride_m), size)
+
+    def layout(self):
+        """
+        (storage, offset, row stride, column stride): the element (i, j) of self is storage[offset + i * row stride +
+        j * column stride]
+        """
+        return self.data, 0, 1, self.m
+
+    def linear_stride(self):
+        """
+        distance in the storage between consecutive elements of the linear index, None if it varies
+        """
+        source, offset, stride_m, stride_n = self.layout()
+        if self.m == 1:
+            return stride_n
+        if self.n == 1 or stride_n == stride_m * self.m:
+            return stride_m
+        return None
+
+    def progression(self):
+        """
+        (first, step, count) of the elements when they are known to be an arithmetic progression without reading
+        them all, None otherwise
+        """
+        return (self[0], 1, 1) if self.size == (1, 1) and not self.mask else None
+
+    def detach(self):
+        """
+        give every view of self a copy of the elements and drop the factorization of self, before the storage of self
+        is written in place
+        """
+        self.factorization = None
+        if self.views:
+            for view in list(self.views.values()):
+                view.materialize()
+            self.views = None
 
     def pile(self, fun):
         return '\n'.join([''.join([fun(v) for v in r]) for r in self.rows()])
@@ -55,28 +179,69 @@ class Array(Data):
 
     def __call__(self, index_list):
         if len(index_list) == 0:
+            # the array itself is handed out, so it may end up in another variable
+            self.shared = True
             return self
         elif len(index_list) == 1:
             index = index_list[0]
             if isinstance(index, str):
-                return self.__class__(self.refactored, size=(len(self), 1))
-            data = self.refactored
-            return self.__class__([data[self.get_int_index(element) - 1] for element in index], size=index.size)
-        elif len(index_list) == 2:
-            index_m = index_list[0]
-            if isinstance(index_m, str):
-                index_m = [i for i in range(0, self.m)]
+                return self.reshaped((len(self), 1))
+            if len(index) >= VIEW_THRESHOLD:
+                window = self.window(index, len(self))
+                stride = self.linear_stride() if window else None
+                if stride:
+                    first, step, count = window
+                    return View.over(self, self.layout()[1] + first * stride, (step * stride, step * stride),
+                                     index.size)
+            positions = self.positions(index, len(self))
+            if index.mask:
+                size = (1, len(positions)) if self.m == 1 else (len(positions), 1)
             else:
-                index_m = [self.get_int_index(i) - 1 for i in index_m.refactored]
+                size = index.size
+            return self.get_class()([self[p] for p in positions], size=size)
+        elif len(index_list) == 2:
+            index_m, index_n = index_list
+            if (self.m if isinstance(index_m, str) else len(index_m)) \
+                    * (self.n if isinstance(index_n, str) else len(index_n)) >= VIEW_THRESHOLD:
+                rows = self.window(index_m, self.m)
+                cols = self.window(index_n, self.n) if rows else None
+                if cols:
+                    source, offset, stride_m, stride_n = self.layout()
+                    return View.over(self, offset + rows[0] * stride_m + cols[0] * stride_n,
+                                     (rows[1] * stride_m, cols[1] * stride_n), (rows[2], cols[2]))
+            index_m = self.positions(index_m, self.m)
+            index_n = self.positions(index_n, self.n)
+            return self.get_class()([self[j * self.m + i] for j in index_n for i in index_m],
+                                    size=(len(index_m), len(index_n)))
 
-            index_n = index_list[1]
-            if isinstance(index_n, str):
-                index_n = [i for i in range(0, self.n)]
-            else:
-                index_n = [self.get_int_index(i) - 1 for i in index_n.refactored]
+    @staticmethod
+    def window(index, extent):
+        """
+        (first, step, count) of the zero based positions selected by ':' or by an integral progression inside a
+        dimension of extent elements, None for any other index
+        """
+        if isinstance(index, str):
+            return 0, 1, extent
+        progression = index.progression()
+        if progression is None:
+            return None
+        first, step, count = progression
+        last = first + step * (count - 1)
+        if first != int(first) or step != int(step) or not (1 <= first <= extent and 1 <= last <= extent):
+            return None
+        return int(first) - 1, int(step), count
 
-            return self.__class__([self[i * self.n + j] for i in index_m for j in index_n],
-                                  size=(len(index_m), len(index_n)))
+    @staticmethod
+    def positions(index, extent):
+        """
+        zero based positions selected by an index along a dimension of extent elements: ':' selects all of them,
+        a logical index the positions of its true elements, any other index lists subscripts counted from 1
+        """
+        if isinstance(index, str):
+            return range(extent)
+        if index.mask:
+            return [position for position, element in enumerate(index) if element]
+        return [Array.get_int_index(element) - 1 for element in index]
 
     @property
     def m(self):
@@ -92,3 +257,146 @@ class Array(Data):
             return int(number)
         else:
             raise ArrayIndexError()
+
+
+def strided(source, start, step, count):
+    """
+    list of count elements of the storage source from start on with a step
+    """
+    stop = start + step * count
+    elements = source[start:stop if stop >= 0 else None:step]
+    return elements.tolist() if is_buffer(elements) else elements
+
+
+class View(Array):
+    """
+    array whose element (i, j) is the element offset + i * strides[0] + j * strides[1] of the storage of another array,
+    the owner, so that slicing, transposing and reshaping take constant time whatever the number of elements
+
+    a view is never written in place (its class is not the class of its elements, see assign and append), and the
+    owner gives its views their own copy of the elements before it is written in place (detach), so every array
+    keeps its value: copy-on-write
+    the elements are gathered into a storage of the view itself (like Range) once the data is accessed as a whole
+    """
+    # class of the views of every class of elements, see of
+    classes = {}
+    # class of the elements, set in the classes created by of
+    element_class = None
+
+    @classmethod
+    def of(cls, element_class):
+        """
+        class of the views of arrays of element_class, a subclass of both, so that it prints and computes like them
+        """
+        if element_class not in cls.classes:
+            cls.classes[element_class] = type(f"{element_class.__name__}View", (cls, element_class),
+                                              {'element_class': element_class})
+        return cls.classes[element_class]
+
+    @classmethod
+    def over(cls, array, offset, strides, size):
+        """
+        view of the given size over the storage of array at offset with strides, see layout
+        """
+        view_class = cls.of(array.get_class())
+        view = view_class.__new__(view_class)
+        view.source = array.layout()[0]
+        view.offset = offset
+        view.strides = strides
+        view.size = size
+        view.dense = None
+        owner = array.owner if isinstance(array, View) and array.dense is None else array
+        view.owner = owner
+        if owner.views is None:
+            # arrays are not hashable, the views are kept by their id until they are garbage collected
+            owner.views = weakref.WeakValueDictionary()
+        owner.views[id(view)] = view
+        return view
+
+    def materialize(self):
+        """
+        copy the elements into a storage of the view itself, from then on it does not read the owner
+        """
+        if self.dense is None:
+            self.dense = store(self, self.gather(), convert=False)
+            self.source = self.owner = None
+
+    @property
+    def data(self):
+        self.materialize()
+        return self.dense
+
+    @data.setter
+    def data(self, data):
+        # storing new elements in the view turns it into an ordinary array
+        self.dense = data
+        self.source = self.owner = None
+
+    def gather(self):
+        """
+        the elements in column major order
+        """
+        source, offset, (stride_m, stride_n), (m, n) = self.source, self.offset, self.strides, self.size
+        if is_buffer(source):
+            index = offset + stride_m * numpy.arange(m) + stride_n * numpy.arange(n)[:, None]
+            return source[index.ravel()]
+        if m == 1:
+            return strided(source, offset, stride_n, n)
+        data = [None] * (m * n)
+        if m <= n:
+            for i in range(m):
+                data[i::m] = strided(source, offset + i * stride_m, stride_n, n)
+        else:
+            for j in range(n):
+                data[j * m:(j + 1) * m] = strided(source, offset + j * stride_n, stride_m, m)
+        return data
+
+    def layout(self):
+        if self.dense is None:
+            return self.source, self.offset, self.strides[0], self.strides[1]
+        return super().layout()
+
+    def __iter__(self):
+        if self.dense is None:
+            return (element for col in self.cols() for element in col)
+        return super().__iter__()
+
+    def __getitem__(self, k):
+        if self.dense is None:
+            m, length = self.size[0], len(self)
+            if k < 0:
+                k += length
+            if not 0 <= k < length:
+                raise IndexError(k)
+            element = self.source[self.offset + k % m * self.strides[0] + k // m * self.strides[1]]
+            return element.item() if is_buffer(self.source) else element
+        return super().__getitem__(k)
+
+    def __len__(self):
+        return self.size[0] * self.size[1] if self.dense is None else len(self.dense)
+
+    def rows(self):
+        if self.dense is None:
+            return [strided(self.source, self.offset + i * self.strides[0], self.strides[1], self.n)
+                    for i in range(self.m)]
+        return super().rows()
+
+    def cols(self):
+        if self.dense is None:
+            return [strided(self.source, self.offset + j * self.strides[1], self.strides[0], self.m)
+                    for j in range(self.n)]
+        return super().cols()
+
+    @property
+    def refactored(self):
+        return list(self) if self.dense is None else super().refactored
+
+    @property
+    def transposed(self):
+        return [element for row in self.rows() for element in row] if self.dense is None else super().transposed
+
+    def get_class(self):
+        return self.element_class
+
+    def get_class_name(self):
+        return self.element_class.__name__
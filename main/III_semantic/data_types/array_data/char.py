@@ -1,10 +1,26 @@
 from main.III_semantic.data_types.array import Array
+from main.III_semantic.data_types.storage import numpy
+from main.exceptions.iii_semantic_exceptions import *
+import math
 
 
 class Char(Array):
     """
     https://ww2.mathworks.cn/help/matlab/ref/char.html
     """
+    buffer_type = 'uint16'
+
+    @classmethod
+    def to_buffer(cls, data):
+        # only character codes fit in the buffer, other values stay in a list as they are
+        if data.dtype.kind not in 'buif':
+            return None
+        if data.dtype.kind == 'f' and not ((data == numpy.floor(data)) & (data >= 0) & (data < 65536)).all():
+            return None
+        if data.dtype.kind in 'iu' and not ((data >= 0) & (data < 65536)).all():
+            return None
+        return numpy.array(data, dtype=numpy.uint16)
+
     def __str__(self):
         if self.n == 0:
             return "  0x0 empty char array"
@@ -16,3 +32,17 @@ class Char(Array):
 
         return prefix + '\n'.join('    ' + '\'' + ''.join(chr(i) for i in row) + '\'' for row in self.rows())
 
+    @staticmethod
+    def convert(obj):
+        # the elements are character codes, numbers written into a char array are truncated to codes and the
+        # character of a string is written as its code
+        if isinstance(obj, str):
+            if len(obj) != 1:
+                raise AssignmentNumberError()
+            return ord(obj)
+        if not isinstance(obj, int) and not math.isfinite(obj):
+            raise ConversionError4()
+        code = int(obj)
+        if not 0 <= code < 65536:
+            raise ConversionError5()
+        return code
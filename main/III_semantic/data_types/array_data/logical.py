@@ -1,5 +1,6 @@
 from main.III_semantic.data_types.array import Array
 from main.III_semantic.data_types.array_data.numeric_data.decimal_data.double import Double
+from main.III_semantic.data_types.storage import numpy
 from main.exceptions.iii_semantic_exceptions import *
 import math
 
@@ -9,6 +10,16 @@ class Logical(Array):
     https://ww2.mathworks.cn/help/matlab/ref/logical.html
     """
     parent = Double
+    buffer_type = 'bool_'
+    mask = True
+
+    @classmethod
+    def to_buffer(cls, data):
+        if data.dtype.kind not in 'biufc':
+            return None
+        if data.dtype.kind in 'fc' and numpy.isnan(data).any():
+            raise ConversionError3()
+        return numpy.array(data, dtype=numpy.bool_)
 
     def __str__(self):
         if len(self) == 1:
@@ -1,5 +1,6 @@
 from main.III_semantic.data_types.array_data.numeric_data.decimal import Decimal
 from main.III_semantic.data_types.array_data.string import String
+from main.III_semantic.data_types.storage import numpy
 import math
 
 
@@ -8,12 +9,22 @@ class Double(Decimal):
     https://ww2.mathworks.cn/help/matlab/ref/double.html
     """
     parent = String
+    buffer_type = 'float64'
+
+    @classmethod
+    def to_buffer(cls, data):
+        if data.dtype.kind == 'c':
+            data = data.real
+        return numpy.array(data, dtype=numpy.float64)
 
     def __str__(self):
         if self.size == (0, 0):
             return "     []"
-        if self.n == 0:  # 1：0.1
+        if self.n == 0 and self.m == 1:  # 1：0.1
             return "  1x0 empty double row vector"
+        if self.m == 0 or self.n == 0:
+            # what is left after deleting every row or every column
+            return f"  {self.m}x{self.n} empty double {'column vector' if self.n == 1 else 'matrix'}"
         if all(not self.has_decimal(n) for n in self):
             max_len = max(self.integer_length_excluding_sign(n) for n in self)
             if max_len <= 3:
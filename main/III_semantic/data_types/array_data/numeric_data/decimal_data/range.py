@@ -0,0 +1,115 @@
+from main.III_semantic.data_types.array_data.numeric_data.decimal_data.double import Double
+from main.III_semantic.data_types import storage
+from main.III_semantic.data_types.storage import numpy, BUFFER_THRESHOLD
+import math
+
+
+class Range(Double):
+    """
+    row vector start:step:end created by the colon operator, it only keeps the end points and the number of elements,
+    every element is computed from its index, so no rounding error accumulates and no list is built
+    the elements are materialized into a list (promotion) only when the data is accessed as a whole
+
+    elements follow the algorithm of MATLAB: the first half is counted from the start, the second half from the end
+    (https://blogs.mathworks.com/cleve/2019/03/18/the-colon-operator/)
+    """
+
+    def __init__(self, start, step, end):
+        if step == 0 or start < end and step < 0 or start > end and step > 0:
+            count = 0
+            last = end
+        else:
+            tolerance = 2.0 * 2 ** -52 * max(abs(start), abs(end))
+            sign = 1 if step > 0 else -1
+            if start == math.floor(start) and step == 1:
+                intervals = math.floor(end) - start
+            elif start == math.floor(start) and step == math.floor(step):
+                intervals = math.floor((end - start) / step)
+            else:
+                intervals = math.floor((end - start) / step + 0.5)
+                if sign * (start + intervals * step - end) > tolerance:
+                    intervals -= 1
+            count = int(intervals) + 1
+            last = start + intervals * step
+            if sign * (last - end) > -tolerance:
+                last = end
+        self.start = start
+        self.step = step
+        self.last = last
+        self.count = count
+        self.size = (1, count)
+        self.dense = None
+
+    def element(self, i):
+        intervals = self.count - 1
+        if 2 * i < intervals:
+            return self.start + i * self.step
+        if 2 * i > intervals:
+            return self.last - (intervals - i) * self.step
+        return (self.start + self.last) / 2
+
+    def elements(self):
+        """
+        every element as a numpy buffer, computed like element
+        """
+        intervals = self.count - 1
+        index = numpy.arange(self.count, dtype=numpy.float64)
+        values = numpy.where(2 * index < intervals, self.start + index * self.step,
+                             self.last - (intervals - index) * self.step)
+        if intervals % 2 == 0:
+            values[intervals // 2] = (self.start + self.last) / 2
+        return values
+
+    @property
+    def data(self):
+        if self.dense is None:
+            if storage.buffered and self.count >= BUFFER_THRESHOLD:
+                self.dense = self.elements()
+            else:
+                self.dense = [self.element(i) for i in range(self.count)]
+        return self.dense
+
+    @data.setter
+    def data(self, data):
+        # storing new elements in the range turns it into an ordinary dense array
+        self.dense = data
+
+    def __bool__(self):
+        return all(self)
+
+    def __iter__(self):
+        if self.dense is None:
+            return (self.element(i) for i in range(self.count))
+        return super().__iter__()
+
+    def __getitem__(self, i):
+        if self.dense is None:
+            if i < 0:
+                i += self.count
+            if 0 <= i < self.count:
+                return self.element(i)
+        return super().__getitem__(i)
+
+    def __len__(self):
+        return self.count if self.dense is None else len(self.dense)
+
+    def cols(self):
+        if self.dense is None:
+            return ([value] for value in self)
+        return super().cols()
+
+    def progression(self):
+        if self.dense is None:
+            return self.start, self.step, self.count
+        return super().progression()
+
+    @property
+    def refactored(self):
+        # a row vector has the same elements in column major order
+        return list(self) if self.dense is None else super().refactored
+
+    def get_class(self):
+        return Double
+
+    def get_class_name(self):
+        return Double.__name__
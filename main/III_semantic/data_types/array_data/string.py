@@ -5,6 +5,7 @@ class String(Array):
     """
     https://ww2.mathworks.cn/help/matlab/ref/string.html
     """
+    padding = ""
 
     def __str__(self):
         if len(self) < 2:
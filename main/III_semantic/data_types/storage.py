@@ -0,0 +1,87 @@
+"""
+storage backends of the elements of arrays
+
+list: every array keeps its elements in a python list, the only backend without numpy
+numpy: arrays of Double, Logical and Char with at least BUFFER_THRESHOLD elements keep them in a contiguous typed
+       buffer (float64, bool_ and uint16), on which the operations are vectorized,
+       shorter arrays stay in lists because numpy does not pay off for a handful of elements
+
+every piece of code reading array.data has to accept both a list and a buffer
+"""
+
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+BACKENDS = ('list', 'numpy') if numpy is not None else ('list',)
+DEFAULT_BACKEND = BACKENDS[-1]
+BUFFER_THRESHOLD = 64
+
+buffered = DEFAULT_BACKEND == 'numpy'
+
+
+def use_backend(name):
+    global buffered
+    if name not in BACKENDS:
+        raise ValueError(f"storage backend {name!r} is not available")
+    buffered = name == 'numpy'
+
+
+def is_buffer(data):
+    return numpy is not None and isinstance(data, numpy.ndarray)
+
+
+def to_list(data):
+    return data.tolist() if is_buffer(data) else list(data)
+
+
+def store(array, data, convert=True):
+    """
+    return the storage of the elements data of array: converted by the class of array unless they already are,
+    in a buffer if it is long enough
+    """
+    bufferable = buffered and array.buffer_type is not None and len(data) >= BUFFER_THRESHOLD
+    if is_buffer(data):
+        if bufferable:
+            buffer = array.to_buffer(data)
+            if buffer is not None:
+                return buffer
+        data = data.tolist()
+    if convert:
+        data = [array.convert(element) for element in data]
+    if bufferable:
+        buffer = array.to_buffer(numpy.array(data))
+        if buffer is not None:
+            return buffer
+    return data
+
+
+def grow(buffer, length):
+    """
+    buffer extended to length elements, the new ones uninitialized
+    the elements stay at the start of a larger allocation, which is reused as long as it has room and is replaced by
+    one twice as large otherwise, so that growing an array element by element takes amortized constant time
+    """
+    base = buffer.base
+    if base is None or base.ndim != 1 or base.dtype != buffer.dtype or base.size < length \
+            or not numpy.shares_memory(base[:1], buffer[:1]):
+        base = numpy.empty(max(length, 2 * len(buffer)), dtype=buffer.dtype)
+        base[:len(buffer)] = buffer
+    return base[:length]
+
+
+def as_float_buffer(array):
+    """
+    the elements of array as a float64 buffer, the operand of vectorized arithmetic and comparison
+    """
+    return numpy.asarray(array.data, dtype=numpy.float64)
+
+
+def vectorized(operand_0, operand_1):
+    """
+    operations are vectorized once one of the operands is stored in a buffer
+    """
+    return is_buffer(operand_0.data) or is_buffer(operand_1.data)
@@ -0,0 +1,56 @@
+"""
+hash dispatch of switch statements
+
+a switch compares its value with the value of every case in order, with ==, and runs the body of the first case which
+is equal. the values of the cases which are constants are known before the switch runs, so the engines look the
+consecutive constant cases up together in a table from the keys of their values, a key appearing twice keeping its
+first case: two arrays are equal exactly when their keys are, so one lookup finds the case the comparisons in order
+would find
+
+a case which is not a constant, like x + 1, is still evaluated and compared in its place, between the tables of the
+constant cases before and after it, so it raises its errors exactly like without the tables
+"""
+
+
+from main.II_syntactic.node_types import ASTNodeType
+from main.III_semantic.data_types.storage import to_list
+
+
+def case_key(value):
+    """
+    hashable key of an array, the keys of two arrays are equal exactly when the arrays are equal by ==
+    """
+    return value.size, tuple(to_list(value.data))
+
+
+def case_segments(cases):
+    """
+    the case clauses of a switch in order, in segments: a dict from the keys of consecutive constant cases to the
+    position of the first case with the key, or the position of a case which is compared by itself
+    """
+    segments = []
+    for position, clause in enumerate(cases):
+        expression = clause.get_child(0)
+        if expression.get_type() != ASTNodeType.CONSTANT_EXP:
+            segments.append(position)
+            continue
+        if not segments or not isinstance(segments[-1], dict):
+            segments.append({})
+        segments[-1].setdefault(case_key(expression.get_value()), position)
+    return segments
+
+
+def dispatch(segments, value, compare):
+    """
+    position of the case selected by the value of the switch, None when no case is
+    compare(position) evaluates the case at the position and compares it with the value
+    """
+    key = None
+    for segment in segments:
+        if isinstance(segment, dict):
+            key = case_key(value) if key is None else key
+            if key in segment:
+                return segment[key]
+        elif compare(segment):
+            return segment
+    return None
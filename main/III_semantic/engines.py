@@ -0,0 +1,13 @@
+from main.III_semantic.interpreter import Interpreter
+from main.III_semantic.closure_compiler import ClosureInterpreter
+from main.V_bytecode.vm import BytecodeInterpreter
+
+
+# execution engines selectable from the command line, 'tree' is the reference tree walking interpreter
+ENGINES = {
+    'closure': ClosureInterpreter,
+    'tree': Interpreter,
+    'bytecode': BytecodeInterpreter,
+}
+
+DEFAULT_ENGINE = 'closure'
@@ -0,0 +1,190 @@
+"""
+fusion of element-wise expressions
+
+a tree of at least two element-wise operators, such as a .* b + c ./ d - 2, is evaluated as a whole instead of one
+operator at a time: every operator of the tree returns a Lazy node holding its operands, and the root evaluates the
+tree in one pass, so that no intermediate array is built, converted or broadcast
+
+numpy: the tree is computed block by block of about CHUNK elements, the intermediate buffers of a block stay in the
+       cache instead of going through memory once per operator
+list: the elements flow through a chain of map iterators, one element of the result at a time
+
+the checks of every operator (sizes, string operands) are made when the operator is reached, so errors are raised in
+the same order as without fusion, pairs of scalars and operands of other classes, such as strings, are simply
+evaluated right away
+"""
+
+
+from main.II_syntactic.node_types import ASTNodeType
+from main.III_semantic.operations import *
+from main.III_semantic.utils import broadcast
+from main.III_semantic.data_types import storage
+from main.III_semantic.data_types.storage import BUFFER_THRESHOLD
+import operator as python_operator
+
+
+CHUNK = 16384
+
+ELEMENT_WISE_OPERATORS = frozenset(ARITHMETIC_OPERATORS) | frozenset(RELATIONAL_OPERATORS)
+SIGN_OPERATORS = frozenset(('+', '-'))
+
+# unfused evaluation of the operators
+OPERATORS = {
+    **ARITHMETIC_OPERATORS,
+    **{operator: (lambda a, b, operator=operator: evaluate_relational_operations(a, b, operator))
+       for operator in RELATIONAL_OPERATORS},
+}
+
+# functions of the elements, for the list path
+ELEMENT_FUNCTIONS = {
+    '+': python_operator.add,
+    '-': python_operator.sub,
+    '.*': python_operator.mul,
+    './': division,
+    '.\\': lambda a, b: division(b, a),
+    # a negative base with a fractional exponent has a complex result, of which only the real part is kept
+    '.^': lambda a, b: Double.convert(power(a, b)),
+    **RELATIONAL_OPERATORS,
+}
+SIGN_FUNCTIONS = {'+': python_operator.pos, '-': python_operator.neg}
+
+# functions of whole buffers, for the numpy path
+BUFFER_FUNCTIONS = {
+    '+': numpy.add,
+    '-': numpy.subtract,
+    '.*': numpy.multiply,
+    './': numpy.divide,
+    '.\\': lambda a, b: b / a,
+    '.^': vectorized_power,
+    **RELATIONAL_OPERATORS,
+} if numpy is not None else {}
+SIGN_BUFFER_FUNCTIONS = {'+': numpy.positive, '-': numpy.negative} if numpy is not None else {}
+
+
+def is_element_wise(exp):
+    node_type = exp.get_type()
+    if node_type is ASTNodeType.BOP_EXP:
+        return exp.get_text() in ELEMENT_WISE_OPERATORS
+    return node_type is ASTNodeType.UOP_EXP and exp.get_text() in SIGN_OPERATORS
+
+
+def fusible(exp):
+    """
+    whether exp is the root of a tree of at least two element-wise operators
+    """
+    return is_element_wise(exp) and any(is_element_wise(child) for child in exp.get_children())
+
+
+class Lazy:
+    """
+    an element-wise operation of the operands, arrays or other Lazy nodes, whose evaluation is left to the root
+    """
+    __slots__ = ('operator', 'operands', 'size')
+
+    def __init__(self, operator, operands, size):
+        self.operator = operator
+        self.operands = operands
+        self.size = size
+
+
+def deferrable(operand):
+    return operand.__class__ is Lazy or operand.get_class() in SCALAR_CLASSES
+
+
+def defer(operator, operand_0, operand_1):
+    """
+    operand_0 operator operand_1 as a Lazy node, evaluated right away for a pair of scalars or an operand which is not
+    a double, logical or char array
+    """
+    if are_scalars(operand_0, operand_1):
+        return OPERATORS[operator](operand_0, operand_1)
+    if not (deferrable(operand_0) and deferrable(operand_1)):
+        return OPERATORS[operator](force(operand_0), force(operand_1))
+    return Lazy(operator, (operand_0, operand_1), compat(operand_0, operand_1))
+
+
+def defer_sign(operator, operand):
+    """
+    the sign operator + or - of operand as a Lazy node, evaluated right away for a scalar or an operand which is not a
+    double, logical or char array
+    """
+    if operand.__class__ is not Lazy and (is_scalar(operand) or not deferrable(operand)):
+        return evaluate_array_sign_operation(operand, operator)
+    return Lazy(operator, (operand,), operand.size)
+
+
+def force(value):
+    """
+    the array of value, the tree of a Lazy node is evaluated
+    """
+    if value.__class__ is not Lazy:
+        return value
+    leaves = []
+    collect(value, leaves)
+    m, n = value.size
+    cls = Logical if len(value.operands) == 2 and value.operator in RELATIONAL_OPERATORS else Double
+    if storage.buffered and (m * n >= BUFFER_THRESHOLD or any(is_buffer(leaf.data) for leaf in leaves)):
+        return cls.converted(evaluate_buffers(value, cls), value.size)
+    return cls.converted(list(elements(value, value.size)), value.size)
+
+
+def collect(node, leaves):
+    for operand in node.operands:
+        if operand.__class__ is Lazy:
+            collect(operand, leaves)
+        else:
+            leaves.append(operand)
+
+
+def elements(node, size):
+    """
+    iterator over the elements of the tree of node broadcast to size in column major order
+    """
+    if node.__class__ is not Lazy:
+        if node.__class__ is Double:
+            return broadcast(node, size)
+        return map(float, broadcast(node, size))
+    if len(node.operands) == 1:
+        return map(SIGN_FUNCTIONS[node.operator], elements(node.operands[0], size))
+    return map(ELEMENT_FUNCTIONS[node.operator], elements(node.operands[0], size), elements(node.operands[1], size))
+
+
+def evaluate_buffers(root, cls):
+    """
+    elements of the tree of root in column major order, computed on its n x m transpose by blocks of CHUNK elements
+    along the longer dimension
+    """
+    m, n = root.size
+    tree = matrices(root)
+    result = numpy.empty((n, m), dtype=getattr(numpy, cls.buffer_type))
+    # blocks of columns of the result, or of rows when it has more rows than columns
+    axis = 0 if n >= m else 1
+    extent, width = (n, m) if axis == 0 else (m, n)
+    step = max(1, CHUNK // max(width, 1))
+    with numpy.errstate(all='ignore'):
+        for start in range(0, extent, step):
+            block = (slice(start, start + step),) if axis == 0 else (slice(None), slice(start, start + step))
+            result[block] = evaluate_block(tree, block, axis)
+    return result.ravel()
+
+
+def matrices(node):
+    """
+    the tree of node with its leaves replaced by their float64 buffers seen as n x m transposes
+    """
+    if node.__class__ is not Lazy:
+        return as_float_buffer(node).reshape((node.n, node.m))
+    return node.operator, tuple(matrices(operand) for operand in node.operands)
+
+
+def evaluate_block(tree, block, axis):
+    if not isinstance(tree, tuple):
+        # a leaf of a single row or column is broadcast by numpy
+        return tree[block] if tree.shape[axis] > 1 else tree
+    operator, operands = tree
+    values = [evaluate_block(operand, block, axis) for operand in operands]
+    # the logical result of a comparison is an operand of arithmetic like any double
+    values = [value if value.dtype == numpy.float64 else value.astype(numpy.float64) for value in values]
+    if len(values) == 1:
+        return SIGN_BUFFER_FUNCTIONS[operator](values[0])
+    return BUFFER_FUNCTIONS[operator](*values)
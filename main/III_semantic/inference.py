@@ -0,0 +1,358 @@
+"""
+static inference of the class and size of expressions, and the specialized kernels it selects
+
+the pass walks the tree like the interpreter, with the Type of every variable in place of its value: assignments
+bind the type of their value, the branches of a selection are joined, and loops are walked until the types at their
+start no longer change. a Type keeps the class (Double, Logical, Char, String, Range) and the number of rows and
+columns, any of them is None when it differs between the executions of the expression or is not known at all
+
+an operation whose operand types are certain runs a kernel without the checks of operations.py:
+scalar: both operands are 1x1 doubles, the kernel computes on their values directly
+array: both operands are doubles of the same known size, the kernel skips compat and the string checks
+every other operation, and every operation whose operand types are not certain, takes the generic path
+
+the closure and bytecode engines select their kernels when compiling, the tree walking interpreter stays generic
+"""
+
+
+from collections import namedtuple, Counter
+from main.II_syntactic.node_types import ASTNodeType
+from main.III_semantic.operations import *
+import operator as python_operator
+
+
+Type = namedtuple('Type', ('cls', 'size'))
+
+UNKNOWN = Type(None, (None, None))
+SCALAR_DOUBLE = Type(Double, (1, 1))
+SCALAR_LOGICAL = Type(Logical, (1, 1))
+
+# classes whose arrays are created with exactly this class by the operations, views and ranges are other classes
+CLASSES = (Double, Logical, Char, String)
+NUMERIC_CLASSES = (Double, Logical, Char)
+
+
+def type_of(value):
+    return Type(value.__class__ if value.__class__ in CLASSES else None, value.size)
+
+
+def join(type_0, type_1):
+    """
+    the type of a value which is of type_0 or of type_1
+    """
+    if type_0 is None or type_0 == type_1:
+        return type_1
+    if type_1 is None:
+        return type_0
+    return Type(type_0.cls if type_0.cls is type_1.cls else None,
+                tuple(a if a == b else None for a, b in zip(type_0.size, type_1.size)))
+
+
+def join_environments(environment_0, environment_1):
+    """
+    the variables after either of two paths, None is a path which is never taken (it ends with break or continue),
+    a variable assigned on one path only may be unbound, so nothing is known about what its name refers to
+    """
+    if environment_0 is None:
+        return environment_1
+    if environment_1 is None:
+        return environment_0
+    return {name: join(environment_0[name], environment_1[name]) if name in environment_1 else UNKNOWN
+            for name in environment_0} | {name: UNKNOWN for name in environment_1 if name not in environment_0}
+
+
+def broadcast_extent(a, b):
+    if a == b or b == 1:
+        return a
+    if a == 1 or a is None:
+        return b
+    # b is None or the sizes are not compatible, in which case the operation raises
+    return a if b is None else None
+
+
+def broadcast_size(size_0, size_1):
+    return tuple(broadcast_extent(a, b) for a, b in zip(size_0, size_1))
+
+
+def is_scalar_type(operand_type):
+    return operand_type.size == (1, 1)
+
+
+class Inference:
+    """
+    types of the expressions of a tree, for the variables bound before it runs
+    """
+
+    def __init__(self, builtins, variables=None):
+        self.builtins = builtins
+        self.environment = {name: type_of(value) for name, value in (variables or {}).items()}
+        # node: join of the types of every evaluation of the expression
+        self.types = {}
+        # states of the variables at the break and at the continue statements of the enclosing loops
+        self.loops = []
+
+    def infer(self, lst):
+        self.environment = self.infer_statement_list(lst, self.environment)
+        return self.types
+
+    # statements, every method returns the variables after the statement, None when it is never completed
+    def infer_statement_list(self, lst, environment):
+        for stmt in lst.get_children():
+            if environment is None:
+                break
+            environment = self.infer_statement(stmt, dict(environment))
+        return environment
+
+    def infer_statement(self, stmt, environment):
+        stmt_type = stmt.get_type()
+        if stmt_type == ASTNodeType.EXP_STMT:
+            return self.infer_expression_statement(stmt, environment)
+        if stmt_type == ASTNodeType.SEL_STMT:
+            return self.infer_selection_statement(stmt, environment)
+        if stmt_type == ASTNodeType.ITR_STMT:
+            return self.infer_iteration_clause(stmt.get_child(), environment)
+        if stmt_type in (ASTNodeType.HOIST_STMT, ASTNodeType.VECTOR_STMT):
+            return self.infer_statement(stmt.get_child(), environment)
+        if stmt_type == ASTNodeType.JMP_STMT:
+            if self.loops:
+                self.loops[-1][stmt.get_text()].append(environment)
+            return None
+        return self.infer_statement_list(stmt, environment)
+
+    def infer_expression_statement(self, stmt, environment):
+        expression = stmt.get_child(0)
+        if expression.get_type() == ASTNodeType.ASS_EXP:
+            target, value = expression.get_child(0), expression.get_child(1)
+            value_type = self.infer_expression(value, environment)
+            if target.get_children():
+                # an indexed assignment may change both the size and the class of the variable
+                for child in target.get_child(0).get_children():
+                    self.infer_expression(child, environment)
+                value_type = UNKNOWN
+            environment[target.get_text()] = value_type
+        else:
+            value_type = self.infer_expression(expression, environment)
+            if not (expression.get_type() == ASTNodeType.IDENTIFIER_EXP and expression.get_children() == []
+                    and expression.get_text() not in self.builtins):
+                environment["ans"] = value_type
+        return environment
+
+    def infer_selection_statement(self, stmt, environment):
+        clauses = stmt.get_children()[:-1]
+        if stmt.get_text() == 'switch':
+            self.infer_expression(clauses[0].get_child(0), environment)
+            clauses = clauses[1:]
+        result = None
+        otherwise = False
+        for clause in clauses:
+            if clause.get_text() in ('else', 'otherwise'):
+                otherwise = True
+                result = join_environments(result, self.infer_statement_list(clause.get_child(0), environment))
+            else:
+                self.infer_expression(clause.get_child(0), environment)
+                result = join_environments(result, self.infer_statement_list(clause.get_child(1), environment))
+        # without else, no clause may be taken
+        return result if otherwise else join_environments(result, environment)
+
+    def infer_iteration_clause(self, clause, environment):
+        expression = clause.get_child(0)
+        statement_list = clause.get_child(1)
+        if clause.get_text() == 'for':
+            name = expression.get_child(0).get_text()
+            data = self.infer_expression(expression.get_child(1), environment)
+            # every column of the data, as an array of the class returned by its get_class
+            variable = Type(Double if data.cls is Range else data.cls, (data.size[0], 1))
+        head = environment
+        while True:
+            self.loops.append({'break': [], 'continue': []})
+            if clause.get_text() == 'for':
+                body = dict(head)
+                body[name] = variable
+            else:
+                self.infer_expression(expression, head)
+                body = head
+            end = self.infer_statement_list(statement_list, body)
+            jumps = self.loops.pop()
+            following = head
+            for state in [end] + jumps['continue']:
+                following = join_environments(following, state)
+            if following == head:
+                # the loop is left at its start, or by a break statement
+                for state in jumps['break']:
+                    following = join_environments(following, state)
+                return following
+            head = following
+
+    # expressions
+    def infer_expression(self, exp, environment):
+        exp_type = self.expression_type(exp, environment)
+        self.types[exp] = join(self.types.get(exp), exp_type)
+        return exp_type
+
+    def expression_type(self, exp, environment):
+        exp_type = exp.get_type()
+        if exp_type == ASTNodeType.CONSTANT_EXP:
+            return type_of(exp.get_value())
+        if exp_type == ASTNodeType.INVARIANT_EXP:
+            return self.infer_expression(exp.get_child(), environment)
+        if exp_type == ASTNodeType.NUMBER_LIT_EXP:
+            return SCALAR_DOUBLE
+        if exp_type == ASTNodeType.STRING_LIT_EXP:
+            return Type(String, (1, 1))
+        if exp_type == ASTNodeType.VECTOR_LIT_EXP:
+            return Type(Char, (1, None))
+        if exp_type == ASTNodeType.IDENTIFIER_EXP:
+            if exp.get_children():
+                if exp.get_child(0).get_type() == ASTNodeType.INDEX_LIST_EXP:
+                    for child in exp.get_child(0).get_children():
+                        self.infer_expression(child, environment)
+                return UNKNOWN
+            return environment.get(exp.get_text(), UNKNOWN)
+        if exp_type == ASTNodeType.UOP_EXP:
+            return self.unary_type(exp.get_text(), self.infer_expression(exp.get_child(0), environment))
+        if exp_type == ASTNodeType.BOP_EXP:
+            operand_0 = self.infer_expression(exp.get_child(0), environment)
+            operand_1 = self.infer_expression(exp.get_child(1), environment)
+            return self.binary_type(exp.get_text(), operand_0, operand_1)
+        for child in exp.get_children():
+            if child.get_type() != ASTNodeType.EO_STMT:
+                self.infer_expression(child, environment)
+        if exp_type == ASTNodeType.CLN_EXP and exp.get_children():
+            return Type(Range, (1, None))
+        return UNKNOWN
+
+    @staticmethod
+    def unary_type(operator, operand):
+        if operator in ('.\'', '\''):
+            # the transpose of a larger array may be a view
+            return operand if is_scalar_type(operand) else Type(None, operand.size[::-1])
+        if operand.cls not in NUMERIC_CLASSES:
+            return UNKNOWN
+        return Type(Logical if operator == '~' else Double, operand.size)
+
+    @staticmethod
+    def binary_type(operator, operand_0, operand_1):
+        if operator in ('&&', '||'):
+            return SCALAR_LOGICAL
+        scalars = is_scalar_type(operand_0) and is_scalar_type(operand_1)
+        if operator in MATRIX_OPERATORS and not scalars:
+            if operator != '*' or not (is_scalar_type(operand_0) or is_scalar_type(operand_1)):
+                return UNKNOWN
+        size = broadcast_size(operand_0.size, operand_1.size)
+        if operator in RELATIONAL_OPERATORS:
+            return Type(Logical, size)
+        if operand_0.cls in NUMERIC_CLASSES and operand_1.cls in NUMERIC_CLASSES:
+            return Type(Double, size)
+        if operator == '+' and String in (operand_0.cls, operand_1.cls):
+            return Type(String, size)
+        return Type(None, size)
+
+
+def infer(lst, builtins, variables=None):
+    """
+    types of the expressions of the tree lst run with the given workspace variables
+    """
+    return Inference(builtins, variables).infer(lst)
+
+
+def specialization(exp, types, fused=False):
+    """
+    name of the kernel of the binary operation exp for the types of its operands, None for the generic path
+    fused: whether exp belongs to a tree of element-wise operators, whose arrays are better evaluated by fusion.py
+    """
+    name = specialize(exp.get_text(), types.get(exp.get_child(0)), types.get(exp.get_child(1)))
+    return None if fused and name is not None and not is_scalar_type(types[exp]) else name
+
+
+# kernels
+def scalar_kernel(fun, cls=Double, convert=float):
+    def kernel(operand_0, operand_1):
+        # the element of a 1x1 buffer is a numpy scalar
+        return cls.scalar(convert(fun(operand_0.data[0], operand_1.data[0])))
+    return kernel
+
+
+def array_kernel(fun, buffer_fun, cls=Double):
+    def kernel(operand_0, operand_1):
+        if vectorized(operand_0, operand_1):
+            return cls.converted(vectorize(buffer_fun, operand_0, operand_1), operand_0.size)
+        return cls.converted([fun(a, b) for a, b in zip(operand_0.data, operand_1.data)], operand_0.size)
+    return kernel
+
+
+# operator: (function of the elements, function of the buffers)
+ELEMENT_FUNCTIONS = {
+    '+': (python_operator.add, numpy.add if numpy is not None else None),
+    '-': (python_operator.sub, numpy.subtract if numpy is not None else None),
+    '.*': (python_operator.mul, numpy.multiply if numpy is not None else None),
+    './': (division, numpy.divide if numpy is not None else None),
+    '.\\': (lambda a, b: division(b, a), lambda a, b: b / a),
+    # a negative base with a fractional exponent has a complex result, of which only the real part is kept
+    '.^': (lambda a, b: Double.convert(power(a, b)), vectorized_power),
+}
+
+# the matrix operators compute like the element-wise ones on scalars
+SCALAR_OPERATORS = {'*': '.*', '/': './', '\\': '.\\', '^': '.^'}
+
+KERNELS = {
+    **{f"scalar {operator}": scalar_kernel(fun) for operator, (fun, _) in ELEMENT_FUNCTIONS.items()},
+    **{f"scalar {operator}": scalar_kernel(fun, Logical, bool) for operator, fun in RELATIONAL_OPERATORS.items()},
+    **{f"array {operator}": array_kernel(*funs) for operator, funs in ELEMENT_FUNCTIONS.items()},
+    **{f"array {operator}": array_kernel(fun, fun, Logical) for operator, fun in RELATIONAL_OPERATORS.items()},
+}
+KERNELS.update({f"scalar {operator}": KERNELS[f"scalar {element_wise}"]
+                for operator, element_wise in SCALAR_OPERATORS.items()})
+KERNEL_NAMES = tuple(KERNELS)
+
+
+def specialize(operator, operand_0, operand_1):
+    """
+    name of the kernel of operator for operands of the given types, None if the operation takes the generic path
+    """
+    if operand_0 is None or operand_1 is None or operand_0.cls is not Double or operand_1.cls is not Double:
+        return None
+    if operand_0 == operand_1 == SCALAR_DOUBLE:
+        name = f"scalar {operator}"
+    elif operand_0.size == operand_1.size and None not in operand_0.size:
+        name = f"array {operator}"
+    else:
+        return None
+    return name if name in KERNELS else None
+
+
+# hit rates of the kernels, counted while statistics is a Counter, see count_specializations
+statistics = None
+
+
+def count_specializations():
+    global statistics
+    statistics = Counter()
+
+
+def counted(fun, operator, specialized):
+    """
+    fun counting its calls as evaluations of operator in the statistics, fun itself when they are not counted
+    """
+    if statistics is None:
+        return fun
+    key = (operator, specialized)
+
+    def run(*args):
+        statistics[key] += 1
+        return fun(*args)
+    return run
+
+
+def report_specializations():
+    print("specialization hit rates")
+    print(''.join(f"{h:>14}" for h in ("operator", "specialized", "generic", "hit rate")))
+    operators = sorted(set(operator for operator, _ in statistics))
+    for operator in operators + [None]:
+        if operator is None:
+            hits = sum(count for (_, specialized), count in statistics.items() if specialized)
+            total = sum(statistics.values())
+        else:
+            hits = statistics[(operator, True)]
+            total = hits + statistics[(operator, False)]
+        rate = f"{100 * hits / total:.1f}%" if total else "-"
+        print(''.join(f"{v:>14}" for v in (operator or "total", hits, total - hits, rate)))
@@ -1,11 +1,61 @@
 from main.II_syntactic.node_types import ASTNodeType
-from main.III_semantic.utils import concatenate
+from main.III_semantic.utils import concatenate, append, assign, share, empty_columns
 from main.III_semantic.operations import *
 from main.III_semantic.literals import *
+from main.III_semantic.fusion import fusible, is_element_wise, defer, defer_sign, force
+from main.III_semantic.tracing import Tracer, HOT_ITERATIONS
+from main.III_semantic.dispatch import case_segments, dispatch
 from main.III_semantic.builtin_functions.catalog import MATLAB
 from main.exceptions.iii_semantic_exceptions import *
 
 
+class LoopBreak(Exception):
+    """
+    raised by a break statement, caught by the innermost loop
+    """
+    pass
+
+
+class LoopContinue(Exception):
+    """
+    raised by a continue statement, caught by the innermost loop
+    """
+    pass
+
+
+def display(var, obj):
+    ass_str = " = " if obj.get_class() == String else " ="
+    print(f"\n{var}{ass_str}\n\n{str(obj)}\n")
+
+
+def match_self_append(assignment):
+    """
+    match the assignment x = [x, v, ...] or x = [x; v, ...] of the accumulation idiom,
+    return the direction ("horz" or "vert") and the nodes of the appended elements, or None
+    """
+    target = assignment.get_child(0)
+    value = assignment.get_child(1)
+    if target.get_children() or value.get_type() != ASTNodeType.ARRAY_LIST_EXP:
+        return None
+    rows = [[]]
+    for child in value.get_children():
+        if child.get_type() != ASTNodeType.EO_STMT:
+            rows[-1].append(child)
+        elif child.get_text() in (';', '\n') and rows[-1]:
+            rows.append([])
+    rows = [row for row in rows if row]
+    if not rows:
+        return None
+    first = rows[0][0]
+    if first.get_type() != ASTNodeType.IDENTIFIER_EXP or first.get_text() != target.get_text() or first.get_children():
+        return None
+    if len(rows) == 1 and len(rows[0]) > 1:
+        return "horz", rows[0][1:]
+    if len(rows) == 2 and len(rows[0]) == 1:
+        return "vert", rows[1]
+    return None
+
+
 class Interpreter:
     """
     https://ww2.mathworks.cn/help/matlab/matlab_prog/function-precedence-order.html
@@ -16,6 +66,9 @@ class Interpreter:
             ASTNodeType.EXP_STMT: self.interpret_expression_statement,
             ASTNodeType.SEL_STMT: self.interpret_selection_statement,
             ASTNodeType.ITR_STMT: self.interpret_iteration_statement,
+            ASTNodeType.JMP_STMT: self.interpret_jump_statement,
+            ASTNodeType.HOIST_STMT: self.interpret_hoisting_statement,
+            ASTNodeType.VECTOR_STMT: self.interpret_vectorized_statement,
         }
         self.evaluate = {
             ASTNodeType.CLN_EXP: self.evaluate_colon_expression,
@@ -27,9 +80,17 @@ class Interpreter:
             ASTNodeType.ARRAY_LIST_EXP: self.evaluate_array_list_expression,
             ASTNodeType.INDEX_LIST_EXP: self.evaluate_index_list_expression,
             ASTNodeType.IDENTIFIER_EXP: self.evaluate_identifier_expression,
+            ASTNodeType.CONSTANT_EXP: evaluate_constant_expression,
+            ASTNodeType.INVARIANT_EXP: self.evaluate_invariant_expression,
         }
         self.variables = {}
         self.builtins = MATLAB
+        # values of the invariant expressions in the current executions of their loops, see loop_optimization.py
+        self.invariants = {}
+        # compiled hot loops, see tracing.py, None runs every loop in the interpreter
+        self.tracer = Tracer(self.builtins)
+        # switch statement: segments of its cases, see dispatch.py
+        self.switches = {}
 
     def get_variables(self):
         return self.variables
@@ -49,16 +110,19 @@ class Interpreter:
         result = self.interpret[stmt.get_type()](stmt)
         # if statement does not ended with a semicolon, the result is printed
         if result:
-            var = result[0]
-            obj = result[1]
-            ass_str = " = " if obj.get_class() == String else " ="
-            print(f"\n{var}{ass_str}\n\n{str(obj)}\n")
+            display(*result)
 
     def interpret_expression_statement(self, stmt):
         expression = stmt.get_child(0)
         if expression.get_type() == ASTNodeType.ASS_EXP:
             var = expression.get_child(0).get_text()
-            val = self.evaluate_expression(expression.get_child(1))
+            appended = match_self_append(expression)
+            if expression.get_child(0).get_children():
+                val = self.evaluate_indexed_assignment(expression.get_child(0), expression.get_child(1))
+            elif appended and var in self.variables:
+                val = self.evaluate_self_append(var, *appended, expression.get_child(1).get_line())
+            else:
+                val = self.evaluate_expression(expression.get_child(1))
             self.variables[var] = val
         else:
             if expression.get_type() == ASTNodeType.IDENTIFIER_EXP and expression.get_children() == [] \
@@ -79,16 +143,25 @@ class Interpreter:
         else:
             switch_clause = stmt.get_child(0)
             switch_exp = self.evaluate_expression(switch_clause.get_child(0))
-            for clause in stmt.get_children()[1:-1]:
-                if self.interpret_selection_clause(clause, switch_exp=switch_exp):
-                    break
+            clauses = stmt.get_children()[1:-1]
+            cases = [clause for clause in clauses if clause.get_text() == 'case']
+            if stmt not in self.switches:
+                self.switches[stmt] = case_segments(cases)
+
+            def compare(position):
+                return self.evaluate_expression(cases[position].get_child(0)) == switch_exp
+            position = dispatch(self.switches[stmt], switch_exp, compare)
+            if position is not None:
+                self.interpret_statement_list(cases[position].get_child(1))
+            elif clauses and clauses[-1].get_text() == 'otherwise':
+                self.interpret_statement_list(clauses[-1].get_child(0))
 
-    def interpret_selection_clause(self, clause, switch_exp=None):
-        if clause.get_text() in ('else', 'otherwise'):
+    def interpret_selection_clause(self, clause):
+        if clause.get_text() == 'else':
             self.interpret_statement_list(clause.get_child(0))
         else:
             exp = self.evaluate_expression(clause.get_child(0))
-            if clause.get_text() in ('if', 'elseif') and exp or clause.get_text() == 'case' and exp == switch_exp:
+            if exp:
                 self.interpret_statement_list(clause.get_child(1))
                 return True
             else:
@@ -100,20 +173,57 @@ class Interpreter:
     def interpret_iteration_clause(self, clause):
         expression = clause.get_child(0)
         statement_list = clause.get_child(1)
+        # once the loop is hot, its remaining iterations may run compiled
+        iterations = 0
         if clause.get_text() == 'while':
             while self.evaluate_expression(expression):
-                self.interpret_statement_list(statement_list)
+                try:
+                    self.interpret_statement_list(statement_list)
+                except LoopContinue:
+                    pass
+                except LoopBreak:
+                    break
+                iterations += 1
+                if iterations == HOT_ITERATIONS and self.tracer is not None and self.tracer.run(clause, self.variables):
+                    break
         else:
             name = expression.get_child(0).get_text()
             data = self.evaluate_expression(expression.get_child(1))
-            for col in data.cols():
+            if not data.n:
+                self.variables[name] = empty_columns(data)
+            columns = iter(data.cols())
+            for col in columns:
                 self.variables[name] = data.get_class()(col, size=(len(col), 1))
-                self.interpret_statement_list(statement_list)
+                try:
+                    self.interpret_statement_list(statement_list)
+                except LoopContinue:
+                    pass
+                except LoopBreak:
+                    break
+                iterations += 1
+                if iterations == HOT_ITERATIONS and self.tracer is not None \
+                        and self.tracer.run(clause, self.variables, columns):
+                    break
+
+    @staticmethod
+    def interpret_jump_statement(stmt):
+        raise LoopBreak() if stmt.get_text() == 'break' else LoopContinue()
+
+    def interpret_hoisting_statement(self, stmt):
+        for invariant in stmt.get_invariants():
+            self.invariants.pop(invariant, None)
+        self.interpret_statement(stmt.get_child())
+
+    def interpret_vectorized_statement(self, stmt):
+        if not stmt.get_plan().run(self.variables):
+            self.interpret_statement(stmt.get_child())
 
     def evaluate_expression(self, exp):
         return self.evaluate[exp.get_type()](exp)
 
     def evaluate_unary_operation_expression(self, exp):
+        if fusible(exp):
+            return force(self.evaluate_deferred(exp))
         line = exp.get_line()
         operator = exp.get_text()
         operand = self.evaluate_expression(exp.get_child(0))
@@ -130,6 +240,8 @@ class Interpreter:
             raise e
 
     def evaluate_binary_operation_expression(self, exp):
+        if fusible(exp):
+            return force(self.evaluate_deferred(exp))
         line = exp.get_line()
         operator = exp.get_text()
         child_0 = exp.get_child(0)
@@ -144,9 +256,7 @@ class Interpreter:
             if operator in MATRIX_OPERATORS:
                 return MATRIX_OPERATORS[operator](operand_0, operand_1)
 
-            # now only binary scalar operators left
-            compat(operand_0, operand_1)
-
+            # now only element-wise operators left, they broadcast operands of compatible sizes
             if operator in ARITHMETIC_OPERATORS:
                 return ARITHMETIC_OPERATORS[operator](operand_0, operand_1)
             return evaluate_relational_operations(operand_0, operand_1, operator)
@@ -155,6 +265,31 @@ class Interpreter:
                 e.line = line
             raise e
 
+    def evaluate_deferred(self, exp):
+        """
+        the element-wise operators of the tree of exp as Lazy nodes, see fusion.py
+        """
+        if not is_element_wise(exp):
+            return self.evaluate_expression(exp)
+        line = exp.get_line()
+        operator = exp.get_text()
+        if exp.get_type() == ASTNodeType.UOP_EXP:
+            operand = self.evaluate_deferred(exp.get_child(0))
+            try:
+                return defer_sign(operator, operand)
+            except SemanticException as e:
+                if e.line == 0:
+                    e.line = line
+                raise e
+        try:
+            operand_0 = self.evaluate_deferred(exp.get_child(0))
+            operand_1 = self.evaluate_deferred(exp.get_child(1))
+            return defer(operator, operand_0, operand_1)
+        except SemanticException as e:
+            if e.line == 0:
+                e.line = line
+            raise e
+
     def evaluate_colon_expression(self, exp):
         if exp.num_children() == 0:
             return ":"
@@ -168,14 +303,12 @@ class Interpreter:
             step = self.evaluate_expression(exp.get_child(1))[0]
             end = self.evaluate_expression(exp.get_child(2))[0]
 
-        if step == 0 or start < end and step < 0 or start > end and step > 0:
-            return Double([])
-
-        values = []
-        while start <= end:
-            values.append(start)
-            start += step
-        return Double(values)
+        try:
+            return evaluate_colon_operation(start, step, end)
+        except SemanticException as e:
+            if e.line == 0:
+                e.line = exp.get_line()
+            raise e
 
     def evaluate_array_list_expression(self, exp):
         line = exp.get_line()
@@ -190,7 +323,7 @@ class Interpreter:
                             array = []
                 else:
                     data = self.evaluate_expression(child)
-                    if data.data:
+                    if len(data):
                         array.append(data)
             if array:
                 array_list.append(array)
@@ -204,6 +337,36 @@ class Interpreter:
                 e.line = line
             raise e
 
+    def evaluate_self_append(self, var, direction, nodes, line):
+        """
+        x = [x, v] and x = [x; v], the variable is read without being handed out, so that it can grow in place
+        """
+        try:
+            return append(self.variables[var], [self.evaluate_expression(node) for node in nodes], direction)
+        except SemanticException as e:
+            if e.line == 0:
+                e.line = line
+            raise e
+
+    def evaluate_indexed_assignment(self, target, exp):
+        """
+        x(i, j) = v, v is written into the array of the variable x itself whenever possible, see assign
+        """
+        value = self.evaluate_expression(exp)
+        index_list = self.evaluate_index_list_expression(target.get_child(0))
+        try:
+            return assign(self.variables.get(target.get_text()), index_list, value)
+        except SemanticException as e:
+            if e.line == 0:
+                e.line = target.get_line()
+            raise e
+
+    def evaluate_invariant_expression(self, exp):
+        value = self.invariants.get(exp)
+        if value is None:
+            value = self.invariants[exp] = share(self.evaluate_expression(exp.get_child()))
+        return value
+
     def evaluate_index_list_expression(self, exp):
         return [self.evaluate_expression(child) for child in exp.get_children()]
 
@@ -236,15 +399,14 @@ class Interpreter:
         operand_0 = self.evaluate_expression(child_0)
         if len(operand_0) > 1:
             raise ConversionError1()
-        operand_0 = Logical([operand_0[0]])
+        operand_0 = Logical.convert(operand_0[0])
 
-        if operator == '||' and operand_0[0]:
-            return Logical([True])
-        if operator == '&&' and not operand_0[0]:
-            return Logical([False])
+        if operator == '||' and operand_0:
+            return Logical.scalar(True)
+        if operator == '&&' and not operand_0:
+            return Logical.scalar(False)
 
         operand_1 = self.evaluate_expression(child_1)
         if len(operand_1) > 1:
             raise ConversionError1()
-        operand_1 = Logical([operand_1[0]])
-        return Logical([True]) if operand_1[0] else Logical([False])
+        return Logical.scalar(Logical.convert(operand_1[0]))
@@ -0,0 +1,531 @@
+"""
+kernels of the matrix operators, operations.py checks the classes and sizes of the operands before calling them
+
+numpy: the kernels hand whole matrices to numpy, which calls the optimized BLAS and LAPACK routines it is linked with
+list: pure python kernels, used by the list storage backend and for small lists
+"""
+
+
+from main.III_semantic.data_types import storage
+from main.III_semantic.data_types.storage import numpy, is_buffer, to_list, as_float_buffer, BUFFER_THRESHOLD
+from main.III_semantic.data_types.array_data.numeric_data.decimal_data.double import Double
+from main.exceptions.iii_semantic_exceptions import MatrixFunctionError
+from operator import mul
+import math
+
+
+# edge of the blocks of the blocked kernels: rows of the list matrix product, panels of the LU factorization and
+# diagonal blocks of the triangular solves on numpy
+BLOCK = 64
+# relative tolerance under which a column of a rectangular matrix counts as dependent on the previous ones
+EPS = 2.0 ** -52
+
+
+def uses_numpy(*operands, length=0):
+    """
+    whether a kernel runs on numpy: one of the operands is stored in a buffer or the result would be
+    """
+    return storage.buffered and (length >= BUFFER_THRESHOLD or any(is_buffer(operand.data) for operand in operands))
+
+
+def as_matrix(array):
+    """
+    the elements of array as a float64 numpy matrix of its n x m transpose, the storage read in row major order
+    """
+    return as_float_buffer(array).reshape((array.n, array.m))
+
+
+def rows_of(array):
+    """
+    the rows of array as lists of floats
+    """
+    elements = [float(x) for x in to_list(array.transposed)]
+    return [elements[i * array.n:(i + 1) * array.n] for i in range(array.m)]
+
+
+def columns_of(array):
+    """
+    the columns of array as lists of floats
+    """
+    elements = [float(x) for x in to_list(array.refactored)]
+    return [elements[j * array.m:(j + 1) * array.m] for j in range(array.n)]
+
+
+def product(a, b):
+    """
+    the matrix product of the m x k array a and the k x n array b
+    """
+    m, n = a.m, b.n
+    if uses_numpy(a, b, length=m * n):
+        # the transpose of the product is the product of the transposes in the reverse order
+        data = numpy.dot(as_matrix(b), as_matrix(a))
+        return Double.scalar(float(data[0, 0])) if m == n == 1 else Double.converted(data.ravel(), (m, n))
+    if m == n == 1:
+        # dot product of a row and a column
+        return Double.scalar(float(sum(map(mul, a, b))))
+    if a.n == 1:
+        # outer product of a column and a row, column j of the result is a scaled by b(j)
+        column = [float(x) for x in a]
+        return Double.converted([x * float(y) for y in b for x in column], (m, n))
+    return Double.converted(product_lists(a, b), (m, n))
+
+
+def product_lists(a, b):
+    """
+    elements of a * b in column major order, each one the dot product of a row of a and a column of b
+    the rows of a are taken BLOCK at a time and every column of b is multiplied with the whole block, so that the rows
+    stay in the cache while the columns stream past
+    """
+    m, n = a.m, b.n
+    rows = rows_of(a)
+    columns = columns_of(b)
+    data = [0.0] * (m * n)
+    for first_row in range(0, m, BLOCK):
+        block = rows[first_row:first_row + BLOCK]
+        for j in range(n):
+            column = columns[j]
+            start = j * m + first_row
+            data[start:start + len(block)] = [sum(map(mul, row, column), 0.0) for row in block]
+    return data
+
+
+# matrix powers
+def matrix_power(a, exponent):
+    """
+    a ^ exponent for the square array a: integer powers by repeated squaring, in O(log |exponent|) matrix products,
+    negative ones as powers of the inverse computed by the solver, other powers through the eigendecomposition of a
+    """
+    if math.isnan(exponent) or math.isinf(exponent) or exponent != int(exponent):
+        return eigen_function(a, lambda w: complex_power(w, exponent))
+    k = int(exponent)
+    if k == 0:
+        return identity(a.n)
+    if k < 0:
+        a = left_division(a, identity(a.n))
+        k = -k
+    elif k == 1:
+        return Double(to_list(a.refactored), size=a.size)
+    result = None
+    # a runs through the powers a, a ^ 2, a ^ 4 ... of which those of the bits of k are multiplied into the result
+    while k:
+        if k & 1:
+            result = a if result is None else product(result, a)
+        k >>= 1
+        if k:
+            a = product(a, a)
+    return result
+
+
+def scalar_power(base, a):
+    """
+    base ^ a for the square array a, through the eigendecomposition of a
+    """
+    return eigen_function(a, lambda w: complex_power(complex(base), w))
+
+
+def identity(n):
+    return Double.converted([1.0 if i % (n + 1) == 0 else 0.0 for i in range(n * n)], (n, n))
+
+
+def complex_power(base, exponent):
+    """
+    base ^ exponent of complex numbers, elementwise on numpy arrays, a negative power of 0 is infinite
+    """
+    if numpy is not None:
+        with numpy.errstate(all='ignore'):
+            return numpy.power(base, exponent)
+    try:
+        return base ** exponent
+    except (ZeroDivisionError, OverflowError):
+        return complex(math.inf)
+
+
+def eigen_function(a, fun):
+    """
+    v * diag(fun(w)) / v for the eigenvalues w and eigenvectors v of the square array a, the eigenvalues are complex
+    and only the real part of the result is kept
+    a diagonal matrix is its own decomposition and fun is applied to its diagonal, numpy decomposes the other matrices
+    whatever the storage backend, without numpy they raise an error
+    """
+    n = a.n
+    elements = to_list(a.data)
+    if all(element == 0 for i, element in enumerate(elements) if i % (n + 1)):
+        data = [0.0] * (n * n)
+        for i in range(0, n * n, n + 1):
+            data[i] = float(fun(complex(elements[i])).real)
+        return Double.converted(data, a.size)
+    if numpy is None:
+        raise MatrixFunctionError()
+    w, v = numpy.linalg.eig(as_matrix(a).T)
+    with numpy.errstate(all='ignore'):
+        scaled = v * fun(w.astype(numpy.complex128))
+        try:
+            # x * v = scaled, that is v' * x' = scaled'
+            x = numpy.linalg.solve(v.T, scaled.T).T
+        except numpy.linalg.LinAlgError:
+            x = numpy.full(scaled.shape, numpy.nan)
+    return Double.converted(numpy.ascontiguousarray(x.real).ravel(order='F'), a.size)
+# a matrix is factorized according to its structure, the factors of a square matrix also solve the system of its
+# transpose, so that b / a = (a' \\ b')' reuses them
+# a factorization is a tuple (kind, numeric, factors), numeric tells whether the factors are numpy matrices or lists of
+# rows, the right hand sides and the solutions of the kernels are matrices of the same kind
+def left_division(a, b):
+    """
+    the solution x of a * x = b for the m x n array a and the m x p array b, the least squares solution when a is not
+    square
+    """
+    n, p = a.n, b.n
+    if not len(a) or not len(b):
+        return Double.converted([0.0] * (n * p), (n, p))
+    kind, numeric, factors = factorization(a)
+    return array_of(solve(kind, numeric, factors, matrix_of(b, numeric), False), numeric)
+
+
+def right_division(b, a):
+    """
+    the solution x of x * a = b for the m x n array a and the p x n array b, that is a' * x' = b'
+    """
+    m, p = a.m, b.m
+    if not len(a) or not len(b):
+        return Double.converted([0.0] * (p * m), (p, m))
+    if a.m == a.n:
+        kind, numeric, factors = factorization(a)
+        transposed = True
+    else:
+        kind, numeric, factors = factorize(a.transpose())
+        transposed = False
+    return array_of(solve(kind, numeric, factors, matrix_of(b, numeric, transposed=True), transposed), numeric,
+                    transposed=True)
+
+
+def factorization(array):
+    """
+    the factorization of array, computed by the first solve and kept on array for the following ones, so that a loop
+    solving systems of the same matrix factorizes it once, array drops it before it is written in place
+    """
+    if array.factorization is None:
+        array.factorization = factorize(array)
+    return array.factorization
+
+
+def factorize(array):
+    """
+    the factorization of array chosen from its structure like MATLAB does: triangular matrices are solved by
+    substitution, symmetric matrices with a positive diagonal by Cholesky unless they turn out not to be positive
+    definite, other square matrices by LU with partial pivoting and rectangular ones by QR with column pivoting
+    https://ww2.mathworks.cn/help/matlab/ref/mldivide.html
+    """
+    numeric = uses_numpy(array)
+    matrix = matrix_of(array, numeric)
+    if array.m != array.n:
+        return 'qr', numeric, (qr_numpy if numeric else qr_lists)(matrix)
+    if numeric:
+        if not numpy.tril(matrix, -1).any():
+            return 'upper', numeric, matrix
+        if not numpy.triu(matrix, 1).any():
+            return 'lower', numeric, matrix
+        symmetric = numpy.array_equal(matrix, matrix.T) and bool((numpy.diag(matrix) > 0).all())
+    else:
+        n = len(matrix)
+        if not any(matrix[i][j] for i in range(n) for j in range(i)):
+            return 'upper', numeric, matrix
+        if not any(matrix[i][j] for i in range(n) for j in range(i + 1, n)):
+            return 'lower', numeric, matrix
+        symmetric = all(matrix[i][j] == matrix[j][i] for i in range(n) for j in range(i)) \
+            and all(matrix[i][i] > 0 for i in range(n))
+    if symmetric:
+        factor = (cholesky_numpy if numeric else cholesky_lists)(matrix)
+        if factor is not None:
+            return 'cholesky', numeric, factor
+    return 'lu', numeric, (lu_numpy if numeric else lu_lists)(matrix)
+
+
+def solve(kind, numeric, factors, rhs, transposed):
+    """
+    the solution of a * x = rhs, or of a' * x = rhs when transposed, for the matrix a of the factorization
+    """
+    triangular = triangular_numpy if numeric else triangular_lists
+    transpose = numpy.transpose if numeric else transpose_lists
+    if kind == 'upper' or kind == 'lower':
+        lower = kind == 'lower'
+        return triangular(transpose(factors), rhs, not lower) if transposed else triangular(factors, rhs, lower)
+    if kind == 'cholesky':
+        # a = l * l' is symmetric
+        return triangular(transpose(factors), triangular(factors, rhs, True), False)
+    if kind == 'lu':
+        # the rows perm of a are l * u, with the unit lower triangle of l and the upper triangle of u in one matrix
+        lu, perm = factors
+        if not transposed:
+            return triangular(lu, triangular(lu, permuted(rhs, perm), True, unit=True), False)
+        lu = transpose(lu)
+        return unpermuted(triangular(lu, triangular(lu, rhs, True), False, unit=True), perm)
+    return (least_squares_numpy if numeric else least_squares_lists)(factors, rhs)
+
+
+def matrix_of(array, numeric, transposed=False):
+    """
+    the elements of array, or of its transpose, as a float64 numpy matrix when numeric and a list of rows otherwise
+    """
+    if numeric:
+        matrix = as_matrix(array)
+        return matrix if transposed else matrix.T
+    return columns_of(array) if transposed else rows_of(array)
+
+
+def array_of(matrix, numeric, transposed=False):
+    """
+    the double array of a matrix returned by the kernels, or of its transpose
+    """
+    if numeric:
+        m, n = matrix.shape
+        if transposed:
+            return Double.converted(numpy.ascontiguousarray(matrix).ravel(), (n, m))
+        return Double.converted(matrix.ravel(order='F'), (m, n))
+    m, n = len(matrix), len(matrix[0]) if matrix else 0
+    if transposed:
+        return Double.converted([x for row in matrix for x in row], (n, m))
+    return Double.converted([row[j] for j in range(n) for row in matrix], (m, n))
+
+
+def permuted(matrix, perm):
+    return matrix[perm] if is_buffer(matrix) else [matrix[i] for i in perm]
+
+
+def unpermuted(matrix, perm):
+    """
+    the matrix whose rows perm are the rows of matrix
+    """
+    if is_buffer(matrix):
+        result = numpy.empty_like(matrix)
+        result[perm] = matrix
+        return result
+    result = [None] * len(matrix)
+    for i, row in zip(perm, matrix):
+        result[i] = row
+    return result
+
+
+def transpose_lists(matrix):
+    return [list(column) for column in zip(*matrix)]
+
+
+def rank(diagonal, m, n):
+    """
+    number of leading columns of a rectangular matrix which are independent, from the diagonal of R
+    """
+    tolerance = max(m, n) * EPS * abs(diagonal[0]) if len(diagonal) else 0
+    return sum(1 for d in diagonal if abs(d) > tolerance)
+
+
+# numpy kernels, numpy only warns where a singular matrix gives inf and nan
+def triangular_numpy(t, rhs, lower, unit=False):
+    """
+    the solution of t * x = rhs for the lower or upper triangle of t, whose diagonal is taken as ones when unit
+    the rows already solved are eliminated from each block of BLOCK rows by a matrix product, the block is then
+    solved row by row
+    """
+    n = len(t)
+    x = numpy.array(rhs, dtype=numpy.float64)
+    starts = range(0, n, BLOCK) if lower else reversed(range(0, n, BLOCK))
+    with numpy.errstate(all='ignore'):
+        for start in starts:
+            stop = min(start + BLOCK, n)
+            if lower:
+                x[start:stop] -= t[start:stop, :start] @ x[:start]
+                rows = range(start, stop)
+            else:
+                x[start:stop] -= t[start:stop, stop:] @ x[stop:]
+                rows = range(stop - 1, start - 1, -1)
+            for i in rows:
+                if lower:
+                    x[i] -= t[i, start:i] @ x[start:i]
+                else:
+                    x[i] -= t[i, i + 1:stop] @ x[i + 1:stop]
+                if not unit:
+                    x[i] /= t[i, i]
+    return x
+
+
+def lu_numpy(matrix):
+    """
+    (lu, perm): the rows perm of matrix are l * u, l is the unit lower triangle of lu and u its upper triangle
+    the columns are factorized in panels of BLOCK, the rest of the matrix is updated once per panel by a triangular
+    solve and a matrix product
+    """
+    a = numpy.array(matrix, dtype=numpy.float64)
+    n = len(a)
+    perm = numpy.arange(n)
+    with numpy.errstate(all='ignore'):
+        for start in range(0, n, BLOCK):
+            stop = min(start + BLOCK, n)
+            for k in range(start, stop):
+                pivot = k + int(numpy.argmax(numpy.abs(a[k:, k])))
+                if pivot != k:
+                    a[[k, pivot]] = a[[pivot, k]]
+                    perm[[k, pivot]] = perm[[pivot, k]]
+                if a[k, k]:
+                    a[k + 1:, k] /= a[k, k]
+                a[k + 1:, k + 1:stop] -= numpy.outer(a[k + 1:, k], a[k, k + 1:stop])
+            if stop < n:
+                a[start:stop, stop:] = triangular_numpy(a[start:stop, start:stop], a[start:stop, stop:], True,
+                                                        unit=True)
+                a[stop:, stop:] -= a[stop:, start:stop] @ a[start:stop, stop:]
+    return a, perm
+
+
+def cholesky_numpy(matrix):
+    """
+    the lower triangular l with matrix = l * l', None if matrix is not positive definite
+    """
+    try:
+        return numpy.linalg.cholesky(matrix)
+    except numpy.linalg.LinAlgError:
+        return None
+
+
+def qr_numpy(matrix):
+    """
+    (r, perm, reflectors): the columns perm of matrix are q * r, q is the product of the householder reflections
+    of the unit vectors reflectors, the column of the largest remaining norm is taken first
+    """
+    r = numpy.array(matrix, dtype=numpy.float64)
+    m, n = r.shape
+    perm = numpy.arange(n)
+    reflectors = []
+    for k in range(min(m, n)):
+        norms = (r[k:, k:] ** 2).sum(axis=0)
+        j = k + int(numpy.argmax(norms))
+        if not norms[j - k] > 0:
+            break
+        r[:, [k, j]] = r[:, [j, k]]
+        perm[[k, j]] = perm[[j, k]]
+        v = r[k:, k].copy()
+        v[0] += math.copysign(math.sqrt(norms[j - k]), v[0])
+        v /= numpy.linalg.norm(v)
+        r[k:, k:] -= 2 * numpy.outer(v, v @ r[k:, k:])
+        reflectors.append(v)
+    return r, perm, reflectors
+
+
+def least_squares_numpy(factors, rhs):
+    r, perm, reflectors = factors
+    m, n = r.shape
+    y = numpy.array(rhs, dtype=numpy.float64)
+    for k, v in enumerate(reflectors):
+        y[k:] -= 2 * numpy.outer(v, v @ y[k:])
+    count = rank(numpy.diag(r)[:len(reflectors)], m, n)
+    x = numpy.zeros((n, y.shape[1]))
+    x[perm[:count]] = triangular_numpy(r[:count, :count], y[:count], False)
+    return x
+
+
+# list kernels, a zero pivot is replaced by an infinite reciprocal, which gives inf and nan like numpy
+def triangular_lists(t, rhs, lower, unit=False):
+    """
+    the solution of t * x = rhs for the lower or upper triangle of t, whose diagonal is taken as ones when unit
+    """
+    n = len(t)
+    x = [list(row) for row in rhs]
+    for i in (range(n) if lower else range(n - 1, -1, -1)):
+        row = t[i]
+        solved = x[i]
+        for j in (range(i) if lower else range(i + 1, n)):
+            if row[j]:
+                factor = row[j]
+                solved[:] = [a - factor * b for a, b in zip(solved, x[j])]
+        if not unit:
+            reciprocal = 1 / row[i] if row[i] else math.inf
+            solved[:] = [a * reciprocal for a in solved]
+    return x
+
+
+def lu_lists(matrix):
+    """
+    (lu, perm): the rows perm of matrix are l * u, l is the unit lower triangle of lu and u its upper triangle
+    """
+    a = [list(row) for row in matrix]
+    n = len(a)
+    perm = list(range(n))
+    for k in range(n):
+        pivot = max(range(k, n), key=lambda i: abs(a[i][k]))
+        a[k], a[pivot] = a[pivot], a[k]
+        perm[k], perm[pivot] = perm[pivot], perm[k]
+        pivot_row = a[k]
+        if not pivot_row[k]:
+            continue
+        for i in range(k + 1, n):
+            row = a[i]
+            factor = row[k] / pivot_row[k]
+            row[k] = factor
+            if factor:
+                row[k + 1:] = [x - factor * y for x, y in zip(row[k + 1:], pivot_row[k + 1:])]
+    return a, perm
+
+
+def cholesky_lists(matrix):
+    """
+    the lower triangular l with matrix = l * l', None if matrix is not positive definite
+    """
+    n = len(matrix)
+    l = [[0.0] * n for _ in range(n)]
+    for j in range(n):
+        square = matrix[j][j] - sum(x * x for x in l[j][:j])
+        if not square > 0:
+            return None
+        diagonal = math.sqrt(square)
+        l[j][j] = diagonal
+        for i in range(j + 1, n):
+            l[i][j] = (matrix[i][j] - sum(map(mul, l[i][:j], l[j][:j]))) / diagonal
+    return l
+
+
+def qr_lists(matrix):
+    """
+    (columns, perm, reflectors): the columns perm of matrix are q * r, r is given by its columns, q is the product of
+    the householder reflections of the unit vectors reflectors, the column of the largest remaining norm is taken first
+    """
+    m = len(matrix)
+    columns = transpose_lists(matrix)
+    n = len(columns)
+    perm = list(range(n))
+    reflectors = []
+    for k in range(min(m, n)):
+        norms = [sum(x * x for x in column[k:]) for column in columns[k:]]
+        j = k + max(range(n - k), key=norms.__getitem__)
+        if not norms[j - k] > 0:
+            break
+        columns[k], columns[j] = columns[j], columns[k]
+        perm[k], perm[j] = perm[j], perm[k]
+        v = columns[k][k:]
+        v[0] += math.copysign(math.sqrt(norms[j - k]), v[0])
+        length = math.sqrt(sum(x * x for x in v))
+        v = [x / length for x in v]
+        for column in columns[k:]:
+            reflect(column, v, k)
+        reflectors.append(v)
+    return columns, perm, reflectors
+
+
+def reflect(column, v, k):
+    """
+    apply the householder reflection of the unit vector v to the elements of column from k on
+    """
+    factor = 2 * sum(map(mul, v, column[k:]))
+    if factor:
+        column[k:] = [x - factor * y for x, y in zip(column[k:], v)]
+
+
+def least_squares_lists(factors, rhs):
+    columns, perm, reflectors = factors
+    m, n = len(rhs), len(columns)
+    y = transpose_lists(rhs)
+    for k, v in enumerate(reflectors):
+        for column in y:
+            reflect(column, v, k)
+    count = rank([columns[k][k] for k in range(len(reflectors))], m, n)
+    r = [[columns[j][i] for j in range(count)] for i in range(count)]
+    solved = triangular_lists(r, [[column[i] for column in y] for i in range(count)], False)
+    x = [[0.0] * len(y) for _ in range(n)]
+    for i, row in zip(perm, solved):
+        x[i] = row
+    return x
@@ -16,3 +16,18 @@ def evaluate_string_literal_expression(node):
 
 def evaluate_vector_literal_expression(node):
     return Char([ord(c) for c in node.get_text().replace("''", "'")])
+
+
+def copy_literal(literal):
+    # the elements of a literal are already converted by its class, so the copy skips the constructor
+    array = object.__new__(literal.__class__)
+    array.data = literal.data.copy()
+    array.size = literal.size
+    return array
+
+
+def evaluate_constant_expression(node):
+    """
+    assignments may grow the array of their variable in place, so every evaluation gets its own copy of the constant
+    """
+    return copy_literal(node.get_value())
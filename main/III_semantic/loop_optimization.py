@@ -0,0 +1,224 @@
+"""
+loop optimization pass, run on the folded tree before execution
+
+dead stores: a suppressed assignment x = v; is dropped when x is assigned again later in the same statement list,
+without being read and without a break or continue in between, and the evaluation of v can neither fail nor print,
+see infallible
+
+loop invariant code motion: the largest subexpressions of a loop which read no variable assigned in the loop, such as
+n*2+1 or zeros(1, n), are wrapped in an InvariantNode, and the loop in a HoistingNode. the engines evaluate an
+invariant expression when it is first reached in an execution of the loop and hand out the same value in every
+following iteration, the HoistingNode forgets the values every time the loop starts.
+an invariant expression is never evaluated earlier than it would be without the pass, so a loop which is not entered
+evaluates none of its invariants, and an invariant expression raising an error raises it at its own place, after the
+output of the statements before it
+an expression is hoisted to the outermost loop in which it is invariant
+
+vectorization: element-wise for loops run as whole-array operations, see vectorization.py
+"""
+
+
+from main.II_syntactic.node import InvariantNode, HoistingNode
+from main.II_syntactic.node_types import ASTNodeType
+from main.III_semantic.builtin_functions.catalog import MATLAB
+from main.III_semantic.constant_folding import CONSTANT_FUNCTIONS, assigned_names
+from main.III_semantic.inference import infer, specialization
+from main.III_semantic.vectorization import vectorize
+
+
+# builtins whose result only depends on their arguments, other builtins are never hoisted
+PURE_FUNCTIONS = CONSTANT_FUNCTIONS + ('zeros', 'ones', 'reshape', 'isnan', 'isinf', 'isfinite',
+                                       'ceil', 'fix', 'floor', 'mod', 'rem', 'round')
+
+LEAVES = (ASTNodeType.CONSTANT_EXP, ASTNodeType.NUMBER_LIT_EXP, ASTNodeType.STRING_LIT_EXP,
+          ASTNodeType.VECTOR_LIT_EXP, ASTNodeType.INVARIANT_EXP)
+OPERATIONS = (ASTNodeType.UOP_EXP, ASTNodeType.BOP_EXP, ASTNodeType.CLN_EXP, ASTNodeType.ARRAY_LIST_EXP)
+STATEMENTS = (ASTNodeType.STMT_LIST, ASTNodeType.EXP_STMT, ASTNodeType.SEL_STMT, ASTNodeType.ITR_STMT,
+              ASTNodeType.JMP_STMT, ASTNodeType.HOIST_STMT, ASTNodeType.VECTOR_STMT, ASTNodeType.SEL_ClS,
+              ASTNodeType.ITR_CLS)
+
+
+def optimize(ast_root, variables=None):
+    """
+    drop the dead stores, vectorize the element-wise loops and hoist the loop invariants of the tree in place and
+    return it, variables are the workspace variables bound before execution
+    """
+    DeadStoreEliminator(infer(ast_root, MATLAB, variables)).eliminate(ast_root)
+    vectorize(ast_root)
+    LoopInvariantMotion().move(ast_root)
+    return ast_root
+
+
+def plain_assignment(stmt):
+    """
+    the assignment expression x = v of the statement, or None for any other statement or an indexed assignment
+    """
+    if stmt.get_type() != ASTNodeType.EXP_STMT or stmt.get_child(0).get_type() != ASTNodeType.ASS_EXP:
+        return None
+    expression = stmt.get_child(0)
+    return None if expression.get_child(0).get_children() else expression
+
+
+def reads(node, name):
+    """
+    whether the variable name may be read anywhere in the tree of node, the target of x = v is no read
+    """
+    if node.get_type() == ASTNodeType.IDENTIFIER_EXP and node.get_text() == name:
+        return True
+    children = node.get_children()
+    if node.get_type() == ASTNodeType.ASS_EXP and not children[0].get_children():
+        children = children[1:]
+    return any(reads(child, name) for child in children)
+
+
+def jumps(node):
+    return node.get_type() == ASTNodeType.JMP_STMT or any(jumps(child) for child in node.get_children())
+
+
+class DeadStoreEliminator:
+    def __init__(self, types):
+        self.types = types
+
+    def eliminate(self, node):
+        if node.get_type() == ASTNodeType.STMT_LIST:
+            children = node.get_children()
+            children[:] = [stmt for i, stmt in enumerate(children) if not self.dead(stmt, children[i+1:])]
+        for child in node.get_children():
+            if child.get_type() in STATEMENTS:
+                self.eliminate(child)
+
+    def dead(self, stmt, following):
+        assignment = plain_assignment(stmt)
+        if assignment is None or stmt.get_child(1).get_text() != ';' or not self.infallible(assignment.get_child(1)):
+            return False
+        name = assignment.get_child(0).get_text()
+        for later in following:
+            if reads(later, name) or jumps(later):
+                return False
+            overwriting = plain_assignment(later)
+            if overwriting is not None and overwriting.get_child(0).get_text() == name:
+                return True
+        return False
+
+    def infallible(self, exp):
+        """
+        whether the evaluation of exp certainly succeeds, by the types of inference.py: a variable whose class is
+        known is bound on every path, and an operation running a kernel has operands of matching classes and sizes
+        """
+        exp_type = exp.get_type()
+        if exp_type in LEAVES:
+            return True
+        if exp_type == ASTNodeType.IDENTIFIER_EXP:
+            return not exp.get_children() and self.types.get(exp) is not None and self.types[exp].cls is not None
+        if exp_type == ASTNodeType.BOP_EXP:
+            return specialization(exp, self.types) is not None and all(self.infallible(child)
+                                                                        for child in exp.get_children())
+        return False
+
+
+class LoopInvariantMotion:
+    def __init__(self):
+        self.count = 0
+        # names assigned by the loop being optimized, and its invariant expressions
+        self.assigned = set()
+        self.invariants = []
+
+    def move(self, node):
+        """
+        hoist the invariants of every loop in the tree of node, outermost loops first
+        """
+        children = node.get_children()
+        for i, child in enumerate(children):
+            if child.get_type() == ASTNodeType.ITR_STMT:
+                children[i] = self.hoist(child)
+                # the loops inside are optimized for the names they assign themselves
+                self.move(child)
+            elif child.get_type() in STATEMENTS:
+                self.move(child)
+
+    def hoist(self, loop):
+        clause = loop.get_child()
+        self.assigned = assigned_names(clause)
+        if assigns_ans(clause):
+            self.assigned.add("ans")
+        self.invariants = []
+        # the data of a for loop is evaluated once anyway, the condition of a while loop before every iteration
+        if clause.get_text() == 'while':
+            self.wrap(clause, 0)
+        self.visit(clause.get_child(1))
+        if not self.invariants:
+            return loop
+        return HoistingNode(loop, self.invariants)
+
+    def visit(self, node):
+        """
+        wrap the largest invariant subexpressions of the tree of node, return whether node itself is invariant
+        """
+        node_type = node.get_type()
+        if node_type in LEAVES:
+            return True
+        if node_type in STATEMENTS or node_type == ASTNodeType.ASS_EXP:
+            for i, child in enumerate(node.get_children()):
+                if node_type == ASTNodeType.ASS_EXP and i == 0:
+                    if child.get_children():
+                        # the indexes of an indexed assignment
+                        self.visit_operands(child.get_child(0), False)
+                elif child.get_type() != ASTNodeType.EO_STMT:
+                    self.wrap(node, i)
+            return False
+        if node_type == ASTNodeType.IDENTIFIER_EXP:
+            name = node.get_text()
+            invariant = name not in self.assigned and (name in PURE_FUNCTIONS or name not in MATLAB)
+            if not node.get_children():
+                return invariant
+            arguments = node.get_child(0)
+            return arguments.get_type() == ASTNodeType.INDEX_LIST_EXP and self.visit_operands(arguments, invariant)
+        if node_type in OPERATIONS:
+            # a bare colon is an invariant operand of the index list it belongs to
+            return self.visit_operands(node)
+        return False
+
+    def visit_operands(self, node, invariant=True):
+        """
+        whether the operands of node are invariant and node itself is, otherwise its invariant operands are wrapped
+        """
+        children = node.get_children()
+        operands = [child.get_type() == ASTNodeType.EO_STMT or self.visit(child) for child in children]
+        if invariant and all(operands):
+            return True
+        for i, child in enumerate(children):
+            if operands[i] and worth_hoisting(child):
+                children[i] = self.invariant(child)
+        return False
+
+    def wrap(self, node, i):
+        child = node.get_child(i)
+        if self.visit(child) and worth_hoisting(child):
+            node.get_children()[i] = self.invariant(child)
+
+    def invariant(self, expression):
+        node = InvariantNode(expression, self.count)
+        self.count += 1
+        self.invariants.append(node)
+        return node
+
+
+def assigns_ans(node):
+    """
+    whether a statement of the tree stores its value in ans, see Interpreter.interpret_expression_statement
+    """
+    if node.get_type() == ASTNodeType.EXP_STMT:
+        expression = node.get_child(0)
+        return expression.get_type() != ASTNodeType.ASS_EXP and not (
+            expression.get_type() == ASTNodeType.IDENTIFIER_EXP and not expression.get_children()
+            and expression.get_text() not in MATLAB)
+    return any(assigns_ans(child) for child in node.get_children())
+
+
+def worth_hoisting(exp):
+    """
+    whether exp computes anything, leaves and single variables are as cheap as an invariant
+    """
+    if exp.get_type() == ASTNodeType.IDENTIFIER_EXP:
+        return bool(exp.get_children())
+    return exp.get_type() in OPERATIONS and bool(exp.get_children())
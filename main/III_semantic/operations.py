@@ -3,24 +3,74 @@ https://ww2.mathworks.cn/help/matlab/matlab_prog/array-vs-matrix-operations.html
 """
 
 
-from main.III_semantic.utils import compat
+from main.III_semantic.utils import compat, pairs
+from main.III_semantic.linear_algebra import product, left_division, right_division, matrix_power, scalar_power
 from main.III_semantic.data_types.array_data.char import Char
 from main.III_semantic.data_types.array_data.string import String
 from main.III_semantic.data_types.array_data.logical import Logical
 from main.III_semantic.data_types.array_data.numeric_data.decimal_data.double import Double
+from main.III_semantic.data_types.array_data.numeric_data.decimal_data.range import Range
+from main.III_semantic.data_types.storage import numpy, is_buffer, as_float_buffer, vectorized
 from main.exceptions.iii_semantic_exceptions import *
+import math
+
+
+# scalar fast path
+# 1x1 operands of these classes are computed on their values directly: no compat, pairs, nested function or conversion
+SCALAR_CLASSES = (Double, Logical, Char)
+
+
+def is_scalar(operand):
+    return operand.size == (1, 1) and operand.__class__ in SCALAR_CLASSES
+
+
+def are_scalars(operand_0, operand_1):
+    return operand_0.size == (1, 1) == operand_1.size \
+        and operand_0.__class__ in SCALAR_CLASSES and operand_1.__class__ in SCALAR_CLASSES
+
+
+# vectorized path
+# operands stored in numpy buffers (see storage.py) are computed on whole arrays at once, numpy only warns where the
+# list path returns inf and nan
+# operands of different sizes are broadcast by numpy, each buffer is seen as its n x m transpose so that the rows of
+# the result are its columns, numpy reads a dimension of extent 1 with a zero stride instead of replicating it
+def vectorize(fun, operand_0, operand_1):
+    buffer_0 = as_float_buffer(operand_0)
+    buffer_1 = as_float_buffer(operand_1)
+    if operand_0.size != operand_1.size:
+        buffer_0 = buffer_0.reshape((operand_0.n, operand_0.m))
+        buffer_1 = buffer_1.reshape((operand_1.n, operand_1.m))
+    with numpy.errstate(all='ignore'):
+        return fun(buffer_0, buffer_1).ravel()
+
+
+def vectorized_power(a, b):
+    a, b = numpy.broadcast_arrays(a, b)
+    result = numpy.power(a, b)
+    # a negative base with a fractional exponent has a complex result, of which only the real part is kept
+    fractional = (a < 0) & (b != numpy.floor(b))
+    if fractional.any():
+        result[fractional] = numpy.power(a[fractional].astype(numpy.complex128), b[fractional]).real
+    return result
 
 
 # unary
 def evaluate_transpose_operation(operand):
-    return operand.get_class()(operand.refactored, size=tuple(reversed(operand.size)))
+    if is_scalar(operand):
+        return operand.scalar(operand.data[0])
+    return operand.transpose()
 
 
 def evaluate_array_sign_operation(operand, operator):
+    if is_scalar(operand):
+        return Double.scalar(float(-operand.data[0] if operator == '-' else +operand.data[0]))
     if isinstance(operand, String):
         raise UnaryOperatorError(repr(operator))
 
     if operand.get_class() in (Char, Logical, Double):
+        if is_buffer(operand.data):
+            data = as_float_buffer(operand)
+            return Double(-data if operator == '-' else data, size=operand.size)
         fun = {
             '+': lambda x: +x,
             '-': lambda x: -x
@@ -29,138 +79,188 @@ def evaluate_array_sign_operation(operand, operator):
 
 
 def evaluate_logic_not_operator(operand):
+    if is_scalar(operand):
+        return Logical.scalar(not Logical.convert(operand.data[0]))
     if isinstance(operand, String):
         raise UnaryOperatorError(repr('~'))
+    if is_buffer(operand.data):
+        data = as_float_buffer(operand)
+        if numpy.isnan(data).any():
+            raise ConversionError3()
+        return Logical(data == 0, size=operand.size)
     operand = Logical([i for i in operand], size=operand.size)
     return Logical([not i for i in operand], size=operand.size)
 
 
+# colon
+def evaluate_colon_operation(start, step, end):
+    """
+    https://ww2.mathworks.cn/help/matlab/ref/colon.html
+    """
+    if math.isnan(start) or math.isnan(step) or math.isnan(end):
+        return Double([float('nan')])
+    if step == 0 or start < end and step < 0 or start > end and step > 0:
+        return Double([])
+    if math.isinf(start) or math.isinf(end):
+        raise MaximumVariableSizeError()
+    if math.isinf(step):
+        return Double([start])
+    return Range(start, step, end)
+
+
 # binary
 def evaluate_matrix_multiplication_operation(operand_0, operand_1):
+    if are_scalars(operand_0, operand_1):
+        return Double.scalar(float(operand_0.data[0] * operand_1.data[0]))
     if isinstance(operand_0, String) or isinstance(operand_1, String):
         raise OperatorError(repr('*'))
 
     if operand_0.size == (1, 1) or operand_1.size == (1, 1):
-        compat(operand_0, operand_1)
         return evaluate_array_multiplication_operation(operand_0, operand_1)
     if operand_0.size[1] == operand_1.size[0]:
-        m = operand_0.size[0]
-        n = operand_1.size[1]
-        k = operand_0.size[1]
-        result = []
-        for row in operand_0.rows():
-            for col in operand_1.cols():
-                num = 0
-                for i in range(k):
-                    num += row[i] * col[i]
-                result.append(num)
-        return Double(result, size=(m, n))
+        return product(operand_0, operand_1)
     else:
         raise IncorrectDimensionError()
 
 
-"""
-def inv_matrix(operand_0):
-    if operand_0.size[1] == operand_0.size[0]:
-        return np.linalg.inv(operand_0)
-    return None
-"""
-
-
 def evaluate_matrix_right_division_operation(operand_0, operand_1):
     if isinstance(operand_0, String) or isinstance(operand_1, String):
         raise DivisionError('/')
-    if operand_0.size == (1, 1) and operand_1.size == (1, 1):
+    if operand_1.size == (1, 1):
         return evaluate_array_right_division_operation(operand_0, operand_1)
-    # return evaluate_matrix_multiplication_operation(operand_0, inv_matrix(operand_1))
+    if operand_0.n != operand_1.n:
+        raise DimensionAgreementError('/')
+    return right_division(operand_0, operand_1)
 
 
 def evaluate_matrix_left_division_operation(operand_0, operand_1):
     if isinstance(operand_0, String) or isinstance(operand_1, String):
         raise DivisionError('\\')
-    if operand_0.size == (1, 1) and operand_1.size == (1, 1):
+    if operand_0.size == (1, 1):
         return evaluate_array_left_division_operation(operand_0, operand_1)
+    if operand_0.m != operand_1.m:
+        raise DimensionAgreementError('\\')
+    return left_division(operand_0, operand_1)
 
 
 def evaluate_matrix_power_operation(operand_0, operand_1):
     if operand_0.size == (1, 1) and operand_1.size == (1, 1):
         return evaluate_array_power_operation(operand_0, operand_1)
+    if isinstance(operand_0, String) or isinstance(operand_1, String):
+        raise OperatorError(repr('^'))
+    if operand_1.size == (1, 1) and operand_0.m == operand_0.n:
+        return matrix_power(operand_0, operand_1[0])
+    if operand_0.size == (1, 1) and operand_1.m == operand_1.n:
+        return scalar_power(operand_0[0], operand_1)
+    raise MatrixPowerError()
 
 
 def evaluate_addition_operation(operand_0, operand_1):
+    if are_scalars(operand_0, operand_1):
+        return Double.scalar(float(operand_0.data[0] + operand_1.data[0]))
+    size = compat(operand_0, operand_1)
     if isinstance(operand_0, String) or isinstance(operand_1, String):
         def fun(a, b):
             return String.convert(a) + String.convert(b)
-        return String([fun(*tup) for tup in zip(operand_0, operand_1)], size=operand_0.size)
+        return String([fun(*tup) for tup in pairs(operand_0, operand_1, size)], size=size)
+    elif vectorized(operand_0, operand_1):
+        return Double.converted(vectorize(numpy.add, operand_0, operand_1), size)
     else:
         def fun(a, b):
             return a + b
-        return Double([fun(*tup) for tup in zip(operand_0, operand_1)], size=operand_0.size)
+        return Double([fun(*tup) for tup in pairs(operand_0, operand_1, size)], size=size)
 
 
 def evaluate_subtraction_operation(operand_0, operand_1):
+    if are_scalars(operand_0, operand_1):
+        return Double.scalar(float(operand_0.data[0] - operand_1.data[0]))
+    size = compat(operand_0, operand_1)
     if isinstance(operand_0, String) or isinstance(operand_1, String):
         raise OperatorError(repr('-'))
+    elif vectorized(operand_0, operand_1):
+        return Double.converted(vectorize(numpy.subtract, operand_0, operand_1), size)
     else:
         def fun(a, b):
             return a - b
-        return Double([fun(*tup) for tup in zip(operand_0, operand_1)], size=operand_0.size)
+        return Double([fun(*tup) for tup in pairs(operand_0, operand_1, size)], size=size)
 
 
 def evaluate_array_multiplication_operation(operand_0, operand_1):
+    if are_scalars(operand_0, operand_1):
+        return Double.scalar(float(operand_0.data[0] * operand_1.data[0]))
+    size = compat(operand_0, operand_1)
     if isinstance(operand_0, String) or isinstance(operand_1, String):
         raise OperatorError(repr('.*'))
+    elif vectorized(operand_0, operand_1):
+        return Double.converted(vectorize(numpy.multiply, operand_0, operand_1), size)
     else:
         def fun(a, b):
             return a * b
-        return Double([fun(*tup) for tup in zip(operand_0, operand_1)], size=operand_0.size)
+        return Double([fun(*tup) for tup in pairs(operand_0, operand_1, size)], size=size)
 
 
 def evaluate_array_right_division_operation(operand_0, operand_1):
+    if are_scalars(operand_0, operand_1):
+        return Double.scalar(float(division(operand_0.data[0], operand_1.data[0])))
+    size = compat(operand_0, operand_1)
     if isinstance(operand_0, String) or isinstance(operand_1, String):
         raise OperatorError(repr('./'))
+    elif vectorized(operand_0, operand_1):
+        return Double.converted(vectorize(numpy.divide, operand_0, operand_1), size)
     else:
-        return Double([division(*tup) for tup in zip(operand_0, operand_1)], size=operand_0.size)
+        return Double([division(*tup) for tup in pairs(operand_0, operand_1, size)], size=size)
 
 
 def evaluate_array_left_division_operation(operand_0, operand_1):
+    if are_scalars(operand_0, operand_1):
+        return Double.scalar(float(division(operand_1.data[0], operand_0.data[0])))
+    size = compat(operand_0, operand_1)
     if isinstance(operand_0, String) or isinstance(operand_1, String):
         raise OperatorError(repr('.\\'))
+    elif vectorized(operand_0, operand_1):
+        return Double.converted(vectorize(lambda a, b: b / a, operand_0, operand_1), size)
     else:
         def fun(a, b):
             return division(b, a)
 
-        return Double([fun(*tup) for tup in zip(operand_0, operand_1)], size=operand_0.size)
+        return Double([fun(*tup) for tup in pairs(operand_0, operand_1, size)], size=size)
 
 
 def evaluate_array_power_operation(operand_0, operand_1):
+    if are_scalars(operand_0, operand_1):
+        return Double.scalar(Double.convert(power(operand_0.data[0], operand_1.data[0])))
+    size = compat(operand_0, operand_1)
     if isinstance(operand_0, String) or isinstance(operand_1, String):
         raise OperatorError(repr('.^'))
+    elif vectorized(operand_0, operand_1):
+        return Double.converted(vectorize(vectorized_power, operand_0, operand_1), size)
     else:
-        def fun(a, b):
-            try:
-                return a ** b
-            except OverflowError:
-                return float('inf') if a > 0 else float('-inf')
-
-        return Double([fun(*tup) for tup in zip(operand_0, operand_1)], size=operand_0.size)
+        return Double([power(*tup) for tup in pairs(operand_0, operand_1, size)], size=size)
 
 
 def evaluate_relational_operations(operand_0, operand_1, operator):
+    if are_scalars(operand_0, operand_1):
+        return Logical.scalar(RELATIONAL_OPERATORS[operator](operand_0.data[0], operand_1.data[0]))
+    size = compat(operand_0, operand_1)
     if isinstance(operand_0, String) != isinstance(operand_1, String):
         # one is String while one is not String
         raise ComparisonError(operator,
                               operand_0.get_class_name().lower(),
                               operand_1.get_class_name().lower())
-    fun = {
-        '==': lambda x, y: x == y,
-        '>=': lambda x, y: x >= y,
-        '>': lambda x, y: x > y,
-        '<=': lambda x, y: x <= y,
-        '<': lambda x, y: x < y,
-        '~=': lambda x, y: x != y
-    }[operator]
-    return Logical([fun(*tup) for tup in zip(operand_0, operand_1)], size=operand_0.size)
+    fun = RELATIONAL_OPERATORS[operator]
+    if vectorized(operand_0, operand_1):
+        return Logical.converted(vectorize(fun, operand_0, operand_1), size)
+    return Logical([fun(*tup) for tup in pairs(operand_0, operand_1, size)], size=size)
+
+
+RELATIONAL_OPERATORS = {
+    '==': lambda x, y: x == y,
+    '>=': lambda x, y: x >= y,
+    '>': lambda x, y: x > y,
+    '<=': lambda x, y: x <= y,
+    '<': lambda x, y: x < y,
+    '~=': lambda x, y: x != y
+}
 
 
 MATRIX_OPERATORS = {
@@ -180,6 +280,18 @@ ARITHMETIC_OPERATORS = {
 }
 
 
+def power(a, b):
+    try:
+        return a ** b
+    except OverflowError:
+        return float('inf') if a > 0 else float('-inf')
+    except ZeroDivisionError:
+        # zero raised to a negative power, -0 to an odd integer power keeps its sign
+        if isinstance(b, (int, float)) and b % 2 == 1 and math.copysign(1.0, a.real) < 0:
+            return float('-inf')
+        return float('inf')
+
+
 def division(a, b):
     if b:
         return a / b
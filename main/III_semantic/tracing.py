@@ -0,0 +1,302 @@
+"""
+just in time compilation of hot scalar loops
+
+the engines count the iterations of every execution of a for or while loop, after HOT_ITERATIONS of them the loop is
+hot: the classes and sizes of the variables the loop reads and assigns are observed at its head, and when they are
+all double or logical scalars, the loop is compiled for these types into a python function working on unboxed floats
+and booleans, which runs the remaining iterations and stores the variables back into the workspace
+
+the function is cached for the loop and the observed types, which are its guards: the next time the loop is hot, the
+types are observed again and any mismatch leaves the loop to the interpreter, or compiles it for the new types.
+the types cannot change inside the function: every compiled operation of double and logical scalars has a double or
+logical scalar result, and the loop is only compiled when every assignment keeps the observed type of its variable.
+the paths which were not taken while the loop was observed are compiled too, so the function never has to leave in
+the middle of an iteration. an operation which raises an error leaves the variables as they are in the interpreter
+
+a loop is compiled when its body only holds suppressed assignments of variables, if statements, nested while loops,
+for loops over constants, break and continue, and its expressions only use scalar constants, variables, the
+arithmetic and relational operators, the short-circuit and logical not operators on logical values, and the
+rounding and remainder functions, so no compiled statement prints and the types of the variables are known.
+any other loop keeps running in the interpreter
+"""
+
+
+from main.II_syntactic.node_types import ASTNodeType
+from main.III_semantic.operations import division, power
+from main.III_semantic.builtin_functions.elfun.rounding_and_remainder import SCALAR_FUNCTIONS
+from main.III_semantic.data_types.array_data.logical import Logical
+from main.III_semantic.data_types.array_data.numeric_data.decimal_data.double import Double
+
+
+HOT_ITERATIONS = 50
+
+DOUBLE = 'double'
+LOGICAL = 'logical'
+
+# class boxing a scalar of every type, and the python conversion unboxing its element
+BOXES = {DOUBLE: Double, LOGICAL: Logical}
+UNBOXES = {DOUBLE: 'float', LOGICAL: 'bool'}
+
+# builtins which are compiled into calls of their SCALAR_FUNCTIONS, by their number of arguments
+FUNCTIONS = {'floor': 1, 'ceil': 1, 'fix': 1, 'round': 1, 'mod': 2, 'rem': 2}
+
+ARITHMETIC = {'+': '+', '-': '-', '*': '*', '.*': '*'}
+DIVISIONS = ('/', './', '\\', '.\\')
+POWERS = ('^', '.^')
+RELATIONAL = {'==': '==', '~=': '!=', '<': '<', '<=': '<=', '>': '>', '>=': '>='}
+SHORT_CIRCUIT = {'&&': 'and', '||': 'or'}
+
+LOOPS = (ASTNodeType.ITR_STMT, ASTNodeType.HOIST_STMT, ASTNodeType.VECTOR_STMT)
+
+
+class Untraceable(Exception):
+    """
+    the loop uses something which is not compiled
+    """
+
+
+class Tracer:
+    """
+    compiled functions of the hot loops of an interpreter
+    """
+    def __init__(self, builtins):
+        self.builtins = builtins
+        # (loop clause, observed types): compiled function, or None when the loop cannot be compiled for the types
+        self.traces = {}
+        # loop clause: (names of the variables, names of the called functions)
+        self.names = {}
+
+    def run(self, clause, variables, columns=None):
+        """
+        run the remaining iterations of the hot loop clause with its compiled function and return True, or return
+        False without running anything when the loop is left to the interpreter
+        columns iterates over the columns left in the data of a for loop, the loop variable holding the last column
+        guards the data: the columns of a double row are double scalars
+        """
+        names, functions = self.names_of(clause)
+        types = observe(names, functions, variables, self.builtins)
+        if types is None:
+            return False
+        key = (clause, types)
+        if key not in self.traces:
+            try:
+                self.traces[key] = TraceCompiler(dict(types)).compile(clause)
+            except Untraceable:
+                self.traces[key] = None
+        trace = self.traces[key]
+        if trace is None:
+            return False
+        trace(variables, columns)
+        return True
+
+    def names_of(self, clause):
+        """
+        names of the variables of the loop clause and of the functions it calls
+        """
+        if clause not in self.names:
+            self.names[clause] = collect(clause)
+        return self.names[clause]
+
+
+def collect(node, names=None, functions=None):
+    """
+    names of the variables of the tree of node and of the functions it calls
+    """
+    names = [] if names is None else names
+    functions = [] if functions is None else functions
+    if node.get_type() == ASTNodeType.IDENTIFIER_EXP:
+        group = functions if node.get_children() else names
+        if node.get_text() not in group:
+            group.append(node.get_text())
+    for child in node.get_children():
+        collect(child, names, functions)
+    return tuple(names), tuple(functions)
+
+
+def observe(names, functions, variables, builtins):
+    """
+    the types of the variables as a tuple of (name, type) pairs, None when one of them is not a double or logical
+    scalar or a called function is a variable
+    """
+    types = []
+    for name in names:
+        value = variables.get(name)
+        if value is None or value.size != (1, 1) or value.get_class() not in (Double, Logical):
+            return None
+        types.append((name, DOUBLE if value.get_class() is Double else LOGICAL))
+    if any(name in variables or name not in FUNCTIONS or name not in builtins for name in functions):
+        return None
+    return tuple(types)
+
+
+class TraceCompiler:
+    """
+    python source of a loop specialized for the types of its variables, the variable x is the local v_x
+    """
+    def __init__(self, types):
+        self.types = types
+        self.lines = []
+        # variables assigned by the compiled statements, stored back into the workspace
+        self.assigned = set()
+        self.namespace = {'Double': Double, 'Logical': Logical, 'division': division, 'power': power,
+                          'convert': Double.convert}
+
+    def compile(self, clause):
+        """
+        the function running the loop clause on the workspace variables
+        """
+        self.emit(0, "def trace(variables, columns):")
+        for name, variable_type in self.types.items():
+            self.emit(1, f"v_{name} = {UNBOXES[variable_type]}(variables[{name!r}][0])")
+        # the variables are stored back even when an operation raises an error, as the interpreter leaves them
+        self.emit(1, "try:")
+        if clause.get_text() == 'while':
+            self.emit(2, f"while {self.expression(clause.get_child(0))[0]}:")
+        else:
+            name = clause.get_child(0).get_child(0).get_text()
+            if self.types[name] != DOUBLE:
+                raise Untraceable()
+            self.assigned.add(name)
+            self.emit(2, "for column in columns:")
+            self.emit(3, f"v_{name} = column[0]")
+        self.statement_list(clause.get_child(1), 3)
+        self.emit(1, "finally:")
+        for name in self.types:
+            if name in self.assigned:
+                self.emit(2, f"variables[{name!r}] = {BOXES[self.types[name]].__name__}.scalar(v_{name})")
+        exec("\n".join(self.lines), self.namespace)
+        return self.namespace['trace']
+
+    def emit(self, indent, line):
+        self.lines.append("    " * indent + line)
+
+    def constant(self, value):
+        name = f"c{len(self.namespace)}"
+        self.namespace[name] = value
+        return name
+
+    # statements
+    def statement_list(self, lst, indent):
+        if not lst.get_children():
+            self.emit(indent, "pass")
+        for stmt in lst.get_children():
+            self.statement(stmt, indent)
+
+    def statement(self, stmt, indent):
+        stmt_type = stmt.get_type()
+        if stmt_type == ASTNodeType.EXP_STMT:
+            self.assignment(stmt, indent)
+        elif stmt_type == ASTNodeType.SEL_STMT and stmt.get_text() == 'if':
+            for clause in stmt.get_children()[:-1]:
+                if clause.get_text() == 'else':
+                    self.emit(indent, "else:")
+                    self.statement_list(clause.get_child(0), indent + 1)
+                else:
+                    keyword = 'if' if clause.get_text() == 'if' else 'elif'
+                    self.emit(indent, f"{keyword} {self.expression(clause.get_child(0))[0]}:")
+                    self.statement_list(clause.get_child(1), indent + 1)
+        elif stmt_type in LOOPS:
+            self.loop(stmt, indent)
+        elif stmt_type == ASTNodeType.JMP_STMT:
+            self.emit(indent, stmt.get_text())
+        else:
+            raise Untraceable()
+
+    def assignment(self, stmt, indent):
+        expression = stmt.get_child(0)
+        if stmt.get_child(1).get_text() != ';' or expression.get_type() != ASTNodeType.ASS_EXP \
+                or expression.get_child(0).get_children():
+            raise Untraceable()
+        name = expression.get_child(0).get_text()
+        code, value_type = self.expression(expression.get_child(1))
+        if value_type != self.types[name]:
+            raise Untraceable()
+        self.assigned.add(name)
+        self.emit(indent, f"v_{name} = {code}")
+
+    def loop(self, stmt, indent):
+        while stmt.get_type() != ASTNodeType.ITR_STMT:
+            stmt = stmt.get_child()
+        clause = stmt.get_child()
+        if clause.get_text() == 'while':
+            self.emit(indent, f"while {self.expression(clause.get_child(0))[0]}:")
+        else:
+            name = clause.get_child(0).get_child(0).get_text()
+            data = clause.get_child(0).get_child(1)
+            if data.get_type() != ASTNodeType.CONSTANT_EXP or self.types[name] != DOUBLE:
+                raise Untraceable()
+            data = data.get_value()
+            if data.get_class() is not Double or data.m != 1:
+                raise Untraceable()
+            self.assigned.add(name)
+            self.emit(indent, f"for v_{name} in {self.constant([float(col[0]) for col in data.cols()])}:")
+        self.statement_list(clause.get_child(1), indent + 1)
+
+    # expressions, as pairs of python code and type
+    def expression(self, exp):
+        exp_type = exp.get_type()
+        if exp_type == ASTNodeType.CONSTANT_EXP:
+            value = exp.get_value()
+            if value.size != (1, 1) or value.get_class() not in (Double, Logical):
+                raise Untraceable()
+            if value.get_class() is Logical:
+                return self.constant(bool(value[0])), LOGICAL
+            return self.constant(float(value[0])), DOUBLE
+        if exp_type == ASTNodeType.IDENTIFIER_EXP:
+            return self.identifier(exp)
+        if exp_type == ASTNodeType.INVARIANT_EXP:
+            # recomputed in every iteration, it is cheap and cannot fail
+            return self.expression(exp.get_child())
+        if exp_type == ASTNodeType.UOP_EXP:
+            return self.unary_operation(exp)
+        if exp_type == ASTNodeType.BOP_EXP:
+            return self.binary_operation(exp)
+        raise Untraceable()
+
+    def identifier(self, exp):
+        name = exp.get_text()
+        if not exp.get_children():
+            return f"v_{name}", self.types[name]
+        arguments = exp.get_child(0)
+        if arguments.get_type() != ASTNodeType.INDEX_LIST_EXP or arguments.num_children() != FUNCTIONS[name]:
+            raise Untraceable()
+        codes = [self.as_double(*self.expression(child)) for child in arguments.get_children()]
+        return f"{self.constant(SCALAR_FUNCTIONS[name])}({', '.join(codes)})", DOUBLE
+
+    @staticmethod
+    def as_double(code, value_type):
+        return code if value_type == DOUBLE else f"float({code})"
+
+    def unary_operation(self, exp):
+        operator = exp.get_text()
+        code, operand_type = self.expression(exp.get_child(0))
+        if operator in ('\'', '.\''):
+            return code, operand_type
+        if operator == '~':
+            # ~ of a double NaN raises an error
+            if operand_type != LOGICAL:
+                raise Untraceable()
+            return f"(not {code})", LOGICAL
+        if operand_type == DOUBLE:
+            return f"({operator}{code})", DOUBLE
+        return f"float({operator}{code})", DOUBLE
+
+    def binary_operation(self, exp):
+        operator = exp.get_text()
+        (code_0, type_0), (code_1, type_1) = (self.expression(child) for child in exp.get_children())
+        doubles = type_0 == type_1 == DOUBLE
+        if operator in ARITHMETIC:
+            code = f"({code_0} {ARITHMETIC[operator]} {code_1})"
+            return (code if doubles else f"float{code}"), DOUBLE
+        if operator in DIVISIONS:
+            if operator in ('\\', '.\\'):
+                code_0, code_1 = code_1, code_0
+            code = f"division({code_0}, {code_1})"
+            return (code if doubles else f"float({code})"), DOUBLE
+        if operator in POWERS:
+            return f"convert(power({code_0}, {code_1}))", DOUBLE
+        if operator in RELATIONAL:
+            return f"({code_0} {RELATIONAL[operator]} {code_1})", LOGICAL
+        if operator in SHORT_CIRCUIT and type_0 == type_1 == LOGICAL:
+            return f"({code_0} {SHORT_CIRCUIT[operator]} {code_1})", LOGICAL
+        raise Untraceable()
@@ -1,22 +1,298 @@
+from main.III_semantic.data_types import storage
+from main.III_semantic.data_types.storage import numpy, is_buffer, to_list, grow, BUFFER_THRESHOLD
+from main.III_semantic.data_types.array_data.char import Char
 from main.III_semantic.data_types.array_data.string import String
+from main.III_semantic.data_types.array_data.logical import Logical
+from main.III_semantic.data_types.array_data.numeric_data.decimal_data.double import Double
 from main.exceptions.iii_semantic_exceptions import *
+from itertools import chain, repeat
 
 
 def concatenate(data_list, direction):
-    if direction == "horz":
-        if len(set([data.m for data in data_list])) > 1:
-            raise ConcatenationError('horzcat')
-        data = sum((sum(list(tup), []) for tup in zip(*[data.rows() for data in data_list])), [])
+    """
+    concatenate the arrays horizontally ("horz") or vertically ("vert") into an array of their nearest common class,
+    the result is allocated once and every operand is copied into it block by block
+    """
+    horz = direction == "horz"
+    if len(set([data.m if horz else data.n for data in data_list])) > 1:
+        raise ConcatenationError('horzcat' if horz else 'vertcat')
+    if horz:
         size = (data_list[0].m, sum(data.n for data in data_list))
-        cls = find_nearest_common_ancestor(set(data.get_class() for data in data_list))
-        return cls(data, size)
-    if direction == "vert":
-        if len(set([data.n for data in data_list])) > 1:
-            raise ConcatenationError('vertcat')
-        data = sum(sum((data.rows() for data in data_list), []), [])
+    else:
         size = (sum(data.m for data in data_list), data_list[0].n)
-        cls = find_nearest_common_ancestor(set(data.get_class() for data in data_list))
-        return cls(data, size)
+    cls = find_nearest_common_ancestor(set(data.get_class() for data in data_list))
+    if storage.buffered and cls in BUFFER_CONCATENATION_CLASSES and size[0] * size[1] >= BUFFER_THRESHOLD:
+        return cls.converted(concatenate_buffers(data_list, size, horz, cls), size)
+    return cls.converted(concatenate_lists(data_list, size, horz, cls), size)
+
+
+# classes whose results are written straight into a numpy buffer, numpy casts the elements of any operand class to
+# them, char results take the list path since a char array in a list may hold codes which do not fit in the buffer
+BUFFER_CONCATENATION_CLASSES = (Double, Logical)
+
+
+def concatenate_lists(data_list, size, horz, cls):
+    m, n = size
+    data = [None] * (m * n)
+    offset = 0
+    for array in data_list:
+        if array.get_class() is cls:
+            block = to_list(array.data) if is_buffer(array.data) else array.data
+        else:
+            block = [cls.convert(element) for element in array]
+        if horz:
+            # the columns of the operands follow each other in column major order
+            data[offset:offset + len(block)] = block
+            offset += len(block)
+        elif array.m <= n:
+            for i in range(array.m):
+                data[offset + i::m] = block[i::array.m]
+            offset += array.m
+        else:
+            for j in range(n):
+                data[j * m + offset:j * m + offset + array.m] = block[j * array.m:(j + 1) * array.m]
+            offset += array.m
+    return data
+
+
+def concatenate_buffers(data_list, size, horz, cls):
+    m, n = size
+    data = numpy.empty(m * n, dtype=getattr(numpy, cls.buffer_type))
+    # the rows of the view are the columns of the result
+    view = data.reshape((n, m))
+    offset = 0
+    for array in data_list:
+        if horz:
+            data[offset:offset + len(array)] = array.data
+            offset += len(array)
+        else:
+            view[:, offset:offset + array.m] = numpy.reshape(array.data, (n, array.m))
+            offset += array.m
+    return data
+
+
+def append(array, operands, direction):
+    """
+    the array literal [array, operands...] ("horz") or [array; operands...] ("vert") of the accumulation idiom
+    x = [x, v], the storage of array is grown in place and array itself is returned when no other variable can see it,
+    otherwise the literal is concatenated as usual
+    """
+    operands = [operand for operand in operands if len(operand)]
+    if direction == "vert" and len(operands) > 1:
+        operands = [concatenate(operands, "horz")]
+    if not growable(array, operands, direction):
+        return concatenate_rows([[array], operands] if direction == "vert" else [[array] + operands])
+
+    cls = array.__class__
+    length = len(array) + sum(len(operand) for operand in operands)
+    if storage.buffered and cls in BUFFER_CONCATENATION_CLASSES and length >= BUFFER_THRESHOLD \
+            and not is_buffer(array.data):
+        array.data = numpy.array(array.data, dtype=getattr(numpy, cls.buffer_type))
+    if is_buffer(array.data):
+        offset = len(array)
+        array.data = grow(array.data, length)
+        for operand in operands:
+            array.data[offset:offset + len(operand)] = operand.data
+            offset += len(operand)
+    else:
+        for operand in operands:
+            if operand.get_class() is not cls:
+                array.data.extend(cls.convert(element) for element in operand)
+            else:
+                array.data.extend(to_list(operand.data) if is_buffer(operand.data) else operand.data)
+    if direction == "horz":
+        array.size = (array.m, array.n + sum(operand.n for operand in operands))
+    else:
+        array.size = (array.m + operands[0].m, 1)
+    return array
+
+
+def growable(array, operands, direction):
+    """
+    whether [array, operands...] or [array; operands...] only adds elements at the end of the column major storage
+    of array, in the class of array, without any other variable seeing array
+    """
+    cls = array.__class__
+    if not len(array) or not operands or array.shared or cls is not array.get_class():
+        return False
+    if is_buffer(array.data) and cls not in BUFFER_CONCATENATION_CLASSES:
+        return False
+    if find_nearest_common_ancestor(set([cls] + [operand.get_class() for operand in operands])) is not cls:
+        return False
+    if direction == "horz":
+        return all(operand.m == array.m for operand in operands)
+    return array.n == 1 and operands[0].n == 1
+
+
+def concatenate_rows(rows):
+    """
+    the array literal of rows of arrays, empty arrays are left out and no row at all is the empty 0x0 double
+    """
+    rows = [[data for data in row if len(data)] for row in rows]
+    rows = [row for row in rows if row]
+    if rows:
+        return concatenate([concatenate(row, "horz") for row in rows], "vert")
+    return Double([], size=(0, 0))
+
+
+def empty_columns(array):
+    """
+    the value of the variable of a for loop over an array without columns, the empty array with its rows
+    """
+    return array.get_class()([], size=(array.m, 0))
+
+
+def assign(array, index_list, value):
+    """
+    the indexed assignment array(index_list) = value, value is written into the storage of array, which is returned
+    itself unless another variable can see it or the class of its elements changes, array is None when the
+    assignment creates the variable
+    positions beyond the end grow the array and the gap is filled with zeros, the empty value [] deletes the positions
+    https://ww2.mathworks.cn/help/matlab/math/array-indexing.html
+    """
+    if array is None:
+        array = value.get_class().converted([], (0, 0))
+    if value.size == (0, 0):
+        return delete(array, index_list)
+    m, n = array.size
+    if len(index_list) == 1:
+        positions = array.positions(index_list[0], len(array))
+        if len(value) != 1 and len(value) != len(positions):
+            raise AssignmentNumberError()
+        end = max(positions) + 1 if len(positions) else 0
+        size = array.size
+        if end > len(array):
+            # a linear index grows vectors along their length, and an empty array into a row vector
+            if m != 1 and n != 1 and len(array):
+                raise AmbiguousGrowthError()
+            size = (end, 1) if n == 1 and m > 1 else (1, end)
+    else:
+        rows = array.positions(index_list[0], m if m or len(value) == 1 else value.m)
+        cols = array.positions(index_list[1], n if n or len(value) == 1 else value.n)
+        if len(value) != 1 and [d for d in (len(rows), len(cols)) if d != 1] != [d for d in value.size if d != 1]:
+            raise AssignmentSizeError(str(len(rows)), str(len(cols)), str(value.m), str(value.n))
+        size = (max([m] + [i + 1 for i in rows]), max([n] + [j + 1 for j in cols]))
+        positions = [j * size[0] + i for j in cols for i in rows]
+    array = resized(array, assignment_class(array.get_class(), value.get_class()), size)
+    write(array, positions, value)
+    return array
+
+
+def assignment_class(target, source):
+    """
+    class of an array of class target after elements of class source are written into it, their nearest common
+    class, except that char and logical arrays keep their class, like numeric arrays which chars are written into
+    """
+    if target is source or target in (Char, Logical) or source is Char:
+        return target
+    return find_nearest_common_ancestor({target, source})
+
+
+def resized(array, cls, size):
+    """
+    array of class cls and the given size holding the elements of array at their subscripts, the new positions are
+    padded with zeros
+    array itself is grown in place, in amortized constant time per element, when no other variable can see it and
+    its elements keep their linear positions: the number of rows stays the same or array is a column vector
+    """
+    m, n = array.size
+    length = size[0] * size[1]
+    padding = cls.convert(cls.padding)
+    if array.__class__ is cls and not array.shared and (size[0] == m or n <= 1):
+        if length > len(array):
+            if storage.buffered and cls in BUFFER_CONCATENATION_CLASSES and length >= BUFFER_THRESHOLD \
+                    and not is_buffer(array.data):
+                array.data = numpy.array(array.data, dtype=getattr(numpy, cls.buffer_type))
+            if is_buffer(array.data):
+                offset = len(array)
+                array.data = grow(array.data, length)
+                array.data[offset:] = padding
+            else:
+                array.data.extend([padding] * (length - len(array)))
+        array.size = size
+        return array
+
+    elements = array.data if array.get_class() is cls else [cls.convert(element) for element in array]
+    if storage.buffered and cls in BUFFER_CONCATENATION_CLASSES and length >= BUFFER_THRESHOLD:
+        data = numpy.full(length, padding, dtype=getattr(numpy, cls.buffer_type))
+        # the rows of the view are the columns of the result
+        data.reshape((size[1], size[0]))[:n, :m] = numpy.reshape(elements, (n, m))
+    else:
+        elements = to_list(elements) if is_buffer(elements) else elements
+        if size[0] == m:
+            # the elements keep their linear positions, e.g. in the copy of an array another variable can see
+            data = list(elements) + [padding] * (length - len(elements))
+        else:
+            data = [padding] * length
+            for j in range(n):
+                data[j * size[0]:j * size[0] + m] = elements[j * m:(j + 1) * m]
+    return cls.converted(data, size)
+
+
+def write(array, positions, value):
+    """
+    write the elements of value, or its only element, at the zero based linear positions of array
+    """
+    cls = array.__class__
+    array.detach()
+    data = array.data
+    if len(value) == 1:
+        element = cls.convert(value[0])
+        if len(positions) == 1:
+            data[positions[0]] = element
+        elif is_buffer(data):
+            data[positions] = element
+        else:
+            for position in positions:
+                data[position] = element
+    elif is_buffer(data):
+        # the buffer of value is converted like its elements, a NaN written into a logical array raises
+        elements = value.data if value.get_class() is cls else cls.to_buffer(value.data) if is_buffer(value.data) \
+            else None
+        data[positions] = elements if elements is not None else [cls.convert(element) for element in value]
+    else:
+        elements = value if value.get_class() is cls else (cls.convert(element) for element in value)
+        for position, element in zip(positions, elements):
+            data[position] = element
+
+
+def delete(array, index_list):
+    """
+    the null assignment array(index_list) = [], a linear index removes its positions and keeps the orientation of a
+    vector (a matrix becomes a row vector), two indices remove the rows or the columns selected by the only one of
+    them which does not select everything
+    """
+    m, n = array.size
+    if len(index_list) == 1:
+        index = index_list[0]
+        if isinstance(index, str):
+            return array.get_class().converted([], (0, 0))
+        removed = set(array.positions(index, len(array)))
+        if not removed:
+            return array
+        if max(removed) >= len(array):
+            raise DeletionIndexError()
+        kept = [position for position in range(len(array)) if position not in removed]
+        size = (len(kept), 1) if n == 1 and m != 1 else (1, len(kept))
+    else:
+        rows = set(array.positions(index_list[0], m))
+        cols = set(array.positions(index_list[1], n))
+        if rows and max(rows) >= m or cols and max(cols) >= n:
+            raise DeletionIndexError()
+        if len(cols) == n:
+            kept_rows, kept_cols = [i for i in range(m) if i not in rows], range(n)
+        elif len(rows) == m:
+            kept_rows, kept_cols = range(m), [j for j in range(n) if j not in cols]
+        else:
+            raise NullAssignmentError()
+        size = (len(kept_rows), len(kept_cols))
+        kept = [j * m + i for j in kept_cols for i in kept_rows]
+    data = array.data[kept] if is_buffer(array.data) else [array.data[position] for position in kept]
+    if array.__class__ is array.get_class() and not array.shared:
+        array.data = data
+        array.size = size
+        return array
+    return array.get_class().converted(data, size)
 
 
 def find_nearest_common_ancestor(class_set):
@@ -49,23 +325,45 @@ def find_nearest_mutual_ancestor(class_a, class_b):
 
 def compat(a, b):
     """
+    size of the result of an element-wise operation on a and b
     https://ww2.mathworks.cn/help/matlab/matlab_prog/compatible-array-sizes-for-basic-operations.html
+    the operands are left untouched, the kernels read them through broadcast
     """
     if a.size == b.size:
-        return
+        return a.size
+    (m_a, n_a), (m_b, n_b) = a.size, b.size
+    if m_a != m_b and m_a != 1 and m_b != 1 or n_a != n_b and n_a != 1 and n_b != 1:
+        raise IncompatibleSizeError()
+    return m_b if m_a == 1 else m_a, n_b if n_a == 1 else n_a
 
-    if a.size[0] != b.size[0]:
-        if a.size[0] == 1:
-            a.expand_row(b.size[0])
-        elif b.size[0] == 1:
-            b.expand_row(a.size[0])
-        else:
-            raise IncompatibleSizeError()
-    if a.size[1] != b.size[1]:
-        if a.size[1] == 1:
-            a.expand_col(b.size[1])
-        elif b.size[1] == 1:
-            b.expand_col(a.size[1])
-        else:
-            raise IncompatibleSizeError()
-    return
+
+def broadcast(array, size):
+    """
+    iterator over the elements of array expanded to size in column major order, the elements are read again with a
+    zero stride along the dimensions where array has a single one instead of being replicated
+    """
+    if array.size == size:
+        return iter(array)
+    m, n = size
+    if array.size == (1, 1):
+        return repeat(array[0], m * n)
+    if array.m == 1:
+        # a row: every element is repeated down its column
+        return chain.from_iterable(repeat(element, m) for element in array)
+    # a column: the whole column is read again for every column of the result
+    return chain.from_iterable(repeat(array, n))
+
+
+def pairs(a, b, size):
+    """
+    pairs of elements of a and b at the same position of the result of size, see broadcast
+    """
+    return zip(broadcast(a, size), broadcast(b, size))
+
+
+def share(array):
+    """
+    array handed out more than once, e.g. as the value of an invariant expression, so that it is never modified in place
+    """
+    array.shared = True
+    return array
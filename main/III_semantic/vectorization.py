@@ -0,0 +1,292 @@
+"""
+automatic vectorization of element-wise for loops
+
+a loop such as
+
+    for k = 1:n
+        y(k) = a(k) * 2 + b(k);
+        s = s + a(k);
+    end
+
+runs as a few whole-array operations instead of one boxed scalar at a time: y(1:n) = a(1:n) .* 2 + b(1:n), and the
+elements of a(1:n) folded into s
+
+a for loop over a colon expression or a constant is vectorized when its body only holds suppressed assignments of
+two kinds:
+    y(k) = e, the element of an array at the position of the loop variable k
+    s = s op e, a reduction by +, - or *, also s = e + s and s = e * s
+where e is made of element-wise operators, signs, constants, the loop variable, elements x(k) of arrays and
+variables which the loop does not assign. the arrays and accumulators assigned by the loop are read nowhere else in
+it, so the reductions are the only dependencies between iterations and an iteration only touches the position k of
+every array: running each statement over all the iterations, one statement after the other, has the same result as
+running the iterations one after the other
+
+the operators * / \\ ^ of a pair of scalars are the same as their element-wise versions, the reductions fold the
+elements from the first to the last, so every rounding is the one of the loop
+
+before anything is changed, VectorizedLoop checks at run time that no operation of the loop can fail: the data is a
+row of doubles, the indexes are positive integers within the arrays read, the variables are bound numeric scalars,
+the arrays written can grow. when a check fails the loop runs as usual, so it raises its errors exactly like without
+the pass
+"""
+
+
+from main.II_syntactic.node import VectorizedNode
+from main.II_syntactic.node_types import ASTNodeType
+from main.III_semantic.operations import evaluate_colon_operation, SCALAR_CLASSES
+from main.III_semantic.fusion import defer, defer_sign, force, ELEMENT_WISE_OPERATORS, SIGN_OPERATORS
+from main.III_semantic.utils import assign
+from main.III_semantic.data_types.storage import is_buffer, to_list
+from main.III_semantic.data_types.array_data.numeric_data.decimal_data.double import Double
+from main.exceptions.iii_semantic_exceptions import SemanticException
+from functools import reduce
+import operator as python_operator
+
+
+# operators of a pair of scalars, by their element-wise versions
+ELEMENT_WISE = {'*': '.*', '/': './', '\\': '.\\', '^': '.^'}
+
+# reductions s = s op e, by the function folding an element into the accumulator
+REDUCTIONS = {'+': python_operator.add, '-': python_operator.sub, '*': python_operator.mul, '.*': python_operator.mul}
+COMMUTATIVE = ('+', '*', '.*')
+
+# classes of the arrays an element can be written into without any check, a NaN written into a logical array raises
+TARGET_CLASSES = (Double,)
+
+STATEMENTS = (ASTNodeType.STMT_LIST, ASTNodeType.SEL_STMT, ASTNodeType.SEL_ClS, ASTNodeType.ITR_STMT,
+              ASTNodeType.ITR_CLS, ASTNodeType.HOIST_STMT)
+
+
+def vectorize(ast_root):
+    """
+    wrap every for loop of the tree which can run as whole-array operations in a VectorizedNode, in place, and return
+    the tree
+    """
+    children = ast_root.get_children()
+    for i, child in enumerate(children):
+        if child.get_type() == ASTNodeType.ITR_STMT:
+            plan = Vectorizer().analyze(child.get_child())
+            if plan is not None:
+                children[i] = VectorizedNode(child, plan)
+                continue
+        if child.get_type() in STATEMENTS:
+            vectorize(child)
+    return ast_root
+
+
+def is_variable(node, name):
+    return node.get_type() == ASTNodeType.IDENTIFIER_EXP and node.get_text() == name and not node.get_children()
+
+
+class Vectorizer:
+    """
+    analysis of a loop clause, the operands of its expressions are tuples:
+    ('constant', value), ('loop',), ('scalar', name), ('element', name) for name(k), (operator, operand) for a sign
+    and (operator, operand, operand) for an element-wise operator
+    """
+    def __init__(self):
+        self.loop_name = None
+        self.bounds = []    # variables of the colon expression
+        self.scalars = []   # variables read as a whole by the body
+        self.elements = []  # arrays read at the position of the loop variable
+
+    def analyze(self, clause):
+        """
+        the VectorizedLoop of the clause, or None when the loop must run as usual
+        """
+        if clause.get_text() != 'for':
+            return None
+        header, body = clause.get_child(0), clause.get_child(1)
+        self.loop_name = header.get_child(0).get_text()
+        data = self.data(header.get_child(1))
+        statements = [self.statement(stmt) for stmt in body.get_children()]
+        if data is None or not statements or None in statements:
+            return None
+        assigned = {self.loop_name} | {statement[1] for statement in statements}
+        if len(assigned) != len(statements) + 1 or assigned & set(self.scalars + self.elements):
+            return None
+        return VectorizedLoop(self.loop_name, data, statements, self.bounds, self.scalars, self.elements)
+
+    def data(self, node):
+        if node.get_type() == ASTNodeType.CONSTANT_EXP:
+            return 'constant', node.get_value()
+        if node.get_type() != ASTNodeType.CLN_EXP or node.num_children() not in (2, 3):
+            return None
+        bounds = []
+        for child in node.get_children():
+            if child.get_type() == ASTNodeType.CONSTANT_EXP:
+                bounds.append(('constant', child.get_value()))
+            elif child.get_type() == ASTNodeType.IDENTIFIER_EXP and not child.get_children():
+                self.bounds.append(child.get_text())
+                bounds.append(('scalar', child.get_text()))
+            else:
+                return None
+        return ('colon', *bounds)
+
+    def statement(self, stmt):
+        """
+        ('store', y, operand) for y(k) = e, ('reduction', s, operand, function) for s = s op e, None otherwise
+        """
+        if stmt.get_type() != ASTNodeType.EXP_STMT or stmt.get_child(1).get_text() != ';' \
+                or stmt.get_child(0).get_type() != ASTNodeType.ASS_EXP:
+            return None
+        target, value = stmt.get_child(0).get_children()
+        name = target.get_text()
+        if target.get_children():
+            operand = self.operand(value) if self.at_loop_position(target) else None
+            return None if operand is None else ('store', name, operand)
+        operator = value.get_text()
+        if value.get_type() != ASTNodeType.BOP_EXP or operator not in REDUCTIONS:
+            return None
+        if is_variable(value.get_child(0), name):
+            term = value.get_child(1)
+        elif is_variable(value.get_child(1), name) and operator in COMMUTATIVE:
+            term = value.get_child(0)
+        else:
+            return None
+        operand = self.operand(term)
+        return None if operand is None else ('reduction', name, operand, REDUCTIONS[operator])
+
+    def operand(self, node):
+        node_type = node.get_type()
+        if node_type == ASTNodeType.CONSTANT_EXP:
+            value = node.get_value()
+            return ('constant', value) if value.size == (1, 1) and value.get_class() in SCALAR_CLASSES else None
+        if node_type == ASTNodeType.IDENTIFIER_EXP:
+            name = node.get_text()
+            if not node.get_children():
+                if name == self.loop_name:
+                    return ('loop',)
+                self.scalars.append(name)
+                return 'scalar', name
+            if name == self.loop_name or not self.at_loop_position(node):
+                return None
+            self.elements.append(name)
+            return 'element', name
+        operator = ELEMENT_WISE.get(node.get_text(), node.get_text())
+        if node_type == ASTNodeType.UOP_EXP and operator in SIGN_OPERATORS:
+            operand = self.operand(node.get_child(0))
+            return None if operand is None else (operator, operand)
+        if node_type == ASTNodeType.BOP_EXP and operator in ELEMENT_WISE_OPERATORS:
+            operands = [self.operand(child) for child in node.get_children()]
+            return None if None in operands else (operator, *operands)
+        return None
+
+    def at_loop_position(self, node):
+        """
+        whether the arguments of the identifier node are the loop variable alone
+        """
+        arguments = node.get_child(0)
+        return arguments.get_type() == ASTNodeType.INDEX_LIST_EXP and arguments.num_children() == 1 \
+            and is_variable(arguments.get_child(0), self.loop_name)
+
+
+class VectorizedLoop:
+    """
+    whole-array execution of a for loop, see Vectorizer for the operands
+    """
+    def __init__(self, loop_name, data, statements, bounds, scalars, elements):
+        self.loop_name = loop_name
+        self.data = data
+        self.statements = statements
+        self.scalars = tuple(dict.fromkeys(scalars))
+        self.elements = tuple(dict.fromkeys(elements))
+        self.indexed = bool(self.elements) or any(statement[0] == 'store' for statement in statements)
+        # every variable the loop reads or assigns
+        self.names = tuple(dict.fromkeys([loop_name, *bounds, *scalars, *elements,
+                                          *(statement[1] for statement in statements)]))
+
+    def run(self, variables):
+        """
+        run the loop on the workspace variables and return True, or return False without changing anything when an
+        operation of the loop may fail
+        """
+        data = self.evaluate_data(variables)
+        if data is None:
+            return False
+        count = len(data)
+        if count == 0:
+            variables[self.loop_name] = Double([], size=(1, 0))
+            return True
+        top = largest_index(data) if self.indexed else 0
+        if top is None or any(scalar(variables.get(name)) is None for name in self.scalars):
+            return False
+        for name in self.elements:
+            array = variables.get(name)
+            if array is None or array.get_class() not in SCALAR_CLASSES or len(array) < top:
+                return False
+        for statement in self.statements:
+            target = variables.get(statement[1])
+            if statement[0] == 'reduction':
+                if scalar(target) is None:
+                    return False
+            elif target is not None and (target.get_class() not in TARGET_CLASSES or top > len(target)
+                                         and target.m != 1 and target.n != 1 and len(target)):
+                return False
+
+        for statement in self.statements:
+            name = statement[1]
+            value = force(self.evaluate(statement[2], data, variables))
+            if statement[0] == 'store':
+                variables[name] = assign(variables.get(name), [data], value)
+            else:
+                elements = [value[0]] * count if value.size == (1, 1) else value.data
+                elements = to_list(elements) if is_buffer(elements) else elements
+                variables[name] = Double.scalar(float(reduce(statement[3], elements, float(variables[name][0]))))
+        variables[self.loop_name] = Double.scalar(data[count - 1])
+        return True
+
+    def evaluate_data(self, variables):
+        """
+        the row of doubles the loop iterates over, or None
+        """
+        if self.data[0] == 'constant':
+            data = self.data[1]
+        else:
+            bounds = [self.data[i][1] if self.data[i][0] == 'constant' else scalar(variables.get(self.data[i][1]))
+                      for i in range(1, len(self.data))]
+            if any(bound is None for bound in bounds):
+                return None
+            step = bounds[1][0] if len(bounds) == 3 else 1
+            try:
+                data = evaluate_colon_operation(bounds[0][0], step, bounds[-1][0])
+            except SemanticException:
+                return None
+        return data if data.get_class() is Double and data.m == 1 else None
+
+    def evaluate(self, operand, data, variables):
+        kind = operand[0]
+        if kind == 'constant':
+            return operand[1]
+        if kind == 'loop':
+            return data
+        if kind == 'scalar':
+            return variables[operand[1]]
+        if kind == 'element':
+            return variables[operand[1]]([data])
+        if len(operand) == 2:
+            return defer_sign(kind, self.evaluate(operand[1], data, variables))
+        return defer(kind, self.evaluate(operand[1], data, variables), self.evaluate(operand[2], data, variables))
+
+
+def scalar(value):
+    """
+    value when it is a numeric scalar, None otherwise
+    """
+    return value if value is not None and value.size == (1, 1) and value.get_class() in SCALAR_CLASSES else None
+
+
+def largest_index(data):
+    """
+    the largest element of data when every element is a positive integer, None otherwise
+    """
+    progression = data.progression()
+    if progression is not None:
+        # the elements between the end points of an integer progression are integers too
+        first, last, step = float(data[0]), float(data[len(data) - 1]), float(progression[1])
+        integral = first.is_integer() and last.is_integer() and step.is_integer()
+        return int(max(first, last)) if integral and min(first, last) >= 1 else None
+    elements = to_list(data.data) if is_buffer(data.data) else data.data
+    if all(float(element).is_integer() and element >= 1 for element in elements):
+        return int(max(elements))
+    return None
@@ -1,3 +1,6 @@
+from main.II_syntactic.node_types import ASTNodeType
+
+
 # Abstract Syntax Tree Node
 class ASTNode:
     def __init__(self, n_type=None, n_text=None, n_line=0, children=None):
@@ -36,6 +39,58 @@ class ASTNode:
         return f"{str(self.type)[12:]}: {repr(self.text)}"
 
 
+class ConstantNode(ASTNode):
+    """
+    leaf holding a value computed before execution, a literal or a folded constant subexpression,
+    see constant_folding.py
+    """
+    def __init__(self, value, n_text=None, n_line=0):
+        super().__init__(n_type=ASTNodeType.CONSTANT_EXP, n_text=n_text, n_line=n_line)
+        self.value = value
+
+    def get_value(self):
+        return self.value
+
+
+class InvariantNode(ASTNode):
+    """
+    expression of a loop which reads no variable assigned by the loop, its only child,
+    evaluated when it is first reached in an execution of the loop and reused by the following iterations,
+    see loop_optimization.py
+    """
+    def __init__(self, expression, index):
+        super().__init__(n_type=ASTNodeType.INVARIANT_EXP, n_text=f"invariant {index}", n_line=expression.get_line(),
+                         children=[expression])
+
+
+class HoistingNode(ASTNode):
+    """
+    loop statement, its only child, whose invariant expressions are forgotten every time the loop starts,
+    see loop_optimization.py
+    """
+    def __init__(self, loop, invariants):
+        super().__init__(n_type=ASTNodeType.HOIST_STMT, n_text=loop.get_text(), n_line=loop.get_line(),
+                         children=[loop])
+        self.invariants = invariants
+
+    def get_invariants(self):
+        return self.invariants
+
+
+class VectorizedNode(ASTNode):
+    """
+    for loop statement, its only child, which runs as whole-array operations when its VectorizedLoop allows it and as
+    usual otherwise, see vectorization.py
+    """
+    def __init__(self, loop, plan):
+        super().__init__(n_type=ASTNodeType.VECTOR_STMT, n_text=loop.get_text(), n_line=loop.get_line(),
+                         children=[loop])
+        self.plan = plan
+
+    def get_plan(self):
+        return self.plan
+
+
 class ASTTreePrinter:
     def __init__(self):
         self.vec_left = [0 for _ in range(100)]
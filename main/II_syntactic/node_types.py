@@ -10,6 +10,9 @@ class ASTNodeType(Enum):
     EXP_STMT = "EXPRESSION STATEMENT"
     SEL_STMT = "SELECTION STATEMENT"
     ITR_STMT = "ITERATION STATEMENT"
+    JMP_STMT = "JUMP STATEMENT"
+    HOIST_STMT = "HOISTING STATEMENT"
+    VECTOR_STMT = "VECTORIZED STATEMENT"
 
     # Statement Components
     EO_STMT = "END OF STATEMENT"
@@ -28,3 +31,5 @@ class ASTNodeType(Enum):
     INDEX_LIST_EXP = "INDEX LIST EXPRESSION"
     IDENT_LIST_EXP = "IDENTIFIER LIST EXPRESSION"
     IDENTIFIER_EXP = "IDENTIFIER EXPRESSION"
+    CONSTANT_EXP = "CONSTANT EXPRESSION"
+    INVARIANT_EXP = "INVARIANT EXPRESSION"
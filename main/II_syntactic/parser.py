@@ -2,6 +2,7 @@ from main.I_lexical.token import Token
 from main.I_lexical.token_types import TokenType
 from main.II_syntactic.node import ASTNode
 from main.II_syntactic.node_types import ASTNodeType
+from main.II_syntactic.token_stream import TokenStream
 from main.exceptions.ii_syntactic_exceptions import *
 
 
@@ -20,6 +21,12 @@ SEL_TERMINATOR_MAP = {
 }
 
 
+JUMP_OUTSIDE_LOOP_ERRORS = {
+    'break': BreakOutsideLoopError,
+    'continue': ContinueOutsideLoopError
+}
+
+
 NON_PREFIX_OPERATOR_TOKENS = {
     TokenType.MUL,
     TokenType.POW,
@@ -71,11 +78,13 @@ class Parser:
                 row=last.row,
                 col=last.col + len(last.text)
             ))
-        self.last_token = None
+        self.stream = TokenStream(self.tokens)
+        self.loop_depth = 0
         self.statement_cases = [
             self.parse_expression_statement,
             self.parse_selection_statement,
             self.parse_iteration_statement,
+            self.parse_jump_statement,
         ]
         self.primary_cases = {
             TokenType.NUMBER_LIT: self.parse_number_literal,
@@ -86,34 +95,18 @@ class Parser:
             TokenType.IDENTIFIER: self.parse_identifier_expression,
         }
 
+    @property
+    def last_token(self):
+        return self.stream.last_token
+
     def get_token(self, index=0):
-        i = 0
-        meaningful_tokens = []
-        while len(meaningful_tokens) <= index:
-            if len(self.tokens) > i:
-                if self.tokens[i].get_type() not in (TokenType.WHITESPACE, TokenType.ANNOTATION):
-                    meaningful_tokens.append(self.tokens[i])
-                i += 1
-            else:
-                return None
-        return meaningful_tokens[-1] if meaningful_tokens else None
+        return self.stream.peek(index)
 
     def get_token_type(self, index=0):
-        token = self.get_token(index)
-        if token:
-            return token.get_type()
-
-    def pop(self):
-        if self.tokens:
-            self.last_token = self.tokens.pop(0)
-        else:
-            return None
+        return self.stream.peek_type(index)
 
     def pop_token(self):
-        self.pop()
-        while self.last_token.get_type() in (TokenType.WHITESPACE, TokenType.ANNOTATION):
-            self.pop()
-        return self.last_token
+        return self.stream.advance()
 
     def complete_statement(self, node):
         if self.get_token_type() != TokenType.EO_STMT:
@@ -130,13 +123,15 @@ class Parser:
         when parse program, terminators use it default value, only if no token left will the parsing stop
         when parse code blocks like selection, iteration, function, terminators will be some specified keywords
         """
+        stream = self.stream
         node = ASTNode(n_type=ASTNodeType.STMT_LIST)
-        while str(self.get_token()) not in terminators:
-            if self.get_token() is None:
+        while str(stream.peek()) not in terminators:
+            token = stream.peek()
+            if token is None:
                 # indicates a invalid code block error, but raise outside the block
                 return None
-            if self.get_token_type() == TokenType.EO_STMT:
-                self.pop_token()
+            if token.type == TokenType.EO_STMT:
+                stream.advance()
                 continue
             node.add_child(self.parse_statement())
         return node
@@ -237,7 +232,9 @@ class Parser:
             return None
         node.add_child(expression)
 
+        self.loop_depth += 1
         statement_list = self.parse_statement_list(terminators=('end', ))
+        self.loop_depth -= 1
         if statement_list is None:
             # exception raised outside
             return None
@@ -245,6 +242,18 @@ class Parser:
 
         return node
 
+    def parse_jump_statement(self):
+        token = self.get_token()
+        if token.get_type() != TokenType.KEYWORD or token.get_text() not in JUMP_OUTSIDE_LOOP_ERRORS:
+            return None
+        if self.loop_depth == 0:
+            raise JUMP_OUTSIDE_LOOP_ERRORS[token.get_text()](token.row, token.col)
+        self.pop_token()
+        node = ASTNode(n_type=ASTNodeType.JMP_STMT,
+                       n_text=token.get_text(),
+                       n_line=token.get_line())
+        return self.complete_statement(node)
+
     def parse_identifier_list(self):
         node = ASTNode(n_type=ASTNodeType.IDENT_LIST_EXP)
         while self.get_token_type() == TokenType.IDENTIFIER:
@@ -263,12 +272,18 @@ class Parser:
             return node
 
     def parse_assignment_expression(self):
-        if self.get_token_type() != TokenType.IDENTIFIER or self.get_token_type(1) != TokenType.ASS:
+        """
+        assignment to a variable x = v, or to elements of it x(i, j) = v whose target keeps its index list
+        """
+        if self.get_token_type() != TokenType.IDENTIFIER:
             return None
-        token = self.pop_token()
-        identifier = ASTNode(n_type=ASTNodeType.IDENTIFIER_EXP,
-                             n_text=token.get_text(),
-                             n_line=token.get_line())
+        if self.get_token_type(1) == TokenType.L_PAREN:
+            close = self.find_matching_paren(1)
+            if close is None or self.get_token_type(close + 1) != TokenType.ASS:
+                return None
+        elif self.get_token_type(1) != TokenType.ASS:
+            return None
+        identifier = self.parse_identifier_expression()
         token = self.pop_token()
         node = ASTNode(n_type=ASTNodeType.ASS_EXP,
                        n_text=token.get_text(),
@@ -276,6 +291,23 @@ class Parser:
                        children=[identifier, self.parse_logic_or_expression()])
         return node
 
+    def find_matching_paren(self, index):
+        """
+        offset of the right paren closing the left paren at offset index, None if the statement ends before it
+        """
+        depth = 0
+        while True:
+            token = self.get_token(index)
+            if token is None or token.get_type() == TokenType.EO_STMT and token.get_text() in (';', '\n'):
+                return None
+            if token.get_type() == TokenType.L_PAREN:
+                depth += 1
+            elif token.get_type() == TokenType.R_PAREN:
+                depth -= 1
+                if depth == 0:
+                    return index
+            index += 1
+
     def parse_logic_or_expression(self):
         root = self.parse_logic_and_expression()
         while self.get_token_type() == TokenType.SCO:
@@ -437,28 +469,31 @@ class Parser:
         return node
 
     def parse_bracket_expression(self):
-        token = self.pop_token()  # remove left bracket
+        stream = self.stream
+        token = stream.advance()  # remove left bracket
         node = ASTNode(n_type=ASTNodeType.ARRAY_LIST_EXP,
                        n_line=token.get_line())
         while True:
-            while self.get_token_type() == TokenType.EO_STMT:
-                token = self.pop_token()  # EO_STMT
+            while stream.peek_type() == TokenType.EO_STMT:
+                token = stream.advance()  # EO_STMT
                 if str(token) == "," and node.children and node.children[-1].get_text() == ',':
                     raise InvalidExpressionError3(token.row, token.col)
                 node.add_child(ASTNode(n_type=ASTNodeType.EO_STMT,
                                        n_text=token.get_text(),
                                        n_line=token.get_line()))
 
-            if self.get_token_type() is None:
-                self.pop_token()
-                raise IncompleteStatementError(self.last_token.row, self.last_token.col)
+            if stream.peek_type() is None:
+                token = stream.advance()
+                raise IncompleteStatementError(token.row, token.col)
+            if stream.peek_type() == TokenType.R_BRACKET:
+                # empty array [] or separators closing the last row
+                break
 
             node.add_child(self.parse_logic_or_expression())
 
-            token = self.get_token()
-            if token.get_type() == TokenType.R_BRACKET:
+            if stream.peek_type() == TokenType.R_BRACKET:
                 break
-        self.pop_token()  # remove right bracket
+        stream.advance()  # remove right bracket
         return node
 
     def parse_identifier_expression(self):
@@ -474,10 +509,11 @@ class Parser:
         return root
 
     def parse_index_list(self):
+        stream = self.stream
         root = ASTNode(n_type=ASTNodeType.INDEX_LIST_EXP)
         while True:
-            if self.get_token_type() == TokenType.COLON:
-                token = self.pop_token()  # COLON
+            if stream.peek_type() == TokenType.COLON:
+                token = stream.advance()  # COLON
                 root.add_child(ASTNode(n_type=ASTNodeType.CLN_EXP,
                                        n_text=token.get_text(),
                                        n_line=token.get_line()))
@@ -485,10 +521,10 @@ class Parser:
                 child = self.parse_logic_or_expression()
                 root.add_child(child)
 
-            token = self.get_token()
+            token = stream.peek()
             if str(token) == ",":
                 # one argument finished, continue to parse another argument
-                self.pop_token()
+                stream.advance()
                 continue
             elif token.get_type() == TokenType.R_PAREN:
                 break
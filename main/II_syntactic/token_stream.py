@@ -0,0 +1,39 @@
+from main.I_lexical.token_types import TokenType
+
+
+NEGLIGIBLE_TOKENS = (TokenType.WHITESPACE, TokenType.ANNOTATION)
+
+
+class TokenStream:
+    """
+    cursor over the meaningful tokens of a token list
+    whitespaces and annotations are filtered out once when the stream is built,
+    the complete token list is still kept in self.tokens
+    """
+
+    def __init__(self, token_list):
+        self.tokens = token_list
+        self.meaningful_tokens = [token for token in token_list if token.type not in NEGLIGIBLE_TOKENS]
+        self.cursor = 0
+        self.last_token = None
+
+    def peek(self, k=0):
+        index = self.cursor + k
+        if index < len(self.meaningful_tokens):
+            return self.meaningful_tokens[index]
+        return None
+
+    def peek_type(self, k=0):
+        index = self.cursor + k
+        if index < len(self.meaningful_tokens):
+            return self.meaningful_tokens[index].type
+        return None
+
+    def advance(self):
+        """
+        consume the current token and return it, at the end of the stream the last consumed token is returned
+        """
+        if self.cursor < len(self.meaningful_tokens):
+            self.last_token = self.meaningful_tokens[self.cursor]
+            self.cursor += 1
+        return self.last_token
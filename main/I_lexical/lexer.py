@@ -1,31 +1,46 @@
-import re
+from main.I_lexical.scanner import scan, BLOCK_ANNOTATION_START, BLOCK_ANNOTATION_END
 from main.I_lexical.token_types import TokenType
 from main.I_lexical.token import Token
 from main.exceptions.i_lexical_exception import *
 
 
+EO_STMT = TokenType.EO_STMT
+TRA = TokenType.TRA
+ANNOTATION = TokenType.ANNOTATION
+MISS = TokenType.MISS
+WHITESPACE = TokenType.WHITESPACE
+
+
 def lexer(code):
-    token_regex = '|'.join(f'(?P<{token_type.name}>{token_type.value})' for token_type in TokenType)
     row = 1
     last_newline_end = 0
     result_token_list = []
-    for match in re.finditer(token_regex, code):
-        match_type = TokenType[match.lastgroup]
-        match_text = match.group()
-        col = match.start() - last_newline_end + 1
-        if match_type == TokenType.TRA:
-            if not result_token_list or result_token_list[-1].get_type() in (TokenType.EO_STMT, TokenType.WHITESPACE):
+    append = result_token_list.append
+    for match_type, match_text, start in scan(code):
+        col = start - last_newline_end + 1
+        if match_type is EO_STMT:
+            append(Token(match_type, match_text, row, col))
+            if match_text == '\n':
+                row += 1
+                last_newline_end = start + 1
+            continue
+        if match_type is TRA:
+            if not result_token_list or result_token_list[-1].type in (EO_STMT, WHITESPACE):
                 raise CharacterVectorTerminationError(row, col)
-        if match_type == TokenType.ANNOTATION:
-            if match_text[:2] == "%{" and match_text[-2:] != "%}":
-                raise AnnotationBlockTerminationError(row+match_text.count('\n'), len(match_text.split('\n')[-1])+1)
-        if match_type == TokenType.MISS:
+        elif match_type is ANNOTATION and col == 1 \
+                and (match_text == BLOCK_ANNOTATION_START or match_text[:3] == BLOCK_ANNOTATION_START + '\n'):
+            # consider multi-line annotation
+            if match_text[-2:] != BLOCK_ANNOTATION_END:
+                raise AnnotationBlockTerminationError(row+match_text.count('\n'),
+                                                      len(match_text) - match_text.rfind('\n'))
+            append(Token(match_type, match_text, row, col))
+            row += match_text.count('\n')
+            last_newline_end = start + match_text.rfind('\n') + 1
+            continue
+        elif match_type is MISS:
             if match_text[0] == '"':
                 raise StringTerminationError(row, col)
             else:  # "#$`"
                 raise InvalidCharacterError(row, col)
-        result_token_list.append(Token(t_type=match_type, t_text=match_text, row=row, col=col))
-        if '\n' in match_text:
-            row += match_text.count('\n')
-            last_newline_end = match.end()-len(match_text.split('\n')[-1])  # consider multi-line annotation
+        append(Token(match_type, match_text, row, col))
     return result_token_list
@@ -0,0 +1,47 @@
+import re
+from main.I_lexical.token_types import TokenType
+
+
+# one capturing group per token type, so the index of the matched group identifies the token type directly
+TOKEN_REGEX = re.compile('|'.join(f'({token_type.value})' for token_type in TokenType))
+TOKEN_TYPES = (None, ) + tuple(TokenType)
+
+BLOCK_ANNOTATION_START = "%{"
+BLOCK_ANNOTATION_END = "%}"
+
+
+def scan(code):
+    """
+    yield (token type, token text, start offset) for every token of the code
+    the regex only recognizes single-line annotations, a "%{" line is then extended here to its "%}" line,
+    an unterminated block annotation extends to the end of the code
+    """
+    match = TOKEN_REGEX.match
+    token_types = TOKEN_TYPES
+    annotation = TokenType.ANNOTATION
+    position = 0
+    length = len(code)
+    while position < length:
+        m = match(code, position)
+        token_type = token_types[m.lastindex]
+        end = m.end()
+        if token_type is annotation and end - position == 2 and code[position+1] == '{' \
+                and (position == 0 or code[position-1] == '\n'):
+            end = scan_block_annotation(code, end)
+        yield token_type, code[position:end], position
+        position = end
+
+
+def scan_block_annotation(code, position):
+    """
+    return the end offset of the block annotation whose "%{" line ends at position
+    the terminator is a line consisting of "%}" only, every character is visited at most once
+    """
+    target = '\n' + BLOCK_ANNOTATION_END
+    while True:
+        position = code.find(target, position)
+        if position < 0:
+            return len(code)
+        position += len(target)
+        if position == len(code) or code[position] == '\n':
+            return position
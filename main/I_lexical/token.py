@@ -1,4 +1,6 @@
 class Token:
+    __slots__ = ('type', 'text', 'row', 'col')
+
     def __init__(self, t_type=None, t_text=None, row=None, col=None):
         self.type = t_type
         self.text = t_text
@@ -11,7 +11,7 @@ class TokenType(Enum):
 
     KEYWORD = "break|case|catch|classdef|continue|elseif|else|end|for|function|global|if|otherwise|parfor|persistent" \
               "|return|spmd|switch|try|while"
-    NUMBER_LIT = rf"({NUMBER})[eE][+-]?[0-9]+|{NUMBER}"
+    NUMBER_LIT = rf"(?:{NUMBER})[eE][+-]?[0-9]+|{NUMBER}"
     STRING_LIT = r"\"[^\"\n]*\""
     VECTOR_LIT = r"\'[^\'\n]*\'"
     IDENTIFIER = r"[a-zA-Z]+[a-zA-Z0-9_]*"
@@ -44,7 +44,7 @@ class TokenType(Enum):
     R_BRACKET = r"]"
     L_BRACE = r"{"
     R_BRACE = r"}"
-    ANNOTATION = r"(?<![^\n])%{(?![^\n])[\s\S]*((?<![^\n])%}(?![^\n]))?|%.*"
+    ANNOTATION = r"%.*"  # "%{ ... %}" blocks are completed by the scanner
     EXCLAMATION = r"!"
     QUESTION = r"\?"
     WHITESPACE = r"[ \f\r\t\v]+"  # \s excluding \n
@@ -0,0 +1,50 @@
+import marshal
+import pickle
+from main.II_syntactic.node import ASTNode
+from main.III_semantic.vectorization import VectorizedLoop
+from main.III_semantic.data_types.array import Array
+from main.III_semantic.data_types.storage import to_list
+from main.III_semantic.data_types.array_data.char import Char
+from main.III_semantic.data_types.array_data.string import String
+from main.III_semantic.data_types.array_data.logical import Logical
+from main.III_semantic.data_types.array_data.numeric_data.decimal_data.double import Double
+
+
+ARRAY_CLASSES = {cls.__name__: cls for cls in (Char, String, Logical, Double)}
+
+# constants of the pool which are pickled
+PICKLED = (VectorizedLoop, ASTNode)
+
+
+class CodeObject:
+    """
+    compiled program: instruction tuples (opcode, a, b, c), constant pool, name table,
+    source line of every instruction and the number of registers the program needs
+    """
+
+    def __init__(self, instructions=None, constants=None, names=None, lines=None, num_registers=0):
+        self.instructions = instructions if instructions else []
+        self.constants = constants if constants else []
+        self.names = names if names else []
+        self.lines = lines if lines else []
+        self.num_registers = num_registers
+
+    def dumps(self):
+        """
+        serialize the program into bytes, arrays in the constant pool are stored by class name, data and size, the
+        vectorized loops and the clauses of the traced loops are pickled like the cached tree
+        """
+        constants = [('array', c.get_class_name(), to_list(c.data), c.size) if isinstance(c, Array) else
+                     ('pickle', pickle.dumps(c, protocol=pickle.HIGHEST_PROTOCOL)) if isinstance(c, PICKLED) else
+                     ('value', c)
+                     for c in self.constants]
+        return marshal.dumps((self.instructions, constants, self.names, self.lines, self.num_registers))
+
+    @staticmethod
+    def loads(data):
+        instructions, constants, names, lines, num_registers = marshal.loads(data)
+        constants = [ARRAY_CLASSES[c[1]](c[2], size=c[3]) if c[0] == 'array' else
+                     pickle.loads(c[1]) if c[0] == 'pickle' else c[1]
+                     for c in constants]
+        return CodeObject([tuple(instruction) for instruction in instructions],
+                          constants, names, lines, num_registers)
@@ -0,0 +1,454 @@
+from main.II_syntactic.node_types import ASTNodeType
+from main.III_semantic.interpreter import match_self_append
+from main.III_semantic.fusion import fusible, is_element_wise
+from main.III_semantic.inference import infer, specialization, KERNEL_NAMES
+from main.III_semantic.dispatch import case_segments
+from main.III_semantic.operations import MATRIX_OPERATORS, ARITHMETIC_OPERATORS, RELATIONAL_OPERATORS
+from main.III_semantic.data_types.array_data.char import Char
+from main.III_semantic.data_types.array_data.string import String
+from main.III_semantic.data_types.array_data.numeric_data.decimal_data.double import Double
+from main.V_bytecode.code import CodeObject
+from main.V_bytecode.opcodes import OpCode
+
+
+BINARY_OPERATORS = tuple(MATRIX_OPERATORS) + tuple(ARITHMETIC_OPERATORS) + tuple(RELATIONAL_OPERATORS)
+
+
+class BytecodeCompiler:
+    """
+    compile an abstract syntax tree into a CodeObject
+
+    registers are allocated like a stack: an expression compiled into register r only uses registers above r
+    for its temporaries, so the operands of an operation sit in consecutive registers.
+    every instruction records the line of the innermost node that reports semantic errors with its own line
+    (operations, colon expressions, array lists and identifiers), exactly like the try blocks of the tree walking
+    Interpreter.
+    """
+
+    def __init__(self, builtins, variables=None):
+        self.builtins = builtins
+        self.variables = variables
+        # types of the expressions of the tree, see inference.py
+        self.types = {}
+        # invariant expression: register holding its value in the current execution of its loop, or None
+        self.invariants = {}
+        self.code = CodeObject()
+        self.constant_index = {}
+        self.name_index = {}
+        self.next_register = 0
+        self.line = 0
+        self.loops = []  # (continue target, list of break jumps to patch) of the enclosing loops
+        self.statement_compilers = {
+            ASTNodeType.STMT_LIST: self.compile_statement_list,
+            ASTNodeType.EXP_STMT: self.compile_expression_statement,
+            ASTNodeType.SEL_STMT: self.compile_selection_statement,
+            ASTNodeType.ITR_STMT: self.compile_iteration_statement,
+            ASTNodeType.JMP_STMT: self.compile_jump_statement,
+            ASTNodeType.HOIST_STMT: self.compile_hoisting_statement,
+            ASTNodeType.VECTOR_STMT: self.compile_vectorized_statement,
+        }
+        self.expression_compilers = {
+            ASTNodeType.CLN_EXP: self.compile_colon_expression,
+            ASTNodeType.UOP_EXP: self.compile_unary_operation_expression,
+            ASTNodeType.BOP_EXP: self.compile_binary_operation_expression,
+            ASTNodeType.NUMBER_LIT_EXP: self.compile_number_literal_expression,
+            ASTNodeType.STRING_LIT_EXP: self.compile_string_literal_expression,
+            ASTNodeType.VECTOR_LIT_EXP: self.compile_vector_literal_expression,
+            ASTNodeType.ARRAY_LIST_EXP: self.compile_array_list_expression,
+            ASTNodeType.IDENTIFIER_EXP: self.compile_identifier_expression,
+            ASTNodeType.CONSTANT_EXP: self.compile_constant_expression,
+            ASTNodeType.INVARIANT_EXP: self.compile_invariant_expression,
+        }
+
+    def compile(self, lst):
+        self.types = infer(lst, self.builtins, self.variables)
+        self.compile_statement_list(lst)
+        return self.code
+
+    # helpers
+    def emit(self, opcode, a=0, b=0, c=0):
+        self.code.instructions.append((int(opcode), a, b, c))
+        self.code.lines.append(self.line)
+        return len(self.code.instructions) - 1
+
+    def patch(self, index, **operands):
+        opcode, a, b, c = self.code.instructions[index]
+        self.code.instructions[index] = (opcode, operands.get('a', a), operands.get('b', b), operands.get('c', c))
+
+    def here(self):
+        return len(self.code.instructions)
+
+    def constant(self, value, key=None):
+        key = (type(value), value) if key is None else key
+        if key not in self.constant_index:
+            self.constant_index[key] = len(self.code.constants)
+            self.code.constants.append(value)
+        return self.constant_index[key]
+
+    def name(self, name):
+        if name not in self.name_index:
+            self.name_index[name] = len(self.code.names)
+            self.code.names.append(name)
+        return self.name_index[name]
+
+    def allocate(self):
+        register = self.next_register
+        self.next_register += 1
+        self.code.num_registers = max(self.code.num_registers, self.next_register)
+        return register
+
+    def free(self, register):
+        # registers are released in the reverse order of their allocation
+        self.next_register = register
+
+    # statements
+    def compile_statement(self, stmt):
+        self.statement_compilers[stmt.get_type()](stmt)
+
+    def compile_statement_list(self, lst):
+        for child in lst.get_children():
+            self.compile_statement(child)
+
+    def compile_expression_statement(self, stmt):
+        expression = stmt.get_child(0)
+        appended = None
+        target = None
+        if expression.get_type() == ASTNodeType.ASS_EXP:
+            var = expression.get_child(0).get_text()
+            appended = match_self_append(expression)
+            if expression.get_child(0).get_children():
+                target = expression.get_child(0)
+            expression = expression.get_child(1)
+        elif expression.get_type() == ASTNodeType.IDENTIFIER_EXP and expression.get_children() == [] \
+                and expression.get_text() not in self.builtins:
+            # calling builtin function always result in 'ans', although sometime it looks like retrieval a variable
+            var = expression.get_text()
+        else:
+            var = "ans"
+        register = self.allocate()
+        if target:
+            self.compile_indexed_assignment(target, expression, register)
+        elif appended:
+            self.compile_self_append(var, expression, *appended, register)
+        else:
+            self.compile_expression(expression, register)
+        self.emit(OpCode.STORE_SLOT, self.name(var), register)
+        if stmt.get_child(1).get_text() != ';':
+            self.emit(OpCode.DISPLAY, self.name(var), register)
+        self.free(register)
+
+    def compile_selection_statement(self, stmt):
+        clauses = stmt.get_children()[:-1]
+        end_jumps = []
+        if stmt.get_text() == 'if':
+            for clause in clauses:
+                if clause.get_text() == 'else':
+                    self.compile_statement_list(clause.get_child(0))
+                    continue
+                register = self.allocate()
+                self.compile_expression(clause.get_child(0), register)
+                next_jump = self.emit(OpCode.JUMP_IF_FALSE, register)
+                self.free(register)
+                self.compile_statement_list(clause.get_child(1))
+                if clause is not clauses[-1]:
+                    end_jumps.append(self.emit(OpCode.JUMP))
+                self.patch(next_jump, b=self.here())
+        else:
+            switch = self.allocate()
+            self.compile_expression(clauses[0].get_child(0), switch)
+            cases = [clause for clause in clauses[1:] if clause.get_text() == 'case']
+            for segment in case_segments(cases):
+                if isinstance(segment, dict):
+                    # the table jumps to the bodies of the constant cases, which follow it
+                    table_jump = self.emit(OpCode.SWITCH, switch)
+                    targets = {}
+                    for position in sorted(set(segment.values())):
+                        targets[position] = self.here()
+                        self.compile_statement_list(cases[position].get_child(1))
+                        end_jumps.append(self.emit(OpCode.JUMP))
+                    table = {key: targets[position] for key, position in segment.items()}
+                    self.patch(table_jump, b=self.constant(table, key=(dict, table_jump)), c=self.here())
+                    continue
+                clause = cases[segment]
+                register = self.allocate()
+                self.compile_expression(clause.get_child(0), register)
+                self.emit(OpCode.CASE_EQUAL, register, switch)
+                next_jump = self.emit(OpCode.JUMP_IF_FALSE, register)
+                self.free(register)
+                self.compile_statement_list(clause.get_child(1))
+                if clause is not clauses[-1]:
+                    end_jumps.append(self.emit(OpCode.JUMP))
+                self.patch(next_jump, b=self.here())
+            if clauses[-1].get_text() == 'otherwise':
+                self.compile_statement_list(clauses[-1].get_child(0))
+            self.free(switch)
+        for jump in end_jumps:
+            self.patch(jump, a=self.here())
+
+    def compile_iteration_statement(self, stmt):
+        clause = stmt.get_child()
+        expression = clause.get_child(0)
+        # every iteration starts with TRACE, counting the iterations in the register after the iterator of a for loop
+        if clause.get_text() == 'while':
+            counter = self.allocate()
+            self.emit(OpCode.LOAD_CONST, counter, self.constant(0))
+            start = self.emit(OpCode.TRACE, counter, self.constant(clause))
+            register = self.allocate()
+            self.compile_expression(expression, register)
+            exit_jump = self.emit(OpCode.JUMP_IF_FALSE, register)
+            self.free(register)
+            break_jumps = self.compile_loop_body(clause.get_child(1), start)
+            self.emit(OpCode.JUMP, start)
+            self.patch(exit_jump, b=self.here())
+            self.free(counter)
+        else:
+            iterator = self.allocate()
+            self.compile_expression(expression.get_child(1), iterator)
+            counter = self.allocate()
+            name = self.name(expression.get_child(0).get_text())
+            self.emit(OpCode.FOR_PREP, iterator, iterator, name)
+            self.emit(OpCode.LOAD_CONST, counter, self.constant(0))
+            start = self.emit(OpCode.TRACE, counter, self.constant(clause))
+            next_column = self.emit(OpCode.FOR_NEXT, iterator, name)
+            break_jumps = self.compile_loop_body(clause.get_child(1), start)
+            self.emit(OpCode.JUMP, start)
+            self.patch(next_column, c=self.here())
+            self.free(iterator)
+        self.patch(start, c=self.here())
+        for jump in break_jumps:
+            self.patch(jump, a=self.here())
+
+    def compile_loop_body(self, lst, continue_target):
+        """
+        return the jumps of the break statements of the body, they are patched to the loop exit by the caller
+        """
+        break_jumps = []
+        self.loops.append((continue_target, break_jumps))
+        self.compile_statement_list(lst)
+        self.loops.pop()
+        return break_jumps
+
+    def compile_hoisting_statement(self, stmt):
+        # the registers of the values stay reserved while the loop runs
+        invariants = stmt.get_invariants()
+        for invariant in invariants:
+            self.invariants[invariant] = self.allocate()
+            self.emit(OpCode.LOAD_CONST, self.invariants[invariant], self.constant(None))
+        self.compile_statement(stmt.get_child())
+        if invariants:
+            self.free(self.invariants[invariants[0]])
+
+    def compile_vectorized_statement(self, stmt):
+        plan = stmt.get_plan()
+        slots = tuple(self.name(name) for name in plan.names)
+        jump = self.emit(OpCode.VECTORIZE, self.constant(plan), self.constant(slots))
+        self.compile_statement(stmt.get_child())
+        self.patch(jump, c=self.here())
+
+    def compile_jump_statement(self, stmt):
+        continue_target, break_jumps = self.loops[-1]
+        if stmt.get_text() == 'break':
+            break_jumps.append(self.emit(OpCode.JUMP))
+        else:
+            self.emit(OpCode.JUMP, continue_target)
+
+    # expressions
+    def compile_expression(self, exp, register):
+        self.expression_compilers[exp.get_type()](exp, register)
+
+    def compile_with_line(self, exp, register, compiler):
+        outer_line = self.line
+        self.line = exp.get_line()
+        compiler(exp, register)
+        self.line = outer_line
+
+    def compile_unary_operation_expression(self, exp, register):
+        if fusible(exp):
+            self.compile_fused(exp, register)
+            return
+
+        def compiler(node, target):
+            operator = node.get_text()
+            self.compile_expression(node.get_child(0), target)
+            if operator in ('.\'', '\''):
+                self.emit(OpCode.TRANSPOSE, target, target)
+            elif operator in ('+', '-'):
+                self.emit(OpCode.SIGN, target, target, self.constant(operator))
+            else:
+                self.emit(OpCode.NOT, target, target)
+        self.compile_with_line(exp, register, compiler)
+
+    def compile_binary_operation_expression(self, exp, register):
+        kernel = specialization(exp, self.types, fusible(exp))
+        if kernel is not None:
+            self.compile_specialized(exp, register, kernel)
+            return
+        if fusible(exp):
+            self.compile_fused(exp, register)
+            return
+
+        def compiler(node, target):
+            operator = node.get_text()
+            if operator in ('&&', '||'):
+                # https://ww2.mathworks.cn/help/matlab/ref/logicaloperatorsshortcircuit.html#bt_0nai-1
+                self.compile_expression(node.get_child(0), target)
+                self.emit(OpCode.TEST_LOGICAL, target, target)
+                shortcut = self.emit(OpCode.JUMP_IF_TRUE if operator == '||' else OpCode.JUMP_IF_FALSE, target)
+                self.compile_expression(node.get_child(1), target)
+                self.emit(OpCode.TEST_LOGICAL, target, target)
+                self.patch(shortcut, b=self.here())
+                return
+            self.compile_expression(node.get_child(0), target)
+            operand = self.allocate()
+            self.compile_expression(node.get_child(1), operand)
+            self.emit(OpCode.BINARY, target, operand, BINARY_OPERATORS.index(operator))
+            self.free(operand)
+        self.compile_with_line(exp, register, compiler)
+
+    def compile_specialized(self, exp, register, kernel):
+        def compiler(node, target):
+            self.compile_expression(node.get_child(0), target)
+            operand = self.allocate()
+            self.compile_expression(node.get_child(1), operand)
+            self.emit(OpCode.KERNEL, target, operand, KERNEL_NAMES.index(kernel))
+            self.free(operand)
+        self.compile_with_line(exp, register, compiler)
+
+    def compile_fused(self, exp, register):
+        self.compile_deferred(exp, register)
+        self.emit(OpCode.FORCE, register)
+
+    def compile_deferred(self, exp, register):
+        """
+        the element-wise operators of the tree of exp as Lazy nodes, see fusion.py
+        """
+        if not is_element_wise(exp) or exp.get_type() == ASTNodeType.BOP_EXP and specialization(exp, self.types, True):
+            self.compile_expression(exp, register)
+            return
+
+        def compiler(node, target):
+            operator = node.get_text()
+            if node.get_type() == ASTNodeType.UOP_EXP:
+                self.compile_deferred(node.get_child(0), target)
+                self.emit(OpCode.DEFER_SIGN, target, target, self.constant(operator))
+                return
+            self.compile_deferred(node.get_child(0), target)
+            operand = self.allocate()
+            self.compile_deferred(node.get_child(1), operand)
+            self.emit(OpCode.DEFER, target, operand, BINARY_OPERATORS.index(operator))
+            self.free(operand)
+        self.compile_with_line(exp, register, compiler)
+
+    def compile_colon_expression(self, exp, register):
+        if exp.num_children() == 0:
+            self.emit(OpCode.LOAD_CONST, register, self.constant(":"))
+            return
+
+        def compiler(node, target):
+            self.compile_expression(node.get_child(0), target)
+            operands = []
+            for child in node.get_children()[1:]:
+                operands.append(self.allocate())
+                self.compile_expression(child, operands[-1])
+            self.emit(OpCode.RANGE, target, node.num_children())
+            self.free(operands[0])
+        self.compile_with_line(exp, register, compiler)
+
+    def compile_number_literal_expression(self, exp, register):
+        value = Double([exp.get_text()])
+        self.emit(OpCode.LOAD_LITERAL, register, self.constant(value, key=(Double, value[0])))
+
+    def compile_string_literal_expression(self, exp, register):
+        value = String([exp.get_text().replace('""', '"')])
+        self.emit(OpCode.LOAD_LITERAL, register, self.constant(value, key=(String, value[0])))
+
+    def compile_vector_literal_expression(self, exp, register):
+        value = Char([ord(c) for c in exp.get_text().replace("''", "'")])
+        self.emit(OpCode.LOAD_LITERAL, register, self.constant(value, key=(Char, tuple(value))))
+
+    def compile_constant_expression(self, exp, register):
+        # equal constants already share their value, see constant_folding.py
+        value = exp.get_value()
+        self.emit(OpCode.LOAD_LITERAL, register, self.constant(value, key=(value.get_class(), id(value))))
+
+    def compile_invariant_expression(self, exp, register):
+        value = self.invariants[exp]
+        load = self.emit(OpCode.LOAD_INVARIANT, register, value)
+        self.compile_expression(exp.get_child(), register)
+        self.emit(OpCode.STORE_INVARIANT, register, value)
+        self.patch(load, c=self.here())
+
+    def compile_array_list_expression(self, exp, register):
+        def compiler(node, target):
+            # elements are compiled into consecutive registers starting from target
+            row_lengths = []
+            length = 0
+            registers = []
+            for child in node.get_children():
+                if child.get_type() == ASTNodeType.EO_STMT:
+                    if child.get_text() == ';' or child.get_text() == '\n':
+                        if length:
+                            row_lengths.append(length)
+                            length = 0
+                else:
+                    element = target if not registers else self.allocate()
+                    registers.append(element)
+                    self.compile_expression(child, element)
+                    length += 1
+            if length:
+                row_lengths.append(length)
+            row_lengths = tuple(row_lengths)
+            self.emit(OpCode.BUILD_ARRAY, target, self.constant(row_lengths))
+            if len(registers) > 1:
+                self.free(registers[1])
+        self.compile_with_line(exp, register, compiler)
+
+    def compile_self_append(self, var, exp, direction, nodes, register):
+        def compiler(node, target):
+            self.compile_with_line(node.get_child(0), target,
+                                   lambda _, t: self.emit(OpCode.LOAD_OWNED, t, self.name(var)))
+            operands = []
+            for element in nodes:
+                operand = self.allocate()
+                operands.append(operand)
+                self.compile_expression(element, operand)
+            self.emit(OpCode.APPEND, target, len(operands), self.constant(direction))
+            self.free(operands[0])
+        self.compile_with_line(exp, register, compiler)
+
+    def compile_indexed_assignment(self, target, exp, register):
+        self.compile_expression(exp, register)
+
+        def compiler(node, value):
+            arguments = []
+            for argument in node.get_child(0).get_children():
+                operand = self.allocate()
+                arguments.append(operand)
+                self.compile_expression(argument, operand)
+            self.emit(OpCode.STORE_INDEXED, value, len(arguments), self.name(node.get_text()))
+            if arguments:
+                self.free(arguments[0])
+        self.compile_with_line(target, register, compiler)
+
+    def compile_identifier_expression(self, exp, register):
+        def compiler(node, target):
+            name = self.name(node.get_text())
+            if not node.get_children():
+                self.emit(OpCode.GET_SLOT, target, name)
+                return
+            self.emit(OpCode.LOAD_SLOT, target, name)
+            child = node.get_child(0)
+            arguments = []
+            for argument in child.get_children():
+                # every argument is allocated only when compiled, so that the arguments stay consecutive
+                operand = self.allocate()
+                arguments.append(operand)
+                if child.get_type() == ASTNodeType.INDEX_LIST_EXP:
+                    self.compile_expression(argument, operand)
+                else:
+                    value = String([argument.get_text()])
+                    self.emit(OpCode.LOAD_LITERAL, operand, self.constant(value, key=(String, value[0])))
+            self.emit(OpCode.CALL, target, len(arguments))
+            if arguments:
+                self.free(arguments[0])
+        self.compile_with_line(exp, register, compiler)
@@ -0,0 +1,52 @@
+from main.III_semantic.data_types.array import Array
+from main.III_semantic.data_types.storage import to_list
+from main.III_semantic.inference import KERNEL_NAMES
+from main.V_bytecode.compiler import BINARY_OPERATORS
+from main.V_bytecode.opcodes import OpCode
+
+
+def describe_constant(value):
+    if isinstance(value, Array):
+        return f"{value.get_class_name()}({to_list(value.data)})"
+    return repr(value)
+
+
+# readable form of the operands which are not plain registers, see the comments of OpCode
+DESCRIPTIONS = {
+    OpCode.LOAD_CONST: lambda code, a, b, c: describe_constant(code.constants[b]),
+    OpCode.LOAD_LITERAL: lambda code, a, b, c: describe_constant(code.constants[b]),
+    OpCode.LOAD_SLOT: lambda code, a, b, c: code.names[b],
+    OpCode.GET_SLOT: lambda code, a, b, c: code.names[b],
+    OpCode.STORE_SLOT: lambda code, a, b, c: code.names[a],
+    OpCode.DISPLAY: lambda code, a, b, c: code.names[a],
+    OpCode.BINARY: lambda code, a, b, c: BINARY_OPERATORS[c],
+    OpCode.SIGN: lambda code, a, b, c: code.constants[c],
+    OpCode.BUILD_ARRAY: lambda code, a, b, c: f"rows {code.constants[b]}",
+    OpCode.JUMP: lambda code, a, b, c: f"to {a}",
+    OpCode.JUMP_IF_FALSE: lambda code, a, b, c: f"to {b}",
+    OpCode.JUMP_IF_TRUE: lambda code, a, b, c: f"to {b}",
+    OpCode.FOR_PREP: lambda code, a, b, c: code.names[c],
+    OpCode.FOR_NEXT: lambda code, a, b, c: f"{code.names[b]}, exit to {c}",
+    OpCode.LOAD_OWNED: lambda code, a, b, c: code.names[b],
+    OpCode.APPEND: lambda code, a, b, c: code.constants[c],
+    OpCode.STORE_INDEXED: lambda code, a, b, c: code.names[c],
+    OpCode.DEFER: lambda code, a, b, c: BINARY_OPERATORS[c],
+    OpCode.DEFER_SIGN: lambda code, a, b, c: code.constants[c],
+    OpCode.KERNEL: lambda code, a, b, c: KERNEL_NAMES[c],
+    OpCode.LOAD_INVARIANT: lambda code, a, b, c: f"held, skip to {c}",
+    OpCode.VECTORIZE: lambda code, a, b, c: f"{', '.join(code.names[i] for i in code.constants[b])}, skip to {c}",
+    OpCode.TRACE: lambda code, a, b, c: f"{code.constants[b].get_text()} loop, exit to {c}",
+    OpCode.SWITCH: lambda code, a, b, c: f"{len(code.constants[b])} cases, else to {c}",
+}
+
+
+class CodePrinter:
+    @staticmethod
+    def print(code):
+        print()
+        print(f"registers: {code.num_registers}, constants: {len(code.constants)}, names: {len(code.names)}")
+        for index, (line, (op, a, b, c)) in enumerate(zip(code.lines, code.instructions)):
+            opcode = OpCode(op)
+            description = DESCRIPTIONS[opcode](code, a, b, c) if opcode in DESCRIPTIONS else ""
+            print(f"{index:>6} {line:>6}  {opcode.name:<16}{a:>4}{b:>4}{c:>4}  {description}".rstrip())
+        print()
@@ -0,0 +1,63 @@
+from enum import IntEnum
+
+
+class OpCode(IntEnum):
+    """
+    instructions of the register based virtual machine, every instruction is a tuple (opcode, a, b, c)
+    registers are written r, constant pool entries k, name table entries n and instruction indexes t
+    """
+
+    # loads and stores, every name n[i] of the code is the variable slot i, see BytecodeInterpreter.execute
+    LOAD_CONST = 0      # r[a] = k[b]                                   (immutable constants only)
+    LOAD_LITERAL = 1    # r[a] = fresh copy of the literal array k[b]
+    LOAD_SLOT = 2       # r[a] = slot b, or the builtin n[b] while the slot is unbound
+    GET_SLOT = 3        # r[a] = (slot b or builtin n[b])([])           (identifier without index list)
+    CALL = 4            # r[a] = r[a]([r[a+1], ..., r[a+b]])
+    STORE_SLOT = 5      # slot a = r[b]
+    DISPLAY = 6         # print variable n[a] holding r[b]
+
+    # operations
+    BINARY = 7          # r[a] = BINARY_OPERATORS[c](r[a], r[b])
+    TRANSPOSE = 8       # r[a] = r[b].'
+    SIGN = 9            # r[a] = (+ or - according to k[c]) r[b]
+    NOT = 10            # r[a] = ~r[b]
+    TEST_LOGICAL = 11   # r[a] = logical scalar of r[b]                 (operands of && and ||)
+    CASE_EQUAL = 12     # r[a] = r[a] == r[b]                           (python bool)
+    RANGE = 13          # r[a] = r[a]:r[a+1]          or r[a]:r[a+1]:r[a+2] if b == 3
+    BUILD_ARRAY = 14    # r[a] = concatenation of r[a] ... by the row lengths k[b]
+
+    # control flow
+    JUMP = 15           # goto t[a]
+    JUMP_IF_FALSE = 16  # if not r[a]: goto t[b]
+    JUMP_IF_TRUE = 17   # if r[a]: goto t[b]
+    FOR_PREP = 18       # r[a] = iterator over the columns of r[b], slot c = empty r[b] when it has no columns
+    FOR_NEXT = 19       # slot b = next column of r[a], goto t[c] when exhausted
+
+    # accumulation idiom x = [x, v] and x = [x; v]
+    LOAD_OWNED = 20     # r[a] = slot b without handing it out, like GET_SLOT while the slot is unbound
+    APPEND = 21         # r[a] = r[a] grown by r[a+1] ... r[a+b] in the direction k[c], in place when possible
+
+    # indexed assignment x(i, j) = v
+    STORE_INDEXED = 22  # r[a] = slot c with r[a] written at the index list r[a+1] ... r[a+b], see assign
+
+    # fused element-wise expressions, see fusion.py
+    DEFER = 23          # r[a] = deferred BINARY_OPERATORS[c](r[a], r[b])
+    DEFER_SIGN = 24     # r[a] = deferred (+ or - according to k[c]) r[b]
+    FORCE = 25          # r[a] = array of the deferred r[a]
+
+    # operations of operands of known types, see inference.py
+    KERNEL = 26         # r[a] = KERNELS[KERNEL_NAMES[c]](r[a], r[b])
+
+    # invariant expressions of loops, see loop_optimization.py
+    LOAD_INVARIANT = 27     # if r[b] holds the value of the invariant: r[a] = r[b], goto t[c]
+    STORE_INVARIANT = 28    # r[b] = r[a], handed out by every following LOAD_INVARIANT
+
+    # loops running as whole-array operations, see vectorization.py
+    VECTORIZE = 29      # run the VectorizedLoop k[a] on the slots k[b] and goto t[c], unless it falls back to the loop
+
+    # hot loops compiled for the types of their variables, see tracing.py
+    TRACE = 30          # count an iteration of the loop k[b] in r[a], when it is hot run the rest of it compiled and
+                        # goto t[c], unless it is left to the machine, r[a-1] holds the columns left of a for loop
+
+    # consecutive constant cases of switch statements, see dispatch.py
+    SWITCH = 31         # goto the target of the key of r[a] in the table k[b], or goto t[c] when it has no such key
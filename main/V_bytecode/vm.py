@@ -0,0 +1,233 @@
+from functools import partial
+from main.III_semantic.interpreter import Interpreter, display
+from main.III_semantic.utils import concatenate, append, assign, share, empty_columns
+from main.III_semantic.operations import *
+from main.III_semantic.fusion import defer, defer_sign, force
+from main.III_semantic.inference import counted, KERNELS, KERNEL_NAMES
+from main.III_semantic.literals import copy_literal
+from main.III_semantic.tracing import HOT_ITERATIONS
+from main.III_semantic.dispatch import case_key
+from main.V_bytecode.compiler import BytecodeCompiler, BINARY_OPERATORS
+from main.V_bytecode.opcodes import OpCode
+from main.exceptions.iii_semantic_exceptions import *
+
+
+def relational(operator):
+    def operation(operand_0, operand_1):
+        return evaluate_relational_operations(operand_0, operand_1, operator)
+    return operation
+
+
+# functions of the BINARY instruction, in the order of BINARY_OPERATORS
+BINARY_FUNCTIONS = tuple(
+    MATRIX_OPERATORS[operator] if operator in MATRIX_OPERATORS else
+    ARITHMETIC_OPERATORS[operator] if operator in ARITHMETIC_OPERATORS else
+    relational(operator)
+    for operator in BINARY_OPERATORS
+)
+
+# functions of the DEFER instruction, in the order of BINARY_OPERATORS
+DEFER_FUNCTIONS = tuple(partial(defer, operator) for operator in BINARY_OPERATORS)
+
+# functions of the KERNEL instruction, in the order of KERNEL_NAMES
+KERNEL_FUNCTIONS = tuple(KERNELS[name] for name in KERNEL_NAMES)
+
+
+def counted_functions(functions, operators, specialized):
+    return tuple(counted(fun, operator, specialized) for fun, operator in zip(functions, operators))
+
+
+def build_array(elements, row_lengths):
+    array_list = []
+    position = 0
+    for length in row_lengths:
+        array = [data for data in elements[position:position+length] if len(data)]
+        position += length
+        if array:
+            array_list.append(array)
+
+    if array_list:
+        return concatenate([concatenate(array, "horz") for array in array_list], "vert")
+    else:
+        return Double([], size=(0, 0))
+
+
+def column_iterator(data):
+    cls = data.get_class()
+    for col in data.cols():
+        yield cls(col, size=(len(col), 1))
+
+
+# marks a slot whose variable is not assigned, and a name which is no builtin either
+UNBOUND = object()
+
+
+def resolve(code, variables, builtins):
+    """
+    bind every name of the code to a slot: the value of the workspace variable, or UNBOUND if there is none yet,
+    and the builtin a load falls back to while the slot is unbound, so no name is looked up while executing
+    """
+    slots = [variables.get(name, UNBOUND) for name in code.names]
+    fallbacks = [builtins[name] if name in builtins else UNBOUND for name in code.names]
+    return slots, fallbacks
+
+
+class BytecodeInterpreter(Interpreter):
+    """
+    execution engine compiling the abstract syntax tree with BytecodeCompiler and running it on a register machine
+    variables live in the slots of the code while it runs, self.variables is the named workspace between runs
+    """
+
+    def interpret_statement_list(self, lst):
+        self.execute(BytecodeCompiler(self.builtins, self.variables).compile(lst))
+
+    def execute(self, code):
+        variables = self.variables
+        instructions = code.instructions
+        constants = code.constants
+        names = code.names
+        slots, fallbacks = resolve(code, variables, self.builtins)
+        registers = [None] * code.num_registers
+        tracer = self.tracer
+        # the functions count their calls while the specialization hit rates are reported, see inference.py
+        binary_functions = counted_functions(BINARY_FUNCTIONS, BINARY_OPERATORS, False)
+        deferred_functions = counted_functions(DEFER_FUNCTIONS, BINARY_OPERATORS, False)
+        kernel_functions = counted_functions(KERNEL_FUNCTIONS, (name.split()[1] for name in KERNEL_NAMES), True)
+
+        LOAD_CONST, LOAD_LITERAL, LOAD_SLOT, GET_SLOT, CALL, STORE_SLOT, DISPLAY, BINARY, TRANSPOSE, SIGN, NOT, \
+            TEST_LOGICAL, CASE_EQUAL, RANGE, BUILD_ARRAY, JUMP, JUMP_IF_FALSE, JUMP_IF_TRUE, FOR_PREP, FOR_NEXT, \
+            LOAD_OWNED, APPEND, STORE_INDEXED, DEFER, DEFER_SIGN, FORCE, KERNEL, \
+            LOAD_INVARIANT, STORE_INVARIANT, VECTORIZE, TRACE, SWITCH = (int(opcode) for opcode in OpCode)
+
+        pc = 0
+        end = len(instructions)
+        try:
+            while pc < end:
+                op, a, b, c = instructions[pc]
+                pc += 1
+                if op == KERNEL:
+                    registers[a] = kernel_functions[c](registers[a], registers[b])
+                elif op == BINARY:
+                    registers[a] = binary_functions[c](registers[a], registers[b])
+                elif op == GET_SLOT:
+                    value = slots[b]
+                    if value is UNBOUND:
+                        value = fallbacks[b]
+                        if value is UNBOUND:
+                            raise RecognitionError(repr(names[b]))
+                    registers[a] = value([])
+                elif op == LOAD_LITERAL:
+                    # assignments may grow the array of their variable in place, so every evaluation gets its own array
+                    registers[a] = copy_literal(constants[b])
+                elif op == STORE_SLOT:
+                    slots[a] = registers[b]
+                elif op == JUMP_IF_FALSE:
+                    if not registers[a]:
+                        pc = b
+                elif op == JUMP:
+                    pc = a
+                elif op == FOR_NEXT:
+                    column = next(registers[a], None)
+                    if column is None:
+                        pc = c
+                    else:
+                        slots[b] = column
+                elif op == TRACE:
+                    registers[a] += 1
+                    if registers[a] == HOT_ITERATIONS and tracer is not None:
+                        clause = constants[b]
+                        # the loop runs on the variables it names, which are written back to their slots
+                        loop_names = [name for group in tracer.names_of(clause) for name in group]
+                        indexes = [names.index(name) for name in loop_names]
+                        workspace = {name: slots[i] for name, i in zip(loop_names, indexes) if slots[i] is not UNBOUND}
+                        if tracer.run(clause, workspace, registers[a - 1] if clause.get_text() == 'for' else None):
+                            for name, i in zip(loop_names, indexes):
+                                if name in workspace:
+                                    slots[i] = workspace[name]
+                            pc = c
+                elif op == DISPLAY:
+                    display(names[a], registers[b])
+                elif op == JUMP_IF_TRUE:
+                    if registers[a]:
+                        pc = b
+                elif op == LOAD_SLOT:
+                    value = slots[b]
+                    if value is UNBOUND:
+                        value = fallbacks[b]
+                        if value is UNBOUND:
+                            raise RecognitionError(repr(names[b]))
+                    registers[a] = value
+                elif op == CALL:
+                    registers[a] = registers[a](registers[a+1:a+1+b])
+                elif op == TEST_LOGICAL:
+                    operand = registers[b]
+                    if len(operand) > 1:
+                        raise ConversionError1()
+                    registers[a] = Logical.scalar(Logical.convert(operand[0]))
+                elif op == CASE_EQUAL:
+                    registers[a] = registers[a] == registers[b]
+                elif op == SWITCH:
+                    pc = constants[b].get(case_key(registers[a]), c)
+                elif op == RANGE:
+                    if b == 2:
+                        registers[a] = evaluate_colon_operation(registers[a][0], 1, registers[a+1][0])
+                    else:
+                        registers[a] = evaluate_colon_operation(registers[a][0], registers[a+1][0], registers[a+2][0])
+                elif op == BUILD_ARRAY:
+                    row_lengths = constants[b]
+                    registers[a] = build_array(registers[a:a+sum(row_lengths)], row_lengths)
+                elif op == TRANSPOSE:
+                    registers[a] = evaluate_transpose_operation(registers[b])
+                elif op == SIGN:
+                    registers[a] = evaluate_array_sign_operation(registers[b], constants[c])
+                elif op == NOT:
+                    registers[a] = evaluate_logic_not_operator(registers[b])
+                elif op == FOR_PREP:
+                    if not registers[b].n:
+                        slots[c] = empty_columns(registers[b])
+                    registers[a] = column_iterator(registers[b])
+                elif op == LOAD_CONST:
+                    registers[a] = constants[b]
+                elif op == LOAD_OWNED:
+                    value = slots[b]
+                    if value is UNBOUND:
+                        value = fallbacks[b]
+                        if value is UNBOUND:
+                            raise RecognitionError(repr(names[b]))
+                        value = value([])
+                    registers[a] = value
+                elif op == APPEND:
+                    registers[a] = append(registers[a], registers[a+1:a+1+b], constants[c])
+                elif op == STORE_INDEXED:
+                    array = slots[c]
+                    registers[a] = assign(None if array is UNBOUND else array, registers[a+1:a+1+b], registers[a])
+                elif op == DEFER:
+                    registers[a] = deferred_functions[c](registers[a], registers[b])
+                elif op == DEFER_SIGN:
+                    registers[a] = defer_sign(constants[c], registers[b])
+                elif op == FORCE:
+                    registers[a] = force(registers[a])
+                elif op == LOAD_INVARIANT:
+                    if registers[b] is not None:
+                        registers[a] = registers[b]
+                        pc = c
+                elif op == STORE_INVARIANT:
+                    registers[b] = share(registers[a])
+                elif op == VECTORIZE:
+                    plan = constants[a]
+                    # the loop runs on the variables it names, which are written back to their slots
+                    indexes = constants[b]
+                    workspace = {name: slots[i] for name, i in zip(plan.names, indexes) if slots[i] is not UNBOUND}
+                    if plan.run(workspace):
+                        for name, i in zip(plan.names, indexes):
+                            if name in workspace:
+                                slots[i] = workspace[name]
+                        pc = c
+        except SemanticException as e:
+            if e.line == 0:
+                e.line = code.lines[pc-1]
+            raise e
+        finally:
+            for name, value in zip(names, slots):
+                if value is not UNBOUND:
+                    variables[name] = value
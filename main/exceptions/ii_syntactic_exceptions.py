@@ -1,6 +1,20 @@
 from main.exceptions.interpret_exception import SyntacticException
 
 
+class BreakOutsideLoopError(SyntacticException):
+    message = {
+        'darwin': "A BREAK statement appeared outside of a loop. Use RETURN instead.",
+        'win32': "A BREAK statement appeared outside of a loop. Use RETURN instead."
+    }
+
+
+class ContinueOutsideLoopError(SyntacticException):
+    message = {
+        'darwin': "A CONTINUE statement appeared outside of a loop. Use RETURN instead.",
+        'win32': "A CONTINUE statement appeared outside of a loop. Use RETURN instead."
+    }
+
+
 class EndMissingError(SyntacticException):
     message = {
         'darwin': "At least one END is missing. The statement beginning here does not have a\nmatching end.",
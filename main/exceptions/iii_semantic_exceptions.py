@@ -1,6 +1,13 @@
 from main.exceptions.interpret_exception import *
 
 
+class AmbiguousGrowthError(SemanticException):
+    message = {
+        'darwin': "Attempt to grow array along ambiguous dimension.\n",
+        'win32': "Attempt to grow array along ambiguous dimension."
+    }
+
+
 class ArrayIndexError(SemanticException):
     message = {
         'darwin': "Array indices must be positive integers or logical values.\n",
@@ -8,6 +15,24 @@ class ArrayIndexError(SemanticException):
     }
 
 
+class AssignmentNumberError(SemanticException):
+    message = {
+        'darwin': "Unable to perform assignment because the left and right sides have a different\n"
+                  "number of elements.\n",
+        'win32': "Unable to perform assignment because the left and right sides have a different number of "
+                 "elements."
+    }
+
+
+class AssignmentSizeError(SemanticException):
+    message = {
+        'darwin': "Unable to perform assignment because the size of the left side is placeholder-by-placeholder and\n"
+                  "the size of the right side is placeholder-by-placeholder.\n",
+        'win32': "Unable to perform assignment because the size of the left side is placeholder-by-placeholder and "
+                 "the size of the right side is placeholder-by-placeholder."
+    }
+
+
 class ComparisonError(SemanticException):
     message = {
         'win32': f"Error using placeholder\nComparison between placeholder and placeholder is not supported.",
@@ -45,6 +70,34 @@ class ConversionError3(SemanticException):
     }
 
 
+class ConversionError4(SemanticException):
+    message = {
+        'darwin': "NaN and Inf values cannot be converted to characters.\n",
+        'win32': "NaN and Inf values cannot be converted to characters."
+    }
+
+
+class ConversionError5(SemanticException):
+    message = {
+        'darwin': "Character codes must be integers from 0 to 65535.\n",
+        'win32': "Character codes must be integers from 0 to 65535."
+    }
+
+
+class DeletionIndexError(SemanticException):
+    message = {
+        'darwin': "Matrix index is out of range for deletion.\n",
+        'win32': "Matrix index is out of range for deletion."
+    }
+
+
+class DimensionAgreementError(SemanticException):
+    message = {
+        'darwin': "Error using placeholder\nMatrix dimensions must agree.\n",
+        'win32': "Error using placeholder\nMatrix dimensions must agree."
+    }
+
+
 class DivisionError(SemanticException):
     message = {
         'win32': f"Error using placeholder\nArguments must be numeric, char, or logical.",
@@ -71,6 +124,38 @@ class IncorrectDimensionError(SemanticException):
     }
 
 
+class MatrixFunctionError(SemanticException):
+    message = {
+        'darwin': "Error using ^\nNon-integer powers of matrices which are not diagonal need numpy.\n",
+        'win32': "Error using ^\nNon-integer powers of matrices which are not diagonal need numpy."
+    }
+
+
+class MatrixPowerError(SemanticException):
+    message = {
+        'darwin': "Error using ^\nIncorrect dimensions for raising a matrix to a power. Check that the matrix is\n"
+                  "square and the power is a scalar. To operate on each element of the matrix\n"
+                  "individually, use POWER (.^) for elementwise power.\n",
+        'win32': "Error using ^\nIncorrect dimensions for raising a matrix to a power. Check that the matrix is "
+                 "square and the power is a scalar. To operate on each element of the matrix individually, use "
+                 "POWER (.^) for elementwise power."
+    }
+
+
+class MaximumVariableSizeError(SemanticException):
+    message = {
+        'darwin': "Maximum variable size allowed by the program is exceeded.\n",
+        'win32': "Maximum variable size allowed by the program is exceeded."
+    }
+
+
+class NullAssignmentError(SemanticException):
+    message = {
+        'darwin': "A null assignment can have only one non-colon index.\n",
+        'win32': "A null assignment can have only one non-colon index."
+    }
+
+
 class OperatorError(SemanticException):
     message = {
         'win32': f"Operator placeholder is not supported for operands of type 'string'.",
@@ -85,6 +170,15 @@ class RecognitionError(SemanticException):
     }
 
 
+class ReshapeError(SemanticException):
+    message = {
+        'darwin': "Error using reshape\nNumber of elements must not change. Use [] as one of the size inputs to\n"
+                  "automatically calculate the appropriate size for that dimension.\n",
+        'win32': "Error using reshape\nNumber of elements must not change. Use [] as one of the size inputs to "
+                 "automatically calculate the appropriate size for that dimension."
+    }
+
+
 class UnaryOperatorError(SemanticException):
     message = {
         'win32': f"Unary operator placeholder is not supported for operand of type 'string'.",
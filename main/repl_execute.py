@@ -1,18 +1,29 @@
 from main.I_lexical.lexer import lexer
 from main.I_lexical.token import TokenListPrinter
 from main.II_syntactic.parser import Parser
+from main.III_semantic.constant_folding import fold
+from main.III_semantic.loop_optimization import optimize
 from main.II_syntactic.node import ASTTreePrinter
-from main.III_semantic.interpreter import Interpreter
+from main.III_semantic.engines import ENGINES, DEFAULT_ENGINE
+from main.III_semantic.inference import count_specializations, report_specializations
+from main.V_bytecode.compiler import BytecodeCompiler
+from main.V_bytecode.disassembler import CodePrinter
 
 
-def repl_execute(print_tokens=False, print_ast=False, print_var=False):
+def repl_execute(print_tokens=False, print_ast=False, print_var=False, engine=DEFAULT_ENGINE, print_bytecode=False,
+                 print_specializations=False):
     """
     command line REPL（Read-Eval-Print Loop）
+    the specialization hit rates of the whole session are printed when it is left
     """
-    interpreter = Interpreter()
+    interpreter = ENGINES[engine]()
+    if print_specializations:
+        count_specializations()
     while True:
         program = input(">> ")
         if program == "quit()" or program == "exit()":
+            if print_specializations:
+                report_specializations()
             break
 
         # lexical analysis
@@ -20,10 +31,13 @@ def repl_execute(print_tokens=False, print_ast=False, print_var=False):
         if print_tokens:
             TokenListPrinter.print(token_list)
 
-        # syntactic analysis
-        ast_root = Parser(token_list).parse_statement_list()
+        # syntactic analysis, the variables of the session shadow the builtin constants and their types are known
+        variables = interpreter.get_variables()
+        ast_root = optimize(fold(Parser(token_list).parse_statement_list(), variables), variables)
         if print_ast:
             ASTTreePrinter().print(ast_root)
+        if print_bytecode:
+            CodePrinter.print(BytecodeCompiler(interpreter.builtins, interpreter.variables).compile(ast_root))
 
         # semantic analysis and execution
         interpreter.interpret_statement_list(ast_root)
@@ -0,0 +1,90 @@
+"""
+cache of the abstract syntax tree and of the bytecode of script files, the .pyc equivalent for .m files
+
+the tree of "dir/name.m" is stored in "dir/__mcache__/name.<version>.ast" and its bytecode in
+"dir/__mcache__/name.<version>.bc", both together with the hash of the script text,
+a cache file whose hash does not match the script any more is simply parsed and written again
+"""
+
+
+import hashlib
+import marshal
+import os
+import pickle
+import shutil
+from main.V_bytecode.code import CodeObject
+
+
+# bump it whenever the lexer, the parser, the AST nodes or the bytecode change, so that old cache files are not used
+VERSION = "13"
+CACHE_DIRECTORY = "__mcache__"
+
+
+def cache_path(path, suffix="ast"):
+    directory, filename = os.path.split(os.path.abspath(path))
+    return os.path.join(directory, CACHE_DIRECTORY, f"{os.path.splitext(filename)[0]}.{VERSION}.{suffix}")
+
+
+def content_hash(program):
+    return hashlib.sha256(f"{VERSION}\n{program}".encode()).hexdigest()
+
+
+def load_ast(path, program):
+    """
+    return the cached tree of the script, or None if there is no valid cache for the current script text
+    """
+    try:
+        with open(cache_path(path), "rb") as file:
+            key, ast_root = pickle.load(file)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError, ValueError):
+        return None
+    return ast_root if key == content_hash(program) else None
+
+
+def store_ast(path, program, ast_root):
+    """
+    write the cache file of the script, a script whose directory is not writable is just not cached
+    """
+    try:
+        data = pickle.dumps((content_hash(program), ast_root), protocol=pickle.HIGHEST_PROTOCOL)
+    except (RecursionError, pickle.PicklingError):
+        return
+    write_cache(cache_path(path), data)
+
+
+def load_code(path, program):
+    """
+    return the cached bytecode of the script, or None if there is no valid cache for the current script text
+    """
+    try:
+        with open(cache_path(path, "bc"), "rb") as file:
+            key, data = marshal.load(file)
+        return CodeObject.loads(data) if key == content_hash(program) else None
+    except (OSError, EOFError, ValueError, TypeError, KeyError, pickle.UnpicklingError, AttributeError, ImportError):
+        return None
+
+
+def store_code(path, program, code):
+    write_cache(cache_path(path, "bc"), marshal.dumps((content_hash(program), code.dumps())))
+
+
+def write_cache(target, data):
+    temp = f"{target}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open(temp, "wb") as file:
+            file.write(data)
+        os.replace(temp, target)  # readers never see a partially written file
+    except OSError:
+        try:
+            os.remove(temp)
+        except OSError:
+            pass
+
+
+def clear_cache(path=None):
+    """
+    remove the cache directory next to the script, or the one in the current working directory
+    """
+    directory = os.path.dirname(cache_path(path)) if path else os.path.join(os.getcwd(), CACHE_DIRECTORY)
+    shutil.rmtree(directory, ignore_errors=True)
@@ -3,34 +3,60 @@ from main.I_lexical.lexer import lexer
 from main.I_lexical.token import TokenListPrinter
 from main.II_syntactic.parser import Parser
 from main.II_syntactic.node import ASTTreePrinter
-from main.III_semantic.interpreter import Interpreter
+from main.III_semantic.constant_folding import fold
+from main.III_semantic.loop_optimization import optimize
+from main.III_semantic.engines import ENGINES, DEFAULT_ENGINE
+from main.III_semantic.inference import count_specializations, report_specializations
+from main.V_bytecode.compiler import BytecodeCompiler
+from main.V_bytecode.disassembler import CodePrinter
+from main.V_bytecode.vm import BytecodeInterpreter
+from main.script_cache import load_ast, store_ast, load_code, store_code
 from main.exceptions.interpret_exception import *
 
 
-def script_execute(path, print_tokens=False, print_ast=False, print_var=False):
+def script_execute(path, print_tokens=False, print_ast=False, print_var=False, use_cache=True,
+                   engine=DEFAULT_ENGINE, print_bytecode=False, print_specializations=False):
     """
     path: relative path from current working directory to the script
     print_tokens: whether to print lexical analysis result or not
     print_ast: whether to print syntactic analysis result or not
     print_var: whether to print executing result or not
+    use_cache: whether to reuse and store the abstract syntax tree and bytecode of the script in its cache directory
+    engine: name of the execution engine in ENGINES
+    print_bytecode: whether to print the disassembled bytecode or not
+    print_specializations: whether to print how often the operations ran a specialized kernel or not
     """
     with open(path, "r") as file:
         program = file.read()
 
+    if print_specializations:
+        count_specializations()
     try:
-        # lexical analysis
-        token_list = lexer(program)
-        if print_tokens:
-            TokenListPrinter.print(token_list)
-
-        # syntactic analysis
-        ast_root = Parser(token_list).parse_statement_list()
-        interpreter = Interpreter()
-        if print_ast:
-            ASTTreePrinter().print(ast_root)
+        interpreter = ENGINES[engine]()
+        bytecode = isinstance(interpreter, BytecodeInterpreter)
+        # the bytecode engine does not need the tree at all when the bytecode of the script is cached
+        code = load_code(path, program) if bytecode and use_cache and not print_tokens and not print_ast else None
+        if code is None:
+            # tokens are not cached, so the cache is skipped when they are to be printed
+            ast_root = load_ast(path, program) if use_cache and not print_tokens else None
+            if ast_root is None:
+                ast_root = parse_program(program, print_tokens=print_tokens)
+                if use_cache:
+                    store_ast(path, program, ast_root)
+            if print_ast:
+                ASTTreePrinter().print(ast_root)
+            if bytecode or print_bytecode:
+                code = BytecodeCompiler(interpreter.builtins).compile(ast_root)
+                if bytecode and use_cache:
+                    store_code(path, program, code)
+        if print_bytecode:
+            CodePrinter.print(code)
 
         # semantic analysis and execution
-        interpreter.interpret_statement_list(ast_root)
+        if bytecode:
+            interpreter.execute(code)
+        else:
+            interpreter.interpret_statement_list(ast_root)
         if print_var:
             print(interpreter.get_variables())
     except (LexicalException, SyntacticException) as e:
@@ -43,6 +69,21 @@ def script_execute(path, print_tokens=False, print_ast=False, print_var=False):
         print(e)
         print(f"Error in {path[:-2].split('/')[-1]} (line {e.line})")
         print(program.split('\n')[e.line-1], end='')
+    if print_specializations:
+        report_specializations()
+
+
+def parse_program(program, print_tokens=False, variables=()):
+    """
+    variables: variables already bound before the program runs, they shadow the builtin constants when folding
+    """
+    # lexical analysis
+    token_list = lexer(program)
+    if print_tokens:
+        TokenListPrinter.print(token_list)
+
+    # syntactic analysis, then the constants are folded and the loops optimized once for every execution
+    return optimize(fold(Parser(token_list).parse_statement_list(), variables), variables)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,4 @@
+a = 1
+if a
+  continue
+end
@@ -0,0 +1,2 @@
+A = ones(2);
+A(7) = 1
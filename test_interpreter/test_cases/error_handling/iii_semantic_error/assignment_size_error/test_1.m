@@ -0,0 +1,2 @@
+A = ones(2);
+A(1:2, 1) = [1 2 3]
@@ -0,0 +1,2 @@
+s = 'abc';
+s(1) = nan
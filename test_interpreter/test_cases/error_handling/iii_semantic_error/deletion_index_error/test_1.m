@@ -0,0 +1,2 @@
+a = [1 2 3];
+a(5) = []
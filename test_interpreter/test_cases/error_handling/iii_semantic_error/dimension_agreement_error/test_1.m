@@ -0,0 +1,3 @@
+A = [1 2; 3 4];
+b = [1; 2; 3];
+x = A \ b
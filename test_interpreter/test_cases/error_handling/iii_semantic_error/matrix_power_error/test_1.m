@@ -0,0 +1,2 @@
+A = [1 2 3; 4 5 6];
+B = A ^ 2
@@ -0,0 +1,2 @@
+a = 1;
+x = 1:inf
@@ -0,0 +1,2 @@
+A = ones(3);
+A(1, 2) = []
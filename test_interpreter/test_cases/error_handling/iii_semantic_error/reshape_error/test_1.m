@@ -0,0 +1,2 @@
+a = 1:6;
+b = reshape(a, 4, 2)
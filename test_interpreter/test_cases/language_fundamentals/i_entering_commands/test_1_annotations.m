@@ -0,0 +1,12 @@
+% line annotation
+a = 1 % trailing annotation
+%{
+b = 2
+%{ not a nested start
+%}
+c = a + 1
+%{ this line is a line annotation
+d = c * 2;
+%{
+%}
+d
@@ -0,0 +1,11 @@
+a = pi
+pi = 3;
+b = pi + 1
+i = 5;
+c = i * 2
+true = 7;
+d = true
+for inf = 1:2
+    e = inf * 2
+end
+f = inf + 1
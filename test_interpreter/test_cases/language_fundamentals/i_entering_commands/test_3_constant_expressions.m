@@ -0,0 +1,11 @@
+r = round(2 * pi / 360 * 10000) / 10000
+t = true(2)
+f = false(1, 3)
+v = [1 2; 3 4]' * 2
+s = "con" + "stant"
+for k = 1:3
+    w = [1 2 3];
+    w(k) = 7
+end
+n = -inf + 1
+c = ~(1 < 2) || 3 > 2
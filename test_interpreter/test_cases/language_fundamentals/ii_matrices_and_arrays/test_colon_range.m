@@ -0,0 +1,18 @@
+a = 1:0.1:1.5
+b = 10:-2:1
+c = 0:0.1:0.3
+d = a(3)
+e = b(2:3)
+f = (1:3)'
+g = [1:3; 4:6]
+h = (1:3) + 1
+y = 1:0
+z = -1:-1:-3
+w = 0.1:0.1:0.5
+s = 0;
+for k = 0.1:0.1:0.5
+    s = s + k;
+end
+s
+t = 2:2:7
+v = 1:inf:5
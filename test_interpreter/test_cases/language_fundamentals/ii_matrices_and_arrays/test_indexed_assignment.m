@@ -0,0 +1,42 @@
+A = zeros(2, 3)
+A(2, 3) = 7
+A(1, :) = [1 2 3]
+A(:, 2) = 9
+A(5) = -1
+A(3, 4) = 1
+B = A;
+B(1) = 100;
+A(1)
+v = [];
+for k = 1:5
+    v(k) = k * k;
+end
+v
+w = zeros(3, 1);
+w(5) = 2
+m = A > 1
+A(m) = 0
+A(A == 9) = 5
+A(2, :) = []
+A(:, [1 3]) = []
+x = 1:5;
+x([2 4]) = []
+s = 'hello';
+s(1) = 'J'
+s(7) = 'x';
+s(2) = "E";
+s + 0
+r = 1:3;
+r(2) = 0
+q = [1 2 3];
+q(2) = 2 > 1
+t = [1 0] > 0;
+t(2) = 1 > 0
+t(3) = 2
+t(1) = 0;
+r(t)
+c(2, 2) = 3
+n = ones(2)
+n(:) = [5 6 7 8]
+n(:, 1) = []
+n(:) = []
@@ -0,0 +1,32 @@
+x = [];
+for k = 1:5
+    x = [x, k];
+end
+x
+y = x;
+x = [x, 6]
+y
+z = [];
+for k = 1:3
+    z = [z; k * 2];
+end
+z
+w = z(:);
+z = [z; 7];
+w'
+z'
+s = 'ab';
+s = [s, 'cd']
+t = [1 0] > 0;
+t = [t, 2 > 1]
+t = [t, 2]
+m = [1 2; 3 4];
+m = [m, [5; 6]]
+m = [m; 7 8 9]
+q = 1:3;
+q = [q, 4]
+q = [q, q]
+e = [];
+e = [e; []]
+r = [1, 2];
+r = [r; 3, 4]
@@ -0,0 +1,51 @@
+r = 1:36;
+A = reshape(r, 6, 6)
+c = A(:, 2)
+w = A(3, :)
+B = A(2:5, :)
+T = A'
+T2 = B'
+S = A(6:-1:1, 1:2:5)
+V = A(1:2:36)
+A(1, 2) = 100;
+c'
+w
+B
+T(2, 1)
+A(:, 2)'
+B(1, 1) = -1;
+A(2, 1)
+B(1:2, 1:3)
+x = A(:);
+x(2) = 55;
+A(2)
+A(3, :) = 0;
+w
+s = 0;
+for k = 1:6
+    row = A(k, :);
+    s = s + row(2);
+end
+s
+for col = A(1:3, 1:4)
+    col'
+end
+C = [A(1:2, :); T(1, :)]
+D = T' + 1
+E = A(:, 1:5) .* 2;
+E(4, 5)
+F = reshape(A, 4, 9);
+F(4, 9)
+G = reshape(A(2:5, 2:5), 2, 8)
+H = reshape(T, [9 4]);
+H(:, 1)'
+K = A(:, 2:3)';
+K(2, :) = [];
+K
+m = A(2:5, 2:5) > 10
+q = A(2:5, 2:5);
+q(m) = 0
+u = reshape(A, 36, 1);
+u(40) = 1;
+u(38:40)'
+P = reshape(1:20, [], 4)
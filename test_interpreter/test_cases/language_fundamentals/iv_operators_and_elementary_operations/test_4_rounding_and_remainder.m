@@ -0,0 +1,9 @@
+a = floor(2.5)
+b = ceil(-2.5)
+c = fix(-2.7)
+d = round([2.5 -2.5 0.4])
+e = mod(-7, 3)
+f = rem(-7, 3)
+g = mod([5 6 7], 0)
+h = rem(5, 0)
+k = mod(5.5, -2)
@@ -0,0 +1,18 @@
+a = 1;
+b = a + [1 2];
+a
+c = [1; 2; 3];
+d = c + [10 20]
+c
+e = [1 2 3] .* [2; 4]
+f = c - 1
+g = 2 .^ [1 2 3]
+k = c == [1 2 3]
+r = 1:4;
+s = r' * 0 + r
+m = mod([5 7 9], [2; 3])
+v = reshape(1:40, 8, 5);
+w = v - v(1, :)
+x = v ./ v(:, 1)
+v
+y = "a" + ["b", "c"]
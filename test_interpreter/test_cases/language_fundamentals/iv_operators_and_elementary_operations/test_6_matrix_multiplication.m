@@ -0,0 +1,12 @@
+A = [1 2; 3 4];
+B = [5 6 7; 8 9 10];
+C = A * B
+v = A * [1; -1]
+w = [1 2] * A
+d = [1 2 3] * [4; 5; 6]
+o = [1; 2; 3] * [1 2]
+c = 'ab' * [1; 1]
+M = mod(reshape(1:100, 10, 10), 3);
+P = M * M'
+s = ones(1, 70) * ones(70, 1)
+z = ones(0, 3) * ones(3, 2)
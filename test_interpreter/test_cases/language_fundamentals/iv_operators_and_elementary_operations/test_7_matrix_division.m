@@ -0,0 +1,17 @@
+A = [4 -2 1; -2 4 -2; 1 -2 4];
+b = [11; -16; 17];
+x = round(A \ b * 10000) / 10000
+L = [2 0; 1 3];
+y = round(L \ [4; 7] * 10000) / 10000
+U = [2 1; 0 4];
+z = round([6 9] / U * 10000) / 10000
+M = [1 2; 3 4];
+u = round(M \ [5; 6] * 10000) / 10000
+v = round([1 2] / M * 10000) / 10000
+w = round([1 1; 1 2; 1 3] \ [1; 2; 2] * 10000) / 10000
+t = round([1 2 3] \ 6 * 10000) / 10000
+s = 2 \ [2 4]
+r = [2 4] / 2
+for k = 1:3
+    q = round(M \ [k; k] * 10000) / 10000
+end
@@ -0,0 +1,10 @@
+F = [1 1; 1 0];
+a = F ^ 10
+b = F ^ 0
+c = F ^ 1
+d = round([2 1; 1 2] ^ -1 * 10000) / 10000
+P = [0.9 0.1; 0.5 0.5];
+e = round(P ^ 1000 * 10000) / 10000
+g = round([4 0; 0 9] ^ 0.5 * 10000) / 10000
+h = round(2 ^ [1 0; 0 2] * 10000) / 10000
+k = round([2 1; 1 2] ^ -2 * 10000) / 10000
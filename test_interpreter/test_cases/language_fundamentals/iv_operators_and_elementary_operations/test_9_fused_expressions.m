@@ -0,0 +1,23 @@
+a = [1 2 3; 4 5 6];
+b = [2; 4];
+c = a .* b + a ./ b - 1
+d = -(a - 3) .^ 2 + 10
+e = a .* a > b + 5
+f = 2 .* a' - [1 2] .* 3
+g = (a + 1) .\ 12 + a
+x = reshape(1:120, 12, 10);
+y = x .* 2 - x(:, 1) ./ 4 + x(1, :) .^ 2;
+p = x .* 2;
+q = x(:, 1) ./ 4;
+r = x(1, :) .^ 2;
+u = 0;
+if y == p - q + r
+    u = 1;
+end
+u
+v = y(12, :)
+w = -x + 1 < x(:, 1) - 100;
+n = w(:, 9)'
+k = ([1 2 3] == [1; 2]) + ([1 0 1] > 0) .* 2
+h = "a" + ["b", "c"] + "d"
+m = 1 + 2 .* 3 - 4 ./ 8
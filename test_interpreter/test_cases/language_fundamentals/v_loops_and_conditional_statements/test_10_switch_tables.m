@@ -0,0 +1,52 @@
+state = 'idle';
+steps = 0;
+for k = 1:10
+    switch state
+        case 'idle'
+            state = 'run';
+        case 'run'
+            if k > 6
+                state = 'stop';
+            end
+            steps = steps + 1;
+        case 'idle'
+            steps = -1;
+        otherwise
+            steps = steps * 10;
+    end
+end
+state
+steps
+r = zeros(1, 8);
+for k = 1:8
+    switch mod(k, 4)
+        case 0
+            r(k) = 10;
+        case k - 4
+            r(k) = 20;
+        case 1
+            r(k) = 30;
+        otherwise
+            r(k) = 40;
+    end
+end
+r
+name = 'b';
+switch name
+    case 'ab'
+        c = 1
+    case 'b'
+        c = 2
+    case 'b'
+        c = 3
+end
+switch 2.5
+    case 2
+        a = 1
+    case 5 / 2
+        a = 2
+end
+switch true
+    case 1
+        t = 1
+end
@@ -0,0 +1,22 @@
+s = 0;
+for k = 1:10
+    if k == 3
+        continue
+    end
+    if k > 6, break, end
+    s = s + k
+end
+n = 0;
+while 1
+    n = n + 1;
+    for j = 1:5
+        if j == 2
+            break;
+        end
+        j
+    end
+    if n >= 3
+        break
+    end
+end
+n
@@ -0,0 +1,29 @@
+x = 1;
+for k = 1:3
+    y = x + k
+    if k == 2
+        x = [1 2];
+    end
+end
+z = 2;
+while z < 100
+    z = z * 3;
+    if z > 10
+        z = [z z];
+        break
+    end
+end
+z
+c = 'a';
+for k = 1:2
+    c = c + 1
+end
+w = 5;
+w(3) = 1;
+w = w + w
+if 2 > 1
+    u = 'ab';
+else
+    u = 1;
+end
+u = u + u
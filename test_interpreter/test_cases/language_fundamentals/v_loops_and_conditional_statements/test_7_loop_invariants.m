@@ -0,0 +1,29 @@
+n = 3;
+for i = 1:2
+    for j = 1:2
+        v = i * 10 + j * n
+    end
+end
+for k = 1:3
+    z = zeros(1, n);
+    z(k) = n * 2 + 1
+    a = ones(1, 2);
+    a = [a, k]
+end
+m = 1;
+while m < 20
+    m = m * 2;
+    c = [1 2 3] + n
+    if m > 4
+        continue
+    end
+    d = m
+end
+for k = 1:2
+    s = 1;
+    s = k;
+    if k > 1
+        s
+        break
+    end
+end
@@ -0,0 +1,38 @@
+n = 6;
+a = 1:n;
+b = [2 0 -1 3 5 4];
+s = 0;
+p = 1;
+for k = 1:n
+    y(k) = a(k) * 2 + b(k);
+    s = s + a(k) / 4;
+    p = b(k) * p;
+end
+y
+s
+p
+k
+z = zeros(n, 1);
+c = 0.5;
+for k = n:-2:1
+    z(k) = c ^ k - k;
+end
+z
+x = 'matlab';
+m = 0;
+for k = 1:n
+    u(k) = x(k) > 'l';
+    m = m + (x(k) == 'a');
+end
+u
+m
+for k = 3:2
+    v(k) = 1;
+end
+k
+t = 1;
+for k = 1:n
+    t = a(k) - t;
+    w(k) = t;
+end
+w
@@ -0,0 +1,47 @@
+s = 0;
+c = 0;
+odd = false;
+for k = 1:200
+    if mod(k, 3) == 0
+        s = s + k / 2;
+    elseif k > 150
+        continue;
+    else
+        c = c + 1;
+    end
+    odd = rem(k, 2) == 1 && s > 10;
+    if k == 180
+        break;
+    end
+end
+s
+c
+k
+odd
+n = 0;
+y = 10;
+while y > 1e-3
+    y = y * 0.97 - floor(y) / 100;
+    n = n + 1;
+    for q = [1 2 3]
+        y = y - q * 1e-6;
+    end
+end
+n
+y
+q
+z = 0;
+for k = 1:100
+    if k == 70
+        z = 'a';
+    end
+    z = z + 1;
+end
+z
+t = true;
+for k = 1:120
+    t = ~t;
+    u = -t + 2 \ k;
+end
+t
+u
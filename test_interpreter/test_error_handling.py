@@ -47,10 +47,26 @@ class InvalidOperatorError(unittest.TestCase):
     directory = PATH2 + "invalid_operator_error/"
 
 
+class JumpOutsideLoopError(unittest.TestCase):
+    directory = PATH2 + "jump_outside_loop_error/"
+
+
+class AmbiguousGrowthError(unittest.TestCase):
+    directory = PATH3 + "ambiguous_growth_error/"
+
+
 class ArrayIndexError(unittest.TestCase):
     directory = PATH3 + "array_index_error/"
 
 
+class AssignmentNumberError(unittest.TestCase):
+    directory = PATH3 + "assignment_number_error/"
+
+
+class AssignmentSizeError(unittest.TestCase):
+    directory = PATH3 + "assignment_size_error/"
+
+
 class ComparisonError(unittest.TestCase):
     directory = PATH3 + "comparison_error/"
 
@@ -71,6 +87,22 @@ class ConversionError3(unittest.TestCase):
     directory = PATH3 + "conversion_error_3/"
 
 
+class ConversionError4(unittest.TestCase):
+    directory = PATH3 + "conversion_error_4/"
+
+
+class ConversionError5(unittest.TestCase):
+    directory = PATH3 + "conversion_error_5/"
+
+
+class DeletionIndexError(unittest.TestCase):
+    directory = PATH3 + "deletion_index_error/"
+
+
+class DimensionAgreementError(unittest.TestCase):
+    directory = PATH3 + "dimension_agreement_error/"
+
+
 class DivisionError(unittest.TestCase):
     directory = PATH3 + "division_error/"
 
@@ -83,6 +115,18 @@ class IncorrectDimensionError(unittest.TestCase):
     directory = PATH3 + "incorrect_dimension_error/"
 
 
+class MatrixPowerError(unittest.TestCase):
+    directory = PATH3 + "matrix_power_error/"
+
+
+class MaximumVariableSizeError(unittest.TestCase):
+    directory = PATH3 + "maximum_variable_size_error/"
+
+
+class NullAssignmentError(unittest.TestCase):
+    directory = PATH3 + "null_assignment_error/"
+
+
 class OperatorError(unittest.TestCase):
     directory = PATH3 + "operator_error/"
 
@@ -91,6 +135,10 @@ class RecognitionError(unittest.TestCase):
     directory = PATH3 + "recognition_error/"
 
 
+class ReshapeError(unittest.TestCase):
+    directory = PATH3 + "reshape_error/"
+
+
 class UnaryOperatorError(unittest.TestCase):
     directory = PATH3 + "unary_operator_error/"
 
@@ -25,6 +25,7 @@ class TestLoopsAndConditionalStatements(unittest.TestCase):
     directory = PATH + "v_loops_and_conditional_statements/"
 
 
+package_test_class(TestEnteringCommands)
 package_test_class(TestMatricesAndArrays)
 package_test_class(TestOperatorAndElementaryOperations)
 package_test_class(TestLoopsAndConditionalStatements)